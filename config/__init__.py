@@ -5,20 +5,38 @@ from .settings import (
     PARAMS,
     HEADERS,
     DEFAULT_PARTITION_COLS,
+    LAYOUTS_PARTICION,
+    MODO_CONVERSION_ESQUEMA,
+    PERFILES_POR_CAPA,
+    BACKEND_TRANSFORMACION,
     MAX_RETRIES,
     RETRY_DELAY,
     DELTA_FORMAT,
     PARQUET_FORMAT,
     ENDPOINT,
-    SYMBOL
+    ENDPOINT_INCREMENTAL,
+    PARAMS_INCREMENTAL,
+    SYMBOL,
+    SYMBOLS,
+    INTERVALS,
+    MAX_CONCURRENCY,
+    LAYOUT_MULTI_SIMBOLO,
+    CACHE_MAX_BYTES,
+    STREAM_MAX_REGISTROS,
+    STREAM_MAX_SEGUNDOS
     )
 from .paths import (
     BASE_DIR,
     API_AUTH_PATH,
     PATH_ARCHIVO_INCREMENTAL,
+    PATH_CACHE_RESPUESTAS,
+    LANDING_DIR,
+    PATH_LANDING_FULL,
+    PATH_LANDING_INCREMENTAL,
     BRONZE_DIR,
     PATH_BRONZE_DELTALAKE_FULL,
     PATH_BRONZE_DELTALAKE_INCREMENTAL,
+    PATH_BRONZE_DELTALAKE_MULTI_SIMBOLO,
     SILVER_DIR,
     PATH_SILVER_DELTALAKE_FULL,
     PATH_SILVER_DELTALAKE_INCREMENTAL,
@@ -32,6 +50,10 @@ from .logging_config import setup_logging
 __all__ = [
     'BINANCE_BASE_URL',
     'DEFAULT_PARTITION_COLS',
+    'LAYOUTS_PARTICION',
+    'MODO_CONVERSION_ESQUEMA',
+    'PERFILES_POR_CAPA',
+    'BACKEND_TRANSFORMACION',
     'START_TIME',
     'END_TIME',
     'PARAMS',
@@ -41,13 +63,27 @@ __all__ = [
     'DELTA_FORMAT',
     'PARQUET_FORMAT',
     'ENDPOINT',
+    'ENDPOINT_INCREMENTAL',
+    'PARAMS_INCREMENTAL',
     'SYMBOL',
+    'SYMBOLS',
+    'INTERVALS',
+    'MAX_CONCURRENCY',
+    'LAYOUT_MULTI_SIMBOLO',
+    'CACHE_MAX_BYTES',
+    'STREAM_MAX_REGISTROS',
+    'STREAM_MAX_SEGUNDOS',
     'BASE_DIR',
     'API_AUTH_PATH',
     'PATH_ARCHIVO_INCREMENTAL',
+    'PATH_CACHE_RESPUESTAS',
+    'LANDING_DIR',
+    'PATH_LANDING_FULL',
+    'PATH_LANDING_INCREMENTAL',
     'BRONZE_DIR',
     'PATH_BRONZE_DELTALAKE_FULL',
     'PATH_BRONZE_DELTALAKE_INCREMENTAL',
+    'PATH_BRONZE_DELTALAKE_MULTI_SIMBOLO',
     'SILVER_DIR',
     'PATH_SILVER_DELTALAKE_FULL',
     'PATH_SILVER_DELTALAKE_INCREMENTAL',
@@ -15,10 +15,20 @@ API_AUTH_PATH = BASE_DIR / "config" / "api_auth.conf"
 # Metadatos
 PATH_ARCHIVO_INCREMENTAL = BASE_DIR / "metadata" / "incremental.json"
 
+# Cache de respuestas de la API (ventanas de velas ya cerradas)
+PATH_CACHE_RESPUESTAS = BASE_DIR / "data" / "cache" / "api_binance"
+
+# Zona de aterrizaje - Páginas crudas de la API (ndjson comprimido)
+LANDING_DIR = BASE_DIR / "data" / "landing"
+PATH_LANDING_FULL = LANDING_DIR / "api_binance" / "klines" / "sol_usdt"
+PATH_LANDING_INCREMENTAL = LANDING_DIR / "api_binance" / "historicalTrades" / "sol_usdt"
+
 # Capa Bronze - Datos crudos
 BRONZE_DIR = BASE_DIR / "data" / "bronze"
 PATH_BRONZE_DELTALAKE_FULL = BRONZE_DIR / "api_binance" / "klines" / "sol_usdt"
 PATH_BRONZE_DELTALAKE_INCREMENTAL = BRONZE_DIR / "api_binance" / "historicalTrades" / "sol_usdt"
+# Extracción multi-símbolo: una tabla por intervalo (<ruta>/<intervalo>), particionada por símbolo
+PATH_BRONZE_DELTALAKE_MULTI_SIMBOLO = BRONZE_DIR / "api_binance" / "klines" / "multi_symbol"
 
 # Capa Silver - Datos limpios
 SILVER_DIR = BASE_DIR / "data" / "silver"
@@ -33,11 +43,14 @@ PATH_GOLD_PIVOT_TABLE_FULL = GOLD_DIR / "api_binance" / "klines" / "pivot_table"
 
 # Crear directorios si no existen
 for path in [
+    PATH_LANDING_FULL,
+    PATH_LANDING_INCREMENTAL,
     BRONZE_DIR, 
     SILVER_DIR, 
     GOLD_DIR,
     PATH_BRONZE_DELTALAKE_FULL, 
     PATH_BRONZE_DELTALAKE_INCREMENTAL,
+    PATH_BRONZE_DELTALAKE_MULTI_SIMBOLO,
     PATH_SILVER_DELTALAKE_FULL, 
     PATH_SILVER_DELTALAKE_INCREMENTAL,
     PATH_GOLD_SUMARIZED_TABLE_INCREMENTAL, 
@@ -3,7 +3,7 @@ Project settings and constants for Binance API pipeline.
 """
 
 from pathlib import Path
-from src.utils import set_fecha_final, set_fecha_inicial, leer_archivo_conf
+from src.utils import set_fecha_final, set_fecha_inicial, leer_archivo_conf, REGISTRO_ESQUEMAS
 from config.paths import API_AUTH_PATH
 
 # Parámetros de acceso a la API
@@ -26,14 +26,35 @@ PARAMS = {
         'limit':1000
     }
 
+# Extracción incremental de trades
+ENDPOINT_INCREMENTAL = "api/v3/historicalTrades"
+PARAMS_INCREMENTAL = {
+        'symbol':'SOLUSDT',
+        'limit':1000
+    }
+
 HEADERS = {
             "X-MBX-APIKEY":KEY
         }
 
 # Data Processing
 DEFAULT_PARTITION_COLS = ["date"]
+
+# Particionado derivado de la columna de tiempo, por tipo de tabla (ver src/load/partitioning.py).
+# Sale del registro de esquemas de src/utils/schemas.py
+LAYOUTS_PARTICION = {
+    endpoint: registro['layout'] for endpoint, registro in REGISTRO_ESQUEMAS.items() if registro['layout']
+}
+MODO_CONVERSION_ESQUEMA = "estricto"  # "estricto" | "tolerante" (valores inválidos -> nulos, con conteo por columna)
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
+# Perfil de escritura Parquet de cada capa (ver src/load/writer_profiles.py)
+PERFILES_POR_CAPA = {
+    "bronze": "bronze-fast-ingest",
+    "silver": "silver-balanced",
+    "gold": "gold-read-optimized",
+}
+BACKEND_TRANSFORMACION = "pandas"  # "pandas" | "arrow" (pyarrow.compute, sin convertir a pandas)
 
 # File Formats
 DELTA_FORMAT = "delta"
@@ -41,4 +62,19 @@ PARQUET_FORMAT = "parquet"
 ENGINE = 'pyarrow'
 
 # Symbol specific (podría venir de variable de entorno)
-SYMBOL = "SOLUSDT"
\ No newline at end of file
+SYMBOL = "SOLUSDT"
+
+# Extracción multi-símbolo
+SYMBOLS = [SYMBOL]
+INTERVALS = [PARAMS['interval']]
+MAX_CONCURRENCY = 16  # solicitudes simultáneas en todo el proceso
+# Las velas de todos los símbolos de un intervalo comparten tabla, particionada por símbolo
+LAYOUT_MULTI_SIMBOLO = {**LAYOUTS_PARTICION["klines"],
+                        "particiones": ["symbol", *LAYOUTS_PARTICION["klines"]["particiones"]]}
+
+# Ingesta en streaming (micro-lotes)
+STREAM_MAX_REGISTROS = 10000
+STREAM_MAX_SEGUNDOS = 30
+
+# Cache de respuestas
+CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
\ No newline at end of file
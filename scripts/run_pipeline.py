@@ -19,53 +19,90 @@ logging.basicConfig(
 )
 logger = logging.getLogger("pipeline")
 
-def run_full_pipeline():
-    """Ejecuta el pipeline completo de ETL"""
+def run_full_pipeline(replay:bool=False):
+    """
+    Ejecuta el pipeline completo de ETL.
+    Con replay=True no se consulta la API: se reprocesan las páginas crudas
+    guardadas en la zona de aterrizaje.
+    """
     try:
         logger.info("🚀 Iniciando pipeline completo")
         start_time = datetime.now()
         
         # 1. EXTRACCIÓN
         logger.info("📥 Etapa 1: Extracción")
-        from src.extract.api_extractor import get_data
-        from src.extract.data_loader import build_table
-        from config import BINANCE_BASE_URL, SYMBOL, ENDPOINT, PARAMS, HEADERS
+        import pyarrow as pa
+        from src.extract.api_extractor import get_data_backfill
+        from src.extract.data_loader import build_arrow_table
+        from src.extract.http_client import obtener_cliente
+        from src.extract.response_cache import CacheDeRespuestas
+        from src.extract.landing_zone import leer_paginas_crudas
+        from src.transform.backends import obtener_backend, a_pandas
+        from config import (BINANCE_BASE_URL, SYMBOL, ENDPOINT, PARAMS, HEADERS, MAX_RETRIES, RETRY_DELAY,
+                            PATH_CACHE_RESPUESTAS, CACHE_MAX_BYTES, PATH_LANDING_FULL, BACKEND_TRANSFORMACION)
         
-        datos = get_data(BINANCE_BASE_URL, endpoint=ENDPOINT, params=PARAMS, headers=HEADERS)
-     
-        df_raw = build_table(datos)
+        # Con el backend "arrow" los datos siguen como pyarrow Table hasta el reporte de calidad
+        backend = obtener_backend(BACKEND_TRANSFORMACION)
+        if replay:
+            logger.info(f"⏪ Modo replay desde {PATH_LANDING_FULL}")
+            tablas = [build_arrow_table(pagina, ENDPOINT) for pagina in leer_paginas_crudas(PATH_LANDING_FULL, f"{PARAMS['symbol']}_{PARAMS['interval']}_")]
+            tablas = [tabla for tabla in tablas if tabla is not None]
+            if not tablas:
+                logger.info(f"✅ No hay páginas crudas en {PATH_LANDING_FULL} para reprocesar")
+                return
+            tabla_raw = pa.concat_tables(tablas)
+            df_raw = tabla_raw if backend.nombre == "arrow" else tabla_raw.to_pandas()
+            df_raw = backend.ordenar_dataframe(backend.eliminar_duplicados(df_raw, 'open_time', keep='last'), 'open_time')
+        else:
+            client = obtener_cliente(BINANCE_BASE_URL, headers=HEADERS, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY)
+            cache = CacheDeRespuestas(PATH_CACHE_RESPUESTAS, max_bytes=CACHE_MAX_BYTES)
+            datos = get_data_backfill(BINANCE_BASE_URL, endpoint=ENDPOINT, params=PARAMS, client=client,
+                                      cache=cache, landing_dir=PATH_LANDING_FULL)
+            tabla_raw = build_arrow_table(datos, ENDPOINT)
+            df_raw = tabla_raw if backend.nombre == "arrow" else tabla_raw.to_pandas()
         logger.info(f"✅ Extraídos {len(df_raw)} registros")
         
         
         # 2. TRANSFORMACIÓN
         logger.info("🔄 Etapa 2: Transformación")
-        from src.transform.data_cleaning import eliminar_duplicados, eliminar_registros_nulos
-        from src.transform.data_transformation import convertir_milisegundos_a_datetime, renombrar_columnas
         from config.constants import COLS
+        from src.transform.plan import PlanDeTransformacion
+        from config import MODO_CONVERSION_ESQUEMA
         
-        df_clean = renombrar_columnas(df_raw, COLS)
-        print(df_clean.to_string(index=False))
-        # df_clean = eliminar_duplicados(df_raw, subset=['id'])
-        # df_clean = eliminar_registros_nulos(df_clean, ['open_time', 'close_time'])
-        # df_clean = convertir_milisegundos_a_datetime(df_clean, ['open_time', 'close_time'])
+        if backend.nombre == "pandas":
+            # Cadena fusionada: una sola copia del DataFrame en lugar de una por paso
+            df_clean = (PlanDeTransformacion()
+                        .renombrar_columnas(COLS)
+                        .eliminar_registros_nulos(['open_time', 'close_time'])
+                        .eliminar_duplicados('open_time', keep='last')
+                        .ordenar_dataframe('open_time')
+                        .ejecutar(df_raw))
+        else:
+            df_clean = backend.renombrar_columnas(df_raw, COLS)
+            df_clean = backend.eliminar_registros_nulos(df_clean, ['open_time', 'close_time'])
+            df_clean = backend.ordenar_dataframe(backend.eliminar_duplicados(df_clean, 'open_time', keep='last'), 'open_time')
+        df_clean = backend.castear_segun_esquema(df_clean, ENDPOINT, modo=MODO_CONVERSION_ESQUEMA)
+        print(a_pandas(df_clean).to_string(index=False))
         logger.info(f"✅ Transformados {len(df_clean)} registros")
         
         # 3. CARGA
         logger.info("💾 Etapa 3: Carga")
         from src.load.delta_writer import save_data_as_delta
-        from config import BRONZE_DIR, SILVER_DIR
+        from config import BRONZE_DIR, SILVER_DIR, LAYOUTS_PARTICION, PERFILES_POR_CAPA
         
         # Guardar en bronze (datos crudos)
-        save_data_as_delta(df_raw, BRONZE_DIR / f"{SYMBOL}_raw")
+        save_data_as_delta(df_raw, BRONZE_DIR / f"{SYMBOL}_raw", layout=LAYOUTS_PARTICION["klines"],
+                           perfil=PERFILES_POR_CAPA["bronze"])
         
         # Guardar en silver (datos procesados)
-        save_data_as_delta(df_clean, SILVER_DIR / f"{SYMBOL}_clean")
+        save_data_as_delta(df_clean, SILVER_DIR / f"{SYMBOL}_clean", layout=LAYOUTS_PARTICION["klines"],
+                           perfil=PERFILES_POR_CAPA["silver"])
         
         # 4. QUALITY CHECK
         logger.info("🔍 Etapa 4: Control de calidad")
         from src.quality.profiling import generar_profiling_report
         
-        report = generar_profiling_report(df_clean)
+        report = generar_profiling_report(a_pandas(df_clean))
         report_path = Path("reports") / f"profile_{SYMBOL}_{start_time.strftime('%Y%m%d_%H%M%S')}.html"
         report_path.parent.mkdir(exist_ok=True)
         report.to_file(report_path)
@@ -82,5 +119,207 @@ def run_full_pipeline():
         logger.error(f"❌ Error en el pipeline: {e}")
         raise
 
+
+def run_multi_symbol_extraction():
+    """Extrae en paralelo todos los símbolos e intervalos configurados y los guarda en bronze"""
+    logger.info("📥 Extracción multi-símbolo")
+    from src.extract.async_extractor import extraer_simbolos_a_tablas
+    from src.extract.http_client import obtener_cliente
+    from src.load.delta_writer import save_new_data_as_delta
+    from src.extract.response_cache import CacheDeRespuestas
+    from config import (BINANCE_BASE_URL, ENDPOINT, PARAMS, HEADERS, MAX_RETRIES, RETRY_DELAY,
+                        SYMBOLS, INTERVALS, MAX_CONCURRENCY, PATH_BRONZE_DELTALAKE_MULTI_SIMBOLO,
+                        PATH_CACHE_RESPUESTAS, CACHE_MAX_BYTES, LANDING_DIR, LAYOUT_MULTI_SIMBOLO, PERFILES_POR_CAPA)
+
+    def guardar_en_bronze(symbol, interval, tabla):
+        # Una tabla por intervalo con todos los símbolos; el MERGE por (symbol, open_time)
+        # permite reejecutar la extracción sin duplicar velas
+        save_new_data_as_delta(tabla, PATH_BRONZE_DELTALAKE_MULTI_SIMBOLO / interval,
+                               predicate="src.symbol = tgt.symbol AND src.open_time = tgt.open_time",
+                               layout=LAYOUT_MULTI_SIMBOLO, perfil=PERFILES_POR_CAPA["bronze"])
+        logger.info(f"✅ {symbol} {interval}: {tabla.num_rows} registros guardados en bronze")
+
+    client = obtener_cliente(BINANCE_BASE_URL, headers=HEADERS, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY)
+    tablas = extraer_simbolos_a_tablas(BINANCE_BASE_URL, ENDPOINT, SYMBOLS, INTERVALS, PARAMS,
+                                       max_concurrency=MAX_CONCURRENCY, client=client,
+                                       cache=CacheDeRespuestas(PATH_CACHE_RESPUESTAS, max_bytes=CACHE_MAX_BYTES),
+                                       landing_dir=LANDING_DIR / "api_binance" / "klines",
+                                       al_completar=guardar_en_bronze)
+    fallidas = [f"{symbol} {interval}" for symbol in SYMBOLS for interval in INTERVALS if (symbol, interval) not in tablas]
+    if fallidas:
+        logger.warning(f"⚠️ Combinaciones sin completar (reintentar con --multi-simbolo): {', '.join(fallidas)}")
+
+
+def run_backfill_repair():
+    """Completa en bronze solo los rangos de velas que faltan entre START_TIME y END_TIME"""
+    logger.info("🩹 Reparación de huecos en bronze")
+    from src.extract.api_extractor import get_data_backfill
+    from src.extract.backfill_planner import planificar_ventanas
+    from src.extract.data_loader import build_arrow_table
+    from src.extract.http_client import obtener_cliente
+    from src.extract.response_cache import CacheDeRespuestas
+    from src.load.delta_writer import save_new_data_as_delta
+    from config import (BINANCE_BASE_URL, ENDPOINT, PARAMS, HEADERS, MAX_RETRIES, RETRY_DELAY,
+                        PATH_CACHE_RESPUESTAS, CACHE_MAX_BYTES, PATH_LANDING_FULL, PATH_BRONZE_DELTALAKE_FULL,
+                        LAYOUTS_PARTICION, PERFILES_POR_CAPA)
+
+    # La ingesta de archivos históricos agrega en modo append a esta tabla: puede haber
+    # velas repetidas, así que el planificador lee open_time en lugar de confiar en los conteos
+    ventanas = planificar_ventanas(PATH_BRONZE_DELTALAKE_FULL, PARAMS['startTime'], PARAMS['endTime'],
+                                   PARAMS['interval'], PARAMS['limit'])
+    if not ventanas:
+        logger.info("✅ La tabla bronze ya cubre todo el rango")
+        return
+
+    client = obtener_cliente(BINANCE_BASE_URL, headers=HEADERS, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY)
+    datos = get_data_backfill(BINANCE_BASE_URL, endpoint=ENDPOINT, params=PARAMS, client=client,
+                              cache=CacheDeRespuestas(PATH_CACHE_RESPUESTAS, max_bytes=CACHE_MAX_BYTES),
+                              landing_dir=PATH_LANDING_FULL, ventanas=ventanas, permitir_parciales=True)
+    # El MERGE no borra datos: las ventanas que fallen quedan para la próxima reparación
+    tabla = build_arrow_table(datos, ENDPOINT)
+    save_new_data_as_delta(tabla, PATH_BRONZE_DELTALAKE_FULL, predicate="src.open_time = tgt.open_time",
+                           layout=LAYOUTS_PARTICION["klines"], perfil=PERFILES_POR_CAPA["bronze"])
+    logger.info(f"✅ {tabla.num_rows} velas faltantes guardadas en bronze")
+
+
+def run_incremental_extraction():
+    """Extrae los trades pendientes hasta el más reciente y los guarda en bronze"""
+    logger.info("📥 Extracción incremental de trades")
+    from src.extract.api_extractor import get_data_incremental_hasta_el_final
+    from src.extract.data_loader import build_arrow_table
+    from src.extract.http_client import obtener_cliente
+    from src.extract.landing_zone import guardar_pagina_cruda, nombre_pagina
+    from src.load.delta_writer import save_new_data_as_delta
+    from src.load.id_index import IndiceDeIds
+    from src.load.watermarks import leer_marca_agua
+    from config import (BINANCE_BASE_URL, ENDPOINT_INCREMENTAL, PARAMS_INCREMENTAL, HEADERS, MAX_RETRIES,
+                        RETRY_DELAY, PATH_ARCHIVO_INCREMENTAL, PATH_BRONZE_DELTALAKE_INCREMENTAL,
+                        PATH_LANDING_INCREMENTAL, LAYOUTS_PARTICION, PERFILES_POR_CAPA)
+
+    # Los trades ya cargados se descartan con el índice de ids antes de tocar la tabla
+    indice = IndiceDeIds(PATH_BRONZE_DELTALAKE_INCREMENTAL, PARAMS_INCREMENTAL['symbol'])
+
+    def guardar_en_bronze(datos, marca_agua):
+        guardar_pagina_cruda(datos, PATH_LANDING_INCREMENTAL, nombre_pagina(datos[0]['id'], datos[-1]['id']))
+        # La marca de agua viaja en el mismo commit que la página; el MERGE por id
+        # evita duplicados si la landing zone se reprocesa
+        tabla = build_arrow_table(datos, ENDPOINT_INCREMENTAL)
+        save_new_data_as_delta(tabla, PATH_BRONZE_DELTALAKE_INCREMENTAL, predicate="src.id = tgt.id",
+                               layout=LAYOUTS_PARTICION["historicalTrades"], marca_agua=marca_agua,
+                               indice_ids=indice, perfil=PERFILES_POR_CAPA["bronze"])
+
+    client = obtener_cliente(BINANCE_BASE_URL, headers=HEADERS, max_retries=MAX_RETRIES, retry_delay=RETRY_DELAY)
+    total = get_data_incremental_hasta_el_final(PATH_ARCHIVO_INCREMENTAL, BINANCE_BASE_URL, ENDPOINT_INCREMENTAL,
+                                                guardar_en_bronze, params=PARAMS_INCREMENTAL, client=client,
+                                                leer_marca_agua=lambda: leer_marca_agua(PATH_BRONZE_DELTALAKE_INCREMENTAL))
+    logger.info(f"✅ {total} trades nuevos guardados en bronze")
+
+
+def run_archive_ingestion(directorio:str, endpoint:str="klines", patron:str="*.zip"):
+    """Carga en bronze los archivos históricos mensuales (.zip con CSV) de Binance"""
+    logger.info(f"📦 Ingesta de archivos históricos desde {directorio}")
+    from src.extract.archive_ingestion import ingerir_archivos_historicos
+    from config import PATH_BRONZE_DELTALAKE_FULL, PATH_BRONZE_DELTALAKE_INCREMENTAL, LAYOUTS_PARTICION, PERFILES_POR_CAPA
+
+    path_delta = PATH_BRONZE_DELTALAKE_FULL if endpoint == "klines" else PATH_BRONZE_DELTALAKE_INCREMENTAL
+    layout = LAYOUTS_PARTICION["klines"] if endpoint == "klines" else LAYOUTS_PARTICION["historicalTrades"]
+    total = ingerir_archivos_historicos(directorio, path_delta, endpoint=endpoint, patron=patron, layout=layout,
+                                        perfil=PERFILES_POR_CAPA["bronze"])
+    logger.info(f"✅ {total} registros históricos cargados en {path_delta}")
+
+
+def run_stream_ingestion(host:str, port:int):
+    """Consume un stream de trades y lo guarda en bronze en micro-lotes"""
+    logger.info(f"📡 Ingesta en streaming desde {host}:{port}")
+    from src.extract.stream_ingestion import ingerir_stream, leer_lineas_socket
+    from config import (PATH_BRONZE_DELTALAKE_INCREMENTAL, STREAM_MAX_REGISTROS, STREAM_MAX_SEGUNDOS, LAYOUTS_PARTICION,
+                        PERFILES_POR_CAPA)
+
+    total = ingerir_stream(leer_lineas_socket(host, port), PATH_BRONZE_DELTALAKE_INCREMENTAL, tipo="trade",
+                           max_registros=STREAM_MAX_REGISTROS, max_segundos=STREAM_MAX_SEGUNDOS,
+                           layout=LAYOUTS_PARTICION["historicalTrades"], perfil=PERFILES_POR_CAPA["bronze"])
+    logger.info(f"✅ {total} trades guardados en bronze")
+
+
+def run_gold_incremental():
+    """Actualiza el resumen gold de trades incorporando solo las filas nuevas de silver"""
+    logger.info("🥇 Actualización incremental de gold")
+    from src.load.delta_writer import leer_extraccion_reciente_con_marca
+    from src.load.incremental_aggregates import actualizar_agregados_incrementales
+    from config import PATH_SILVER_DELTALAKE_INCREMENTAL, PATH_GOLD_SUMARIZED_TABLE_INCREMENTAL, PERFILES_POR_CAPA
+
+    # La marca de agua de gold indica hasta qué versión de silver ya se agregó
+    df_nuevo, marca_agua = leer_extraccion_reciente_con_marca(PATH_SILVER_DELTALAKE_INCREMENTAL,
+                                                              PATH_GOLD_SUMARIZED_TABLE_INCREMENTAL)
+    grupos = actualizar_agregados_incrementales(
+        df_nuevo, PATH_GOLD_SUMARIZED_TABLE_INCREMENTAL, by_col=["date"],
+        agg_col={"price": "mean", "qty": "sum", "id": "count"},
+        rename_cols={"price": "avg_price", "qty": "sum_qty", "id": "count_id"},
+        columna_orden="id", marca_agua=marca_agua, perfil=PERFILES_POR_CAPA["gold"])
+    logger.info(f"✅ {grupos} grupos actualizados en gold con {len(df_nuevo)} registros nuevos")
+
+
+def run_maintenance():
+    """Compacta, aplica Z-order y hace vacuum de las tablas de todas las capas"""
+    logger.info("🧹 Mantenimiento de tablas")
+    from src.load.maintenance import mantener_tablas
+    from config import (PATH_BRONZE_DELTALAKE_FULL, PATH_BRONZE_DELTALAKE_INCREMENTAL, PATH_SILVER_DELTALAKE_FULL,
+                        PATH_SILVER_DELTALAKE_INCREMENTAL, PATH_GOLD_SUMARIZED_TABLE_FULL,
+                        PATH_GOLD_SUMARIZED_TABLE_INCREMENTAL, PATH_GOLD_PIVOT_TABLE_FULL, PERFILES_POR_CAPA)
+
+    # Los archivos compactados se reescriben con el perfil de su capa
+    bronze, silver, gold = (PERFILES_POR_CAPA[capa] for capa in ("bronze", "silver", "gold"))
+    politicas = {
+        PATH_BRONZE_DELTALAKE_FULL: {"columnas_zorder": ["open_time"], "perfil_escritura": bronze},
+        PATH_SILVER_DELTALAKE_FULL: {"columnas_zorder": ["open_time"], "perfil_escritura": silver},
+        PATH_BRONZE_DELTALAKE_INCREMENTAL: {"columnas_zorder": ["id"], "perfil_escritura": bronze},
+        PATH_SILVER_DELTALAKE_INCREMENTAL: {"columnas_zorder": ["id"], "perfil_escritura": silver},
+        PATH_GOLD_SUMARIZED_TABLE_FULL: {"perfil_escritura": gold},
+        PATH_GOLD_SUMARIZED_TABLE_INCREMENTAL: {"perfil_escritura": gold},
+        PATH_GOLD_PIVOT_TABLE_FULL: {"perfil_escritura": gold},
+    }
+    for reporte in mantener_tablas(politicas):
+        logger.info(f"✅ {reporte['tabla']}: {reporte['archivos_antes']} -> {reporte['archivos_despues']} archivos, "
+                    f"{reporte['archivos_eliminados']} archivos eliminados por el vacuum")
+
+
 if __name__ == "__main__":
-    run_full_pipeline()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pipeline ETL de datos de Binance")
+    parser.add_argument("--replay", action="store_true",
+                        help="Reprocesa las páginas crudas de la zona de aterrizaje sin llamar a la API")
+    parser.add_argument("--multi-simbolo", action="store_true",
+                        help="Extrae en paralelo todos los SYMBOLS e INTERVALS configurados")
+    parser.add_argument("--reparar-huecos", action="store_true",
+                        help="Extrae solo los rangos de velas que faltan en bronze")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Extrae los trades nuevos desde la última marca de agua")
+    parser.add_argument("--archivos", metavar="DIRECTORIO",
+                        help="Carga en bronze los .zip históricos del directorio en lugar de usar la API")
+    parser.add_argument("--tipo-archivo", default="klines", choices=["klines", "trades"],
+                        help="Tipo de datos de los archivos históricos (por defecto klines)")
+    parser.add_argument("--stream", metavar="HOST:PUERTO",
+                        help="Consume un stream de trades (un JSON por línea) y lo guarda en micro-lotes")
+    parser.add_argument("--gold-incremental", action="store_true",
+                        help="Agrega en gold solo los trades nuevos de silver")
+    parser.add_argument("--mantenimiento", action="store_true",
+                        help="Compacta, aplica Z-order y hace vacuum de las tablas Delta")
+    args = parser.parse_args()
+    if args.mantenimiento:
+        run_maintenance()
+    elif args.gold_incremental:
+        run_gold_incremental()
+    elif args.stream:
+        host, port = args.stream.rsplit(":", 1)
+        run_stream_ingestion(host, int(port))
+    elif args.archivos:
+        run_archive_ingestion(args.archivos, endpoint=args.tipo_archivo)
+    elif args.multi_simbolo:
+        run_multi_symbol_extraction()
+    elif args.reparar_huecos:
+        run_backfill_repair()
+    elif args.incremental:
+        run_incremental_extraction()
+    else:
+        run_full_pipeline(replay=args.replay)
\ No newline at end of file
@@ -7,6 +7,7 @@ setup(
     install_requires=[
         "requests>=2.28.0",
         "pandas>=1.5.0",
+        "pyarrow>=14.0.0",
         "deltalake>=0.10.0",
         "ydata-profiling>=4.0.0",
     ]
@@ -1,8 +1,36 @@
-from .api_extractor import get_data, get_data_incremental
-from .data_loader import build_table
+from .api_extractor import get_data, get_data_incremental, get_data_incremental_hasta_el_final, get_data_backfill
+from .data_loader import build_table, build_arrow_table
+from .arrow_decoder import decodificar_klines, decodificar_trades
+from .http_client import BinanceClient, RateLimiter, obtener_cliente
+from .response_cache import CacheDeRespuestas
+from .landing_zone import guardar_pagina_cruda, leer_paginas_crudas
+from .backfill_planner import leer_cobertura_open_time, planificar_ventanas
+from .archive_ingestion import leer_archivo_zip_csv, ingerir_archivos_historicos
+from .stream_ingestion import MicroBatcher, ingerir_stream, leer_lineas_socket
+from .async_extractor import extraer_simbolos, extraer_simbolos_a_tablas
 
 __all__ = [
     'get_data',
     'get_data_incremental',
-    'build_table'
+    'get_data_incremental_hasta_el_final',
+    'get_data_backfill',
+    'build_table',
+    'build_arrow_table',
+    'decodificar_klines',
+    'decodificar_trades',
+    'BinanceClient',
+    'RateLimiter',
+    'obtener_cliente',
+    'CacheDeRespuestas',
+    'guardar_pagina_cruda',
+    'leer_paginas_crudas',
+    'leer_cobertura_open_time',
+    'planificar_ventanas',
+    'leer_archivo_zip_csv',
+    'ingerir_archivos_historicos',
+    'MicroBatcher',
+    'ingerir_stream',
+    'leer_lineas_socket',
+    'extraer_simbolos',
+    'extraer_simbolos_a_tablas'
 ]
\ No newline at end of file
@@ -1,10 +1,17 @@
-import json
+import time
 import requests
 import pandas as pd
+from typing import Callable
+from concurrent.futures import ThreadPoolExecutor
 from utils.config_utils import obtener_archivo_incremental
+from utils.file_utils import guardar_archivo_incremental_atomico
+from utils.helpers import intervalo_a_milisegundos
+from .http_client import BinanceClient, obtener_cliente
+from .response_cache import CacheDeRespuestas
+from .landing_zone import guardar_pagina_cruda, nombre_pagina
 
 
-def get_data(base_url:str, endpoint:str, data_field:str=None, params:dict=None, headers:dict=None) -> dict | list | None:
+def get_data(base_url:str, endpoint:str, data_field:str=None, params:dict=None, headers:dict=None, client:BinanceClient=None) -> dict | list | None:
     """
     Realizar una solicitud GET a una API para obtener datos.
     
@@ -14,14 +21,15 @@ def get_data(base_url:str, endpoint:str, data_field:str=None, params:dict=None,
         params (dict): Parámetros de consulta para enviar con la solicitud.
         data_field (str): El nombre del campo en el JSON que contiene los datos.
         headers (dict): Encabezados para enviar la solicitud.
+        client (BinanceClient): Cliente HTTP a utilizar. Si no se indica, se usa
+            el cliente compartido del proceso para `base_url`.
     
     Returns:
         dict|list|None: Los datos obtenidos de la API en formato JSON.
     """
     try:
-        endpoint_url = f"{base_url}/{endpoint}"
-        response = requests.get(endpoint_url, params=params, headers=headers)
-        response.raise_for_status()
+        client = client or obtener_cliente(base_url)
+        response = client.get(endpoint, params=params, headers=headers)
         print(f'Código de estado: {response.status_code}')
         
         try:
@@ -36,7 +44,7 @@ def get_data(base_url:str, endpoint:str, data_field:str=None, params:dict=None,
         print(f"La petición ha fallado. código de error: {e}")
         
         
-def get_data_incremental(ruta_archivo_incremental: str, base_url: str, endpoint: str, params: dict = None, headers: dict = None) -> dict|None:
+def get_data_incremental(ruta_archivo_incremental: str, base_url: str, endpoint: str, params: dict = None, headers: dict = None, client: BinanceClient = None) -> dict|None:
     """
     Realiza una extracción incremental usando 'id' como campo incremental.
     Guarda el último id en un archivo JSON para la siguiente ejecución.
@@ -47,6 +55,7 @@ def get_data_incremental(ruta_archivo_incremental: str, base_url: str, endpoint:
         endpoint (str): El endpoint de la API al que se realizará la solicitud.
         params (dict): Parámetros de consulta para enviar con la solicitud.
         headers (dict): Encabezados para enviar la solicitud.
+        client (BinanceClient): Cliente HTTP a utilizar (opcional).
     
     Returns:
         dict|None: Los datos obtenidos de la API en formato JSON.
@@ -61,20 +70,237 @@ def get_data_incremental(ruta_archivo_incremental: str, base_url: str, endpoint:
     ultimo_valor = archivo_incremental['ultimo_valor']
     valor_previo =archivo_incremental['valor_previo']
         
-    params = params or {}
-    params["fromId"] = ultimo_valor + 1
+    params = {**(params or {}), "fromId": ultimo_valor + 1}
 
     # Llamada a la API
-    datos = get_data(base_url, endpoint, params=params, headers=headers)
+    datos = get_data(base_url, endpoint, params=params, headers=headers, client=client)
     print(f"Solicitando desde ID: {ultimo_valor + 1}")
 
+    if not datos:
+        print('No hay registros nuevos desde el último ID')
+        return datos
+
     # Filtrar solo IDs mayores al último valor
     nuevo_valor = max(dato['id'] for dato in datos)
 
     # Actualizar el último valor
-    with open(ruta_archivo_incremental, "w", encoding="utf-8") as f:
-        json.dump({"valor_previo":valor_previo,"ultimo_valor": nuevo_valor}, f, indent=4, ensure_ascii=False)
+    guardar_archivo_incremental_atomico({"valor_previo":valor_previo,"ultimo_valor": nuevo_valor}, ruta_archivo_incremental)
 
     print(f"Archivo incremental actualizado: {ultimo_valor} -> {nuevo_valor}")
 
     return datos
+
+
+def get_data_incremental_hasta_el_final(ruta_archivo_incremental:str, base_url:str, endpoint:str,
+                                        guardar_lote:Callable[..., None], params:dict=None,
+                                        headers:dict=None, client:BinanceClient=None,
+                                        max_paginas:int=None, leer_marca_agua:Callable[[], dict | None]=None) -> int:
+    """
+    Extrae páginas de trades desde el último id guardado hasta alcanzar el más reciente.
+    Cada página se entrega a `guardar_lote`, que debe persistirla de forma durable
+    (por ejemplo en la tabla bronce). Recién después se actualiza el id en el archivo
+    incremental de forma atómica, de modo que una ejecución interrumpida se retoma
+    exactamente desde la última página guardada.
+
+    Con `leer_marca_agua` el id no se guarda en el archivo: se llama
+    `guardar_lote(datos, marca_agua)` y esa función debe registrar la marca en el
+    mismo commit Delta que la página (p. ej. `save_new_data_as_delta(..., marca_agua=marca_agua)`).
+    El punto de partida es la marca que devuelve `leer_marca_agua` (p. ej. la del log
+    de esa tabla); el archivo incremental solo se usa si todavía no hay marca. La capa
+    de extracción no lee tablas: quien llama provee el lector.
+
+    Args:
+        ruta_archivo_incremental (str): ruta al archivo .json con la variable de control incremental.
+        base_url (str): La URL base de la API.
+        endpoint (str): El endpoint de la API al que se realizará la solicitud.
+        guardar_lote (Callable[[list], None]): Función que guarda cada página obtenida.
+        params (dict): Parámetros de consulta. 'limit' define el tamaño de página (por defecto 1000).
+        headers (dict): Encabezados para enviar la solicitud.
+        client (BinanceClient): Cliente HTTP a utilizar (opcional).
+        max_paginas (int): Cantidad máxima de páginas a procesar en esta ejecución (opcional).
+        leer_marca_agua (Callable[[], dict|None]): Devuelve la última marca de agua registrada por
+            `guardar_lote`, p. ej. `lambda: leer_marca_agua(PATH_BRONZE_DELTALAKE_INCREMENTAL)` (opcional).
+
+    Returns:
+        int: Cantidad de registros extraídos y guardados.
+    """
+    marca = leer_marca_agua() if leer_marca_agua is not None else None
+    if marca and 'ultimo_valor' in marca:
+        archivo_incremental = marca
+    else:
+        archivo_incremental = obtener_archivo_incremental(ruta_archivo_incremental)
+    if not archivo_incremental or 'ultimo_valor' not in archivo_incremental:
+        print('Archivo incremental no creado o sin campo "ultimo_valor".')
+        return 0
+
+    ultimo_valor = archivo_incremental['ultimo_valor']
+    valor_previo = archivo_incremental.get('valor_previo', ultimo_valor)
+    params = {**(params or {})}
+    limit = params.setdefault('limit', 1000)
+    total = 0
+    paginas = 0
+
+    while max_paginas is None or paginas < max_paginas:
+        params['fromId'] = ultimo_valor + 1
+        datos = get_data(base_url, endpoint, params=params, headers=headers, client=client)
+        if datos is None:
+            print(f'Extracción interrumpida en el ID {ultimo_valor + 1}; se retomará desde allí')
+            break
+        if not datos:
+            break
+
+        nuevo_valor = max(dato['id'] for dato in datos)
+        if leer_marca_agua is not None:
+            guardar_lote(datos, {"ultimo_valor": nuevo_valor})
+        else:
+            guardar_lote(datos)
+            guardar_archivo_incremental_atomico({"valor_previo": valor_previo, "ultimo_valor": nuevo_valor}, ruta_archivo_incremental)
+        ultimo_valor = nuevo_valor
+        total += len(datos)
+        paginas += 1
+
+        # Una página incompleta indica que se alcanzó el trade más reciente
+        if len(datos) < limit:
+            break
+
+    print(f'Extracción incremental: {total} registros en {paginas} páginas, último ID {ultimo_valor}')
+    return total
+
+
+def dividir_en_ventanas(start_time:int, end_time:int, intervalo:str, limit:int=1000) -> list[tuple[int, int]]:
+    """
+    Divide el rango [start_time, end_time] en ventanas que contienen como máximo
+    `limit` velas del intervalo indicado.
+
+    Args:
+        start_time (int): Inicio del rango en milisegundos.
+        end_time (int): Fin del rango en milisegundos (inclusive).
+        intervalo (str): Intervalo de las velas, por ejemplo '1m' o '1d'.
+        limit (int): Cantidad máxima de velas por ventana.
+
+    Returns:
+        list[tuple[int, int]]: Lista ordenada de ventanas (inicio, fin) en milisegundos.
+    """
+    paso = intervalo_a_milisegundos(intervalo) * limit
+    ventanas = []
+    inicio = start_time
+    while inicio <= end_time:
+        fin = min(inicio + paso - 1, end_time)
+        ventanas.append((inicio, fin))
+        inicio = fin + 1
+    return ventanas
+
+
+def get_data_ventana(base_url:str, endpoint:str, params:dict, headers:dict=None, client:BinanceClient=None,
+                     cache:CacheDeRespuestas=None, landing_dir:str=None) -> list | None:
+    """
+    Solicita una ventana de velas [params['startTime'], params['endTime']].
+    Si se indica una cache, las ventanas ya cerradas (cuya última vela ya cerró)
+    se leen y se guardan en ella; solo la ventana abierta va siempre a la red.
+    Si se indica `landing_dir`, la página cruda se persiste en la zona de aterrizaje.
+
+    Args:
+        base_url (str): La URL base de la API.
+        endpoint (str): El endpoint de la API al que se realizará la solicitud.
+        params (dict): Parámetros de consulta con 'symbol', 'interval', 'startTime' y 'endTime'.
+        headers (dict): Encabezados para enviar la solicitud.
+        client (BinanceClient): Cliente HTTP a utilizar (opcional).
+        cache (CacheDeRespuestas): Cache de respuestas en disco (opcional).
+        landing_dir (str): Carpeta de la zona de aterrizaje de datos crudos (opcional).
+
+    Returns:
+        list|None: Velas de la ventana, o None si la solicitud falló.
+    """
+    clave = (endpoint, params.get('symbol'), params['interval'], params['startTime'], params['endTime'])
+    ventana_cerrada = params['endTime'] + intervalo_a_milisegundos(params['interval']) <= time.time() * 1000
+
+    datos = cache.obtener(*clave) if cache and ventana_cerrada else None
+    desde_cache = datos is not None
+
+    if not desde_cache:
+        datos = get_data(base_url, endpoint, params=params, headers=headers, client=client)
+        if cache and ventana_cerrada and datos is not None:
+            cache.guardar(*clave, datos)
+
+    if landing_dir and datos is not None:
+        # Una ventana cerrada que ya está en la zona de aterrizaje no cambia: no se reescribe
+        nombre = nombre_pagina(params.get('symbol'), params['interval'], params['startTime'], params['endTime'])
+        guardar_pagina_cruda(datos, landing_dir, nombre, sobrescribir=not (desde_cache and ventana_cerrada))
+    return datos
+
+
+def get_data_backfill(base_url:str, endpoint:str, params:dict, headers:dict=None, max_workers:int=8,
+                      client:BinanceClient=None, cache:CacheDeRespuestas=None, landing_dir:str=None,
+                      ventanas:list[tuple[int, int]]=None, permitir_parciales:bool=False) -> list:
+    """
+    Realiza una extracción full de velas (klines) paginando automáticamente el rango
+    entre params['startTime'] y params['endTime'] en ventanas de params['limit'] velas.
+    Las ventanas se solicitan en paralelo con un pool acotado de hilos y se
+    reensamblan en orden por open_time, sin duplicados.
+
+    Args:
+        base_url (str): La URL base de la API.
+        endpoint (str): El endpoint de la API al que se realizará la solicitud.
+        params (dict): Parámetros de consulta. Requiere 'interval', 'startTime' y 'endTime'.
+        headers (dict): Encabezados para enviar la solicitud.
+        max_workers (int): Cantidad máxima de solicitudes simultáneas.
+        client (BinanceClient): Cliente HTTP compartido por todas las ventanas (opcional).
+        cache (CacheDeRespuestas): Cache en disco para las ventanas ya cerradas (opcional).
+        landing_dir (str): Carpeta donde persistir cada página cruda (opcional).
+        ventanas (list[tuple[int, int]]): Ventanas a solicitar, por ejemplo las de
+            `planificar_ventanas`. Si no se indican, se cubre todo el rango de params.
+        permitir_parciales (bool): Si es False (default), falla cuando alguna ventana no se
+            pudo obtener, para no reemplazar una tabla con datos incompletos. Con True se
+            devuelven las velas obtenidas (p. ej. para un MERGE que no borra datos).
+
+    Returns:
+        list: Lista de velas ordenadas por open_time.
+    """
+    limit = params.get('limit', 1000)
+    if ventanas is None:
+        ventanas = dividir_en_ventanas(params['startTime'], params['endTime'], params['interval'], limit)
+    client = client or obtener_cliente(base_url)
+
+    def _solicitar_ventana(ventana:tuple[int, int]) -> list | None:
+        params_ventana = {**params, 'startTime': ventana[0], 'endTime': ventana[1], 'limit': limit}
+        return get_data_ventana(base_url, endpoint, params_ventana, headers=headers, client=client,
+                                cache=cache, landing_dir=landing_dir)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        paginas = list(executor.map(_solicitar_ventana, ventanas))
+
+    return reensamblar_velas(ventanas, paginas, permitir_parciales)
+
+
+def reensamblar_velas(ventanas:list[tuple[int, int]], paginas:list, permitir_parciales:bool=False) -> list:
+    """
+    Une las páginas de velas obtenidas para cada ventana en una única lista
+    ordenada por open_time y sin duplicados.
+
+    Args:
+        ventanas (list[tuple[int, int]]): Ventanas solicitadas, en el mismo orden que `paginas`.
+        paginas (list): Respuesta de la API para cada ventana (None si la solicitud falló).
+        permitir_parciales (bool): Si es False, lanza RuntimeError cuando falta alguna ventana.
+
+    Returns:
+        list: Lista de velas ordenadas por open_time.
+    """
+    # Las ventanas no se solapan, pero se deduplica por open_time
+    # por si la API devuelve una vela en el límite de dos ventanas.
+    velas = {}
+    ventanas_fallidas = []
+    for ventana, pagina in zip(ventanas, paginas):
+        if pagina is None:
+            ventanas_fallidas.append(ventana)
+            continue
+        for vela in pagina:
+            velas.setdefault(vela[0], vela)
+
+    if ventanas_fallidas:
+        mensaje = f'No se pudieron obtener {len(ventanas_fallidas)} ventanas: {ventanas_fallidas}'
+        if not permitir_parciales:
+            raise RuntimeError(mensaje)
+        print(mensaje)
+    print(f'Backfill completado: {len(velas)} velas en {len(ventanas)} ventanas')
+
+    return [velas[open_time] for open_time in sorted(velas)]
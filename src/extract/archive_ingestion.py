@@ -0,0 +1,96 @@
+import os
+import glob
+import zipfile
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv
+from utils.schemas import REGISTRO_ESQUEMAS
+from load.delta_writer import save_data_as_delta
+
+
+# Esquema de cada tipo de archivo publicado en data.binance.vision
+ESQUEMAS_ARCHIVO = {
+    endpoint: REGISTRO_ESQUEMAS[endpoint]['schema'] for endpoint in ('klines', 'historicalTrades', 'trades', 'aggTrades')
+}
+
+# Columnas de tiempo que pueden venir en microsegundos en los archivos más recientes
+COLUMNAS_TIEMPO = ['open_time', 'close_time', 'time']
+
+
+def _tiene_encabezado(archivo) -> bool:
+    # Algunos archivos traen encabezado y otros no: se mira si la primera celda es numérica
+    primera_linea = archivo.readline().decode('utf-8').strip()
+    return not primera_linea.split(',')[0].isdigit()
+
+
+def _normalizar_milisegundos(tabla:pa.Table) -> pa.Table:
+    # Desde 2025 los archivos spot usan microsegundos; la API y las tablas bronce usan milisegundos
+    for nombre in COLUMNAS_TIEMPO:
+        if nombre in tabla.column_names:
+            columna = tabla[nombre]
+            if len(columna) and pc.max(columna).as_py() > 10**14:
+                tabla = tabla.set_column(tabla.column_names.index(nombre), nombre, pc.divide(columna, 1000))
+    return tabla
+
+
+def leer_archivo_zip_csv(ruta_zip:str, endpoint:str='klines') -> pa.Table:
+    """
+    Lee un archivo mensual comprimido de Binance (uno o más .csv dentro de un .zip)
+    con el lector CSV multihilo de Arrow, aplicando el esquema tipado del endpoint.
+
+    Args:
+        ruta_zip (str): Ruta al archivo .zip.
+        endpoint (str): Tipo de datos del archivo ('klines' | 'trades' | 'historicalTrades' | 'aggTrades').
+
+    Returns:
+        pa.Table: Tabla de Arrow con las columnas de config.constants.COLS (klines) o de los trades.
+    """
+    schema = ESQUEMAS_ARCHIVO[endpoint]
+    tablas = []
+    with zipfile.ZipFile(ruta_zip) as zf:
+        for nombre in sorted(n for n in zf.namelist() if n.endswith('.csv')):
+            with zf.open(nombre) as f:
+                saltear = 1 if _tiene_encabezado(f) else 0
+            with zf.open(nombre) as f:
+                tablas.append(csv.read_csv(
+                    f,
+                    read_options=csv.ReadOptions(column_names=schema.names, skip_rows=saltear, use_threads=True),
+                    convert_options=csv.ConvertOptions(column_types={campo.name: campo.type for campo in schema}),
+                ))
+    if not tablas:
+        return schema.empty_table()
+    return _normalizar_milisegundos(pa.concat_tables(tablas)).cast(schema)
+
+
+def ingerir_archivos_historicos(directorio:str, path_delta:str, endpoint:str='klines', patron:str='*.zip',
+                                partition_cols:list|str=None, layout:dict=None, perfil:str|dict=None) -> int:
+    """
+    Carga en una tabla Delta de la capa bronce todos los archivos históricos
+    comprimidos de un directorio, uno por commit y en orden de nombre
+    (que en los archivos de Binance coincide con el orden cronológico).
+
+    Args:
+        directorio (str): Carpeta con los .zip descargados de data.binance.vision.
+        path_delta (str): Ruta de la tabla Delta Lake de destino.
+        endpoint (str): Tipo de datos de los archivos ('klines' | 'trades' | 'historicalTrades' | 'aggTrades').
+        patron (str): Patrón glob de los archivos a ingerir, por ejemplo 'SOLUSDT-1m-2024-*.zip'.
+        partition_cols (list or str): Columna/s de partición de la tabla (opcional).
+        layout (dict): Layout de particionado derivado del tiempo; reemplaza a `partition_cols` (opcional).
+        perfil (str|dict): Perfil de escritura Parquet, p. ej. 'bronze-fast-ingest' (opcional).
+
+    Returns:
+        int: Cantidad total de registros cargados.
+    """
+    archivos = sorted(glob.glob(os.path.join(str(directorio), patron)))
+    if not archivos:
+        print(f'No se encontraron archivos "{patron}" en {directorio}')
+        return 0
+
+    total = 0
+    for ruta_zip in archivos:
+        tabla = leer_archivo_zip_csv(ruta_zip, endpoint)
+        save_data_as_delta(tabla, path_delta, mode='append', partition_cols=partition_cols, layout=layout,
+                           perfil=perfil)
+        total += tabla.num_rows
+        print(f'{os.path.basename(ruta_zip)}: {tabla.num_rows} registros cargados')
+    return total
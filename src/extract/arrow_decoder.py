@@ -0,0 +1,87 @@
+import pyarrow as pa
+from utils.schemas import KLINES_SCHEMA, TRADES_SCHEMA, con_precios_decimales, obtener_esquema
+
+
+def _columna(valores:list|tuple, field:pa.Field) -> pa.Array:
+    # Binance envía precios y volúmenes como strings: se construye el arreglo
+    # como string y se castea en Arrow, sin pasar por objetos de Python intermedios.
+    if pa.types.is_floating(field.type) or pa.types.is_decimal(field.type):
+        return pa.array(valores, type=pa.string()).cast(field.type)
+    return pa.array(valores, type=field.type)
+
+
+def decodificar_klines(json_data:list, precios_decimales:bool=False) -> pa.Table:
+    """
+    Convierte la respuesta JSON de binance/klines (lista de listas) directamente
+    en una tabla de Arrow con esquema fijo (KLINES_SCHEMA).
+
+    Args:
+        json_data (list): Lista de velas tal como las devuelve la API.
+        precios_decimales (bool): Si es True, precios y volúmenes se guardan como
+            decimal128(20, 8) en lugar de float64.
+
+    Returns:
+        pa.Table: Tabla tipada con una fila por vela.
+    """
+    schema = con_precios_decimales(KLINES_SCHEMA) if precios_decimales else KLINES_SCHEMA
+    if not json_data:
+        return schema.empty_table()
+    columnas = list(zip(*json_data))
+    return pa.Table.from_arrays(
+        [_columna(valores, field) for valores, field in zip(columnas, schema)],
+        schema=schema
+    )
+
+
+def decodificar_trades(json_data:list, precios_decimales:bool=False) -> pa.Table:
+    """
+    Convierte la respuesta JSON de binance/historicalTrades (lista de diccionarios)
+    directamente en una tabla de Arrow con esquema fijo (TRADES_SCHEMA).
+
+    Args:
+        json_data (list): Lista de trades tal como los devuelve la API.
+        precios_decimales (bool): Si es True, precio y cantidades se guardan como
+            decimal128(20, 8) en lugar de float64.
+
+    Returns:
+        pa.Table: Tabla tipada con una fila por trade.
+    """
+    schema = con_precios_decimales(TRADES_SCHEMA) if precios_decimales else TRADES_SCHEMA
+    if not json_data:
+        return schema.empty_table()
+    return pa.Table.from_arrays(
+        [_columna([trade[field.name] for trade in json_data], field) for field in schema],
+        schema=schema
+    )
+
+
+def decodificar_agg_trades(json_data:list, precios_decimales:bool=False) -> pa.Table:
+    """
+    Convierte la respuesta JSON de binance/aggTrades (lista de diccionarios con
+    claves abreviadas) en una tabla de Arrow con el esquema registrado del endpoint,
+    usando la correspondencia de claves del registro (p. ej. 'a' -> 'agg_trade_id').
+
+    Args:
+        json_data (list): Lista de trades agregados tal como los devuelve la API.
+        precios_decimales (bool): Si es True, precio y cantidad se guardan como
+            decimal128(20, 8) en lugar de float64.
+
+    Returns:
+        pa.Table: Tabla tipada con una fila por trade agregado.
+    """
+    registro = obtener_esquema('aggTrades')
+    schema = con_precios_decimales(registro['schema']) if precios_decimales else registro['schema']
+    if not json_data:
+        return schema.empty_table()
+    claves = registro.get('claves_json', {})
+    return pa.Table.from_arrays(
+        [_columna([trade[claves.get(field.name, field.name)] for trade in json_data], field) for field in schema],
+        schema=schema
+    )
+
+
+DECODIFICADORES = {
+    'klines': decodificar_klines,
+    'historicalTrades': decodificar_trades,
+    'aggTrades': decodificar_agg_trades,
+}
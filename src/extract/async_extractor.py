@@ -0,0 +1,120 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable
+import pyarrow as pa
+from .api_extractor import get_data_ventana, dividir_en_ventanas, reensamblar_velas
+from .data_loader import build_arrow_table
+from .http_client import BinanceClient, obtener_cliente
+from .response_cache import CacheDeRespuestas
+
+
+async def extraer_simbolos(base_url:str, endpoint:str, symbols:list[str], intervals:list[str], params:dict,
+                           headers:dict=None, max_concurrency:int=16, client:BinanceClient=None,
+                           cache:CacheDeRespuestas=None, landing_dir:str=None) -> AsyncIterator[tuple[str, str, list]]:
+    """
+    Extrae velas (klines) para cada combinación de símbolo e intervalo de forma concurrente,
+    paginando el rango params['startTime']-params['endTime'] de cada una.
+    Todas las ventanas de todos los símbolos comparten un único límite global de
+    solicitudes en vuelo y el mismo cliente HTTP (y por lo tanto el mismo limitador de peso).
+    Si falla alguna ventana de una combinación, esa combinación se informa con velas None
+    y el resto de los símbolos sigue su curso.
+
+    Args:
+        base_url (str): La URL base de la API.
+        endpoint (str): El endpoint de la API al que se realizará la solicitud.
+        symbols (list[str]): Pares a extraer, por ejemplo ['SOLUSDT', 'BTCUSDT'].
+        intervals (list[str]): Intervalos a extraer, por ejemplo ['1m', '1d'].
+        params (dict): Parámetros base. 'symbol' e 'interval' se reemplazan en cada combinación.
+        headers (dict): Encabezados para enviar la solicitud.
+        max_concurrency (int): Cantidad máxima de solicitudes simultáneas en todo el proceso.
+        client (BinanceClient): Cliente HTTP compartido (opcional).
+        cache (CacheDeRespuestas): Cache en disco para las ventanas ya cerradas (opcional).
+        landing_dir (str): Carpeta donde persistir cada página cruda (opcional).
+
+    Yields:
+        tuple[str, str, list|None]: (símbolo, intervalo, velas) a medida que termina cada combinación;
+        velas es None si la combinación no se pudo completar.
+    """
+    client = client or obtener_cliente(base_url)
+    limit = params.get('limit', 1000)
+    loop = asyncio.get_running_loop()
+    semaforo = asyncio.Semaphore(max_concurrency)
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+
+        async def _solicitar(params_ventana:dict) -> list | None:
+            async with semaforo:
+                return await loop.run_in_executor(
+                    executor, lambda: get_data_ventana(base_url, endpoint, params_ventana, headers=headers,
+                                                     client=client, cache=cache, landing_dir=landing_dir))
+
+        async def _extraer(symbol:str, interval:str) -> tuple[str, str, list | None]:
+            ventanas = dividir_en_ventanas(params['startTime'], params['endTime'], interval, limit)
+            paginas = await asyncio.gather(*[
+                _solicitar({**params, 'symbol': symbol, 'interval': interval,
+                            'startTime': inicio, 'endTime': fin, 'limit': limit})
+                for inicio, fin in ventanas
+            ])
+            try:
+                return symbol, interval, reensamblar_velas(ventanas, paginas)
+            except RuntimeError as e:
+                print(f'{symbol} {interval}: {e}')
+                return symbol, interval, None
+
+        tareas = [_extraer(symbol, interval) for symbol in symbols for interval in intervals]
+        for tarea in asyncio.as_completed(tareas):
+            yield await tarea
+
+
+def extraer_simbolos_a_tablas(base_url:str, endpoint:str, symbols:list[str], intervals:list[str], params:dict,
+                              headers:dict=None, max_concurrency:int=16, client:BinanceClient=None,
+                              cache:CacheDeRespuestas=None, landing_dir:str=None, precios_decimales:bool=False,
+                              al_completar:Callable[[str, str, pa.Table], None]=None) -> dict[tuple[str, str], pa.Table]:
+    """
+    Versión sincrónica de `extraer_simbolos` que construye una tabla de Arrow tipada
+    por combinación con `build_arrow_table` y agrega las columnas 'symbol' e 'interval'.
+    Si se indica `al_completar`, se invoca con cada tabla apenas termina su extracción,
+    por ejemplo para guardarla en la capa bronce sin esperar al resto de los símbolos.
+    Las combinaciones con ventanas fallidas se omiten y se informan al final, sin
+    descartar las que sí se completaron.
+
+    Args:
+        base_url (str): La URL base de la API.
+        endpoint (str): El endpoint de la API al que se realizará la solicitud.
+        symbols (list[str]): Pares a extraer.
+        intervals (list[str]): Intervalos a extraer.
+        params (dict): Parámetros base de la consulta.
+        headers (dict): Encabezados para enviar la solicitud.
+        max_concurrency (int): Cantidad máxima de solicitudes simultáneas.
+        client (BinanceClient): Cliente HTTP compartido (opcional).
+        cache (CacheDeRespuestas): Cache en disco para las ventanas ya cerradas (opcional).
+        landing_dir (str): Carpeta donde persistir cada página cruda (opcional).
+        precios_decimales (bool): Guardar precios como decimal en lugar de float64.
+        al_completar (Callable): Función (symbol, interval, tabla) a ejecutar por cada resultado.
+
+    Returns:
+        dict[tuple[str, str], pa.Table]: Tablas por (símbolo, intervalo) de las combinaciones completas.
+    """
+    async def _ejecutar() -> dict:
+        tablas = {}
+        fallidas = []
+        async for symbol, interval, datos in extraer_simbolos(
+                base_url, endpoint, symbols, intervals, params, headers, max_concurrency, client, cache,
+                landing_dir):
+            if datos is None:
+                fallidas.append(f'{symbol} {interval}')
+                continue
+            tabla = build_arrow_table(datos, endpoint, precios_decimales=precios_decimales)
+            if tabla is None:
+                continue
+            tabla = (tabla.append_column('symbol', pa.array([symbol] * tabla.num_rows, pa.string()))
+                          .append_column('interval', pa.array([interval] * tabla.num_rows, pa.string())))
+            print(f'{symbol} {interval}: {tabla.num_rows} registros extraídos')
+            if al_completar:
+                al_completar(symbol, interval, tabla)
+            tablas[(symbol, interval)] = tabla
+        if fallidas:
+            print(f'No se pudieron completar {len(fallidas)} combinaciones: {", ".join(sorted(fallidas))}')
+        return tablas
+
+    return asyncio.run(_ejecutar())
@@ -0,0 +1,142 @@
+import os
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from deltalake import DeltaTable
+from deltalake.exceptions import TableNotFoundError
+from utils.helpers import intervalo_a_milisegundos
+from .api_extractor import dividir_en_ventanas
+
+
+def _a_milisegundos(valores:pa.Array | pa.ChunkedArray) -> list:
+    # open_time puede estar guardado como timestamp (build_table) o como int64 en ms (build_arrow_table)
+    if pa.types.is_timestamp(valores.type):
+        valores = valores.cast(pa.timestamp('ms'))
+    return valores.cast(pa.int64()).to_pylist()
+
+
+def _unir_intervalos(intervalos:list[tuple[int, int]], paso:int) -> list[tuple[int, int]]:
+    # Une intervalos solapados o contiguos (separados por exactamente una vela)
+    unidos = []
+    for inicio, fin in sorted(intervalos):
+        if unidos and inicio <= unidos[-1][1] + paso:
+            unidos[-1] = (unidos[-1][0], max(unidos[-1][1], fin))
+        else:
+            unidos.append((inicio, fin))
+    return unidos
+
+
+def _tramos_continuos(open_times:list[int], paso:int) -> list[tuple[int, int]]:
+    tramos = []
+    for open_time in sorted(set(open_times)):
+        if tramos and open_time == tramos[-1][1] + paso:
+            tramos[-1] = (tramos[-1][0], open_time)
+        else:
+            tramos.append((open_time, open_time))
+    return tramos
+
+
+def leer_cobertura_open_time(path:str, intervalo:str, symbol:str=None, claves_unicas:bool=False) -> list[tuple[int, int]]:
+    """
+    Calcula los tramos de open_time ya presentes en una tabla Delta de velas.
+    Si la tabla garantiza un open_time único por fila (`claves_unicas`), se usan las
+    estadísticas min/max y la cantidad de registros de cada archivo: si un archivo
+    tiene tantas filas como velas entre su mínimo y su máximo, se considera completo
+    sin leerlo. En otro caso (p. ej. tablas con ingestas en modo append, donde un
+    archivo puede tener velas repetidas y la misma cantidad de huecos) se lee la
+    columna open_time de cada archivo para ubicar los huecos internos.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake en la capa bronce.
+        intervalo (str): Intervalo de las velas guardadas, por ejemplo '1m'.
+        symbol (str): Si la tabla está particionada por 'symbol', considera solo ese símbolo (opcional).
+        claves_unicas (bool): La tabla no tiene open_time repetidos (solo se escribe con MERGE por open_time).
+
+    Returns:
+        list[tuple[int, int]]: Tramos (primer open_time, último open_time) en milisegundos, ordenados.
+    """
+    paso = intervalo_a_milisegundos(intervalo)
+    try:
+        # Se abre una sola vez por planificación: la capa de extracción no usa la cache de load
+        dt = DeltaTable(str(path))
+    except TableNotFoundError:
+        return []
+
+    acciones = pa.table(dt.get_add_actions(flatten=True))
+    if symbol is not None and 'partition.symbol' in acciones.column_names:
+        acciones = acciones.filter(pc.equal(acciones['partition.symbol'], symbol))
+    if acciones.num_rows == 0:
+        return []
+    if 'min.open_time' not in acciones.column_names:
+        raise ValueError(f'La tabla {path} no tiene estadísticas de open_time')
+
+    minimos = _a_milisegundos(acciones['min.open_time'])
+    maximos = _a_milisegundos(acciones['max.open_time'])
+    registros = acciones['num_records'].to_pylist()
+    rutas = acciones['path'].to_pylist()
+
+    cubiertos = []
+    for ruta, minimo, maximo, cantidad in zip(rutas, minimos, maximos, registros):
+        if minimo is None or maximo is None:
+            continue
+        if claves_unicas and cantidad == (maximo - minimo) // paso + 1:
+            cubiertos.append((minimo, maximo))
+        else:
+            columna = pq.read_table(os.path.join(str(path), ruta), columns=['open_time'])['open_time']
+            cubiertos.extend(_tramos_continuos(_a_milisegundos(columna.drop_null()), paso))
+
+    return _unir_intervalos(cubiertos, paso)
+
+
+def calcular_rangos_faltantes(start_time:int, end_time:int, cubiertos:list[tuple[int, int]], intervalo:str) -> list[tuple[int, int]]:
+    """
+    Devuelve los rangos de [start_time, end_time] que no están cubiertos.
+
+    Args:
+        start_time (int): Inicio del rango pedido en milisegundos.
+        end_time (int): Fin del rango pedido en milisegundos (inclusive).
+        cubiertos (list[tuple[int, int]]): Tramos de open_time ya presentes, ordenados y unidos.
+        intervalo (str): Intervalo de las velas.
+
+    Returns:
+        list[tuple[int, int]]: Rangos faltantes (inicio, fin) en milisegundos.
+    """
+    paso = intervalo_a_milisegundos(intervalo)
+    faltantes = []
+    cursor = start_time
+    for inicio, fin in cubiertos:
+        if fin < cursor:
+            continue
+        if inicio > end_time:
+            break
+        if inicio > cursor:
+            faltantes.append((cursor, inicio - 1))
+        cursor = max(cursor, fin + paso)
+    if cursor <= end_time:
+        faltantes.append((cursor, end_time))
+    return faltantes
+
+
+def planificar_ventanas(path:str, start_time:int, end_time:int, intervalo:str, limit:int=1000,
+                        symbol:str=None, claves_unicas:bool=False) -> list[tuple[int, int]]:
+    """
+    Calcula el conjunto mínimo de ventanas de API necesario para completar el rango
+    pedido, teniendo en cuenta lo que ya existe en la tabla Delta de la capa bronce.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake en la capa bronce.
+        start_time (int): Inicio del rango pedido en milisegundos.
+        end_time (int): Fin del rango pedido en milisegundos (inclusive).
+        intervalo (str): Intervalo de las velas.
+        limit (int): Cantidad máxima de velas por ventana.
+        symbol (str): Símbolo a considerar si la tabla está particionada por 'symbol' (opcional).
+        claves_unicas (bool): La tabla no tiene open_time repetidos (ver `leer_cobertura_open_time`).
+
+    Returns:
+        list[tuple[int, int]]: Ventanas (inicio, fin) a solicitar, en orden.
+    """
+    cubiertos = leer_cobertura_open_time(path, intervalo, symbol, claves_unicas)
+    faltantes = calcular_rangos_faltantes(start_time, end_time, cubiertos, intervalo)
+    ventanas = [ventana for inicio, fin in faltantes for ventana in dividir_en_ventanas(inicio, fin, intervalo, limit)]
+    print(f'Plan de backfill: {len(faltantes)} rangos faltantes, {len(ventanas)} ventanas a solicitar')
+    return ventanas
@@ -1,4 +1,6 @@
 import pandas as pd
+import pyarrow as pa
+from .arrow_decoder import DECODIFICADORES
 
 
 def build_table(json_data:dict|list, columns:list=None) -> pd.DataFrame:
@@ -29,4 +31,29 @@ def build_table(json_data:dict|list, columns:list=None) -> pd.DataFrame:
         return df
     except:
         print("Los datos no están en el formato esperado")
-        return None
\ No newline at end of file
+        return None
+
+
+def build_arrow_table(json_data:list, endpoint:str='klines', precios_decimales:bool=False) -> pa.Table|None:
+    """
+    Construye una tabla de Arrow tipada a partir de los datos JSON de la API,
+    sin pasar por un DataFrame de pandas con columnas object.
+
+    Args:
+        json_data (list): los datos en formato JSON obtenidos de la API.
+        endpoint (str): nombre del endpoint de origen ('klines' | 'historicalTrades').
+            Acepta también la ruta completa, por ejemplo 'api/v3/klines'.
+        precios_decimales (bool): guardar precios como decimal en lugar de float64.
+
+    Retorna:
+        pa.Table|None: Tabla de Arrow con esquema fijo, o None si el formato no es soportado.
+    """
+    decodificador = DECODIFICADORES.get(endpoint.rsplit('/', 1)[-1])
+    if decodificador is None:
+        print(f'Endpoint no soportado: {endpoint}')
+        return None
+    try:
+        return decodificador(json_data, precios_decimales=precios_decimales)
+    except (pa.ArrowInvalid, KeyError, TypeError) as e:
+        print(f"Los datos no están en el formato esperado: {e}")
+        return None
@@ -0,0 +1,171 @@
+import time
+import random
+import threading
+import warnings
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# Peso (weight) que Binance descuenta por cada endpoint. Los no listados pesan 1.
+PESO_POR_ENDPOINT = {
+    'api/v3/klines': 2,
+    'api/v3/historicalTrades': 25,
+    'api/v3/aggTrades': 2,
+    'api/v3/depth': 5,
+}
+
+# Códigos de estado que justifican reintentar la solicitud
+CODIGOS_REINTENTABLES = {418, 429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """
+    Token bucket de peso por minuto. Se recarga de forma continua y se
+    resincroniza con el peso usado que informa Binance en el encabezado
+    X-MBX-USED-WEIGHT-1M de cada respuesta.
+    """
+
+    def __init__(self, peso_por_minuto:int=6000):
+        self.capacidad = peso_por_minuto
+        self._tokens = float(peso_por_minuto)
+        self._recarga_por_segundo = peso_por_minuto / 60
+        self._ultima_recarga = time.monotonic()
+        self._bloqueado_hasta = 0.0
+        self._lock = threading.Lock()
+
+    def _recargar(self) -> None:
+        ahora = time.monotonic()
+        self._tokens = min(self.capacidad, self._tokens + (ahora - self._ultima_recarga) * self._recarga_por_segundo)
+        self._ultima_recarga = ahora
+
+    def adquirir(self, peso:int=1) -> None:
+        """
+        Bloquea el hilo hasta que haya peso disponible y lo descuenta.
+
+        Raises:
+            ValueError: Si el peso supera la capacidad del bucket (nunca habría tokens suficientes).
+        """
+        if peso > self.capacidad:
+            raise ValueError(f'El peso de la solicitud ({peso}) supera la capacidad del limitador '
+                             f'({self.capacidad} por minuto)')
+        while True:
+            with self._lock:
+                self._recargar()
+                espera = self._bloqueado_hasta - time.monotonic()
+                if espera <= 0 and self._tokens >= peso:
+                    self._tokens -= peso
+                    return
+                if espera <= 0:
+                    espera = (peso - self._tokens) / self._recarga_por_segundo
+            time.sleep(espera)
+
+    def actualizar_desde_encabezados(self, headers:dict) -> None:
+        """Ajusta el peso disponible con el peso usado informado por la API."""
+        usado = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('X-MBX-USED-WEIGHT')
+        if usado is None:
+            return
+        with self._lock:
+            self._recargar()
+            self._tokens = max(0.0, self.capacidad - float(usado))
+
+    def pausar(self, segundos:float) -> None:
+        """Detiene todas las solicitudes durante `segundos` (por ejemplo tras un 429 con Retry-After)."""
+        with self._lock:
+            self._bloqueado_hasta = max(self._bloqueado_hasta, time.monotonic() + segundos)
+
+
+class BinanceClient:
+    """
+    Cliente HTTP con conexiones persistentes (keep-alive) compartidas entre hilos,
+    limitador de peso y reintentos con backoff exponencial ante 429/418/5xx.
+    """
+
+    def __init__(self, base_url:str, headers:dict=None, max_retries:int=3, retry_delay:float=5,
+                 pool_size:int=16, peso_por_minuto:int=6000, timeout:float=30):
+        self.base_url = base_url.rstrip('/')
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(peso_por_minuto)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def _espera_reintento(self, intento:int, response:requests.Response=None) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after is not None:
+            return float(retry_after)
+        # Backoff exponencial con jitter para no sincronizar a los hilos
+        return self.retry_delay * (2 ** intento) * (0.5 + random.random() / 2)
+
+    def get(self, endpoint:str, params:dict=None, headers:dict=None) -> requests.Response:
+        """
+        Realiza una solicitud GET respetando el límite de peso y reintentando ante
+        errores transitorios.
+
+        Args:
+            endpoint (str): El endpoint de la API, por ejemplo 'api/v3/klines'.
+            params (dict): Parámetros de consulta.
+            headers (dict): Encabezados adicionales para esta solicitud.
+
+        Returns:
+            requests.Response: La respuesta exitosa.
+
+        Raises:
+            requests.exceptions.RequestException: si se agotan los reintentos.
+        """
+        endpoint = endpoint.strip('/')
+        url = f"{self.base_url}/{endpoint}"
+        peso = PESO_POR_ENDPOINT.get(endpoint, 1)
+
+        for intento in range(self.max_retries + 1):
+            self.rate_limiter.adquirir(peso)
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if intento == self.max_retries:
+                    raise
+                time.sleep(self._espera_reintento(intento))
+                continue
+
+            self.rate_limiter.actualizar_desde_encabezados(response.headers)
+            if response.status_code not in CODIGOS_REINTENTABLES or intento == self.max_retries:
+                response.raise_for_status()
+                return response
+
+            espera = self._espera_reintento(intento, response)
+            if response.status_code in (418, 429):
+                # 429/418 afectan a toda la IP: se pausan todos los hilos, no solo este
+                self.rate_limiter.pausar(espera)
+            print(f'Código de estado {response.status_code}, reintento {intento + 1}/{self.max_retries} en {espera:.1f}s')
+            time.sleep(espera)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_clientes_compartidos = {}
+_lock_clientes = threading.Lock()
+
+
+def obtener_cliente(base_url:str, **kwargs) -> BinanceClient:
+    """
+    Devuelve el cliente compartido del proceso para `base_url`, creándolo la
+    primera vez con los argumentos indicados (max_retries, retry_delay, ...).
+    Hay un único cliente por URL para que todos compartan el límite de peso de la IP:
+    si una llamada posterior pide una configuración distinta se emite un warning
+    y se devuelve el cliente existente. Las llamadas sin argumentos no avisan.
+    """
+    with _lock_clientes:
+        if base_url not in _clientes_compartidos:
+            _clientes_compartidos[base_url] = (BinanceClient(base_url, **kwargs), kwargs)
+        cliente, configuracion = _clientes_compartidos[base_url]
+        distintos = {clave: valor for clave, valor in kwargs.items()
+                     if clave not in configuracion or configuracion[clave] != valor}
+        if distintos:
+            warnings.warn(f'Ya existe un cliente para {base_url} creado con {configuracion}; '
+                          f'se ignoran los argumentos {distintos}', stacklevel=2)
+        return cliente
@@ -0,0 +1,73 @@
+import os
+import gzip
+import json
+import tempfile
+from typing import Iterator
+
+
+EXTENSION_LANDING = '.ndjson.gz'
+
+
+def guardar_pagina_cruda(datos:list, directorio:str, nombre:str, sobrescribir:bool=True) -> str:
+    """
+    Guarda una página de la API tal como llegó, en formato JSON delimitado por
+    saltos de línea (un registro por línea) y comprimido con gzip.
+    La escritura es atómica y el nombre es determinístico, por lo que volver a
+    guardar la misma página la reemplaza en lugar de duplicarla.
+
+    Args:
+        datos (list): Registros devueltos por la API.
+        directorio (str): Carpeta de la zona de aterrizaje.
+        nombre (str): Nombre del archivo sin extensión, por ejemplo 'SOLUSDT_1d_<inicio>_<fin>'.
+        sobrescribir (bool): Si es False y la página ya existe, no se vuelve a escribir.
+
+    Returns:
+        str: Ruta del archivo guardado.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, nombre + EXTENSION_LANDING)
+    if not sobrescribir and os.path.exists(ruta):
+        return ruta
+    fd, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix='.tmp_')
+    try:
+        with os.fdopen(fd, 'wb') as f, gzip.GzipFile(fileobj=f, mode='wb') as gz:
+            for registro in datos:
+                gz.write(json.dumps(registro, separators=(',', ':')).encode('utf-8'))
+                gz.write(b'\n')
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        os.remove(ruta_temporal)
+        raise
+    return ruta
+
+
+def leer_paginas_crudas(directorio:str, prefijo:str='') -> Iterator[list]:
+    """
+    Recorre en orden de nombre las páginas guardadas en la zona de aterrizaje y
+    devuelve una por vez, sin cargar todo el directorio en memoria.
+
+    Args:
+        directorio (str): Carpeta de la zona de aterrizaje.
+        prefijo (str): Filtra los archivos cuyo nombre empieza con este prefijo (opcional).
+
+    Yields:
+        list: Registros de cada página, en el mismo formato que devuelve la API.
+    """
+    if not os.path.exists(directorio):
+        print(f'La ruta "{directorio}" no es válida')
+        return
+    nombres = sorted(
+        nombre for nombre in os.listdir(directorio)
+        if nombre.endswith(EXTENSION_LANDING) and nombre.startswith(prefijo)
+    )
+    for nombre in nombres:
+        with gzip.open(os.path.join(directorio, nombre), 'rt', encoding='utf-8') as f:
+            yield [json.loads(linea) for linea in f if linea.strip()]
+
+
+def nombre_pagina(*partes) -> str:
+    """
+    Arma el nombre de archivo de una página. Los enteros (tiempos o ids) se rellenan
+    con ceros para que el orden alfabético coincida con el orden numérico.
+    """
+    return '_'.join(f'{parte:020d}' if isinstance(parte, int) else str(parte) for parte in partes)
@@ -0,0 +1,76 @@
+import os
+import gzip
+import json
+import hashlib
+import tempfile
+import threading
+
+
+class CacheDeRespuestas:
+    """
+    Cache persistente en disco de respuestas de la API para ventanas ya cerradas.
+    Cada entrada es un archivo .json.gz identificado por (endpoint, símbolo, intervalo, ventana).
+    El tamaño total se acota con desalojo LRU usando la fecha de modificación de cada
+    archivo como marca del último acceso.
+    """
+
+    def __init__(self, directorio:str, max_bytes:int=512 * 1024 * 1024):
+        self.directorio = str(directorio)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.directorio, exist_ok=True)
+
+    def _ruta(self, endpoint:str, symbol:str, interval:str, inicio:int, fin:int) -> str:
+        clave = f"{endpoint.strip('/')}|{symbol}|{interval}|{inicio}|{fin}"
+        return os.path.join(self.directorio, hashlib.sha1(clave.encode()).hexdigest() + '.json.gz')
+
+    def obtener(self, endpoint:str, symbol:str, interval:str, inicio:int, fin:int) -> list | None:
+        """Devuelve la respuesta guardada para la ventana, o None si no está en cache."""
+        ruta = self._ruta(endpoint, symbol, interval, inicio, fin)
+        try:
+            with gzip.open(ruta, 'rt', encoding='utf-8') as f:
+                datos = json.load(f)
+        except (FileNotFoundError, EOFError, OSError, json.JSONDecodeError):
+            return None
+        # Se actualiza la fecha de modificación para el orden LRU
+        try:
+            os.utime(ruta)
+        except FileNotFoundError:
+            pass
+        return datos
+
+    def guardar(self, endpoint:str, symbol:str, interval:str, inicio:int, fin:int, datos:list) -> None:
+        """Guarda la respuesta de la ventana de forma atómica y desaloja entradas si se supera el tamaño máximo."""
+        ruta = self._ruta(endpoint, symbol, interval, inicio, fin)
+        fd, ruta_temporal = tempfile.mkstemp(dir=self.directorio, prefix='.tmp_')
+        try:
+            with os.fdopen(fd, 'wb') as f, gzip.GzipFile(fileobj=f, mode='wb') as gz:
+                gz.write(json.dumps(datos, separators=(',', ':')).encode('utf-8'))
+            os.replace(ruta_temporal, ruta)
+        except BaseException:
+            os.remove(ruta_temporal)
+            raise
+        self._desalojar()
+
+    def _desalojar(self) -> None:
+        with self._lock:
+            entradas = []
+            for entrada in os.scandir(self.directorio):
+                if entrada.name.endswith('.json.gz'):
+                    estado = entrada.stat()
+                    entradas.append((estado.st_mtime, estado.st_size, entrada.path))
+            total = sum(tamano for _, tamano, _ in entradas)
+            for _, tamano, ruta in sorted(entradas):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(ruta)
+                except FileNotFoundError:
+                    pass
+                total -= tamano
+
+    def limpiar(self) -> None:
+        """Elimina todas las entradas de la cache."""
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith('.json.gz'):
+                os.remove(entrada.path)
@@ -0,0 +1,165 @@
+import json
+import time
+import socket
+from typing import Iterable, Iterator
+import pyarrow as pa
+import pyarrow.compute as pc
+from load.delta_writer import save_data_as_delta
+from .arrow_decoder import decodificar_klines, decodificar_trades
+
+
+def leer_lineas_socket(host:str, port:int, timeout:float=1.0) -> Iterator[str | None]:
+    """
+    Lee mensajes de un servidor orientado a líneas (un JSON por línea).
+    Cada `timeout` segundos sin datos devuelve None, para que el consumidor
+    pueda cerrar micro-lotes por tiempo aunque el stream esté inactivo.
+
+    Args:
+        host (str): Host del servidor.
+        port (int): Puerto del servidor.
+        timeout (float): Segundos de espera antes de devolver None.
+
+    Yields:
+        str|None: Cada línea recibida, o None si no llegó nada en `timeout` segundos.
+    """
+    with socket.create_connection((host, port)) as sock:
+        sock.settimeout(timeout)
+        pendiente = b''
+        while True:
+            try:
+                bloque = sock.recv(65536)
+            except socket.timeout:
+                yield None
+                continue
+            if not bloque:
+                break
+            pendiente += bloque
+            *lineas, pendiente = pendiente.split(b'\n')
+            for linea in lineas:
+                if linea.strip():
+                    yield linea.decode('utf-8')
+        if pendiente.strip():
+            yield pendiente.decode('utf-8')
+
+
+def parsear_mensaje(linea:str) -> tuple[str, dict | list] | None:
+    """
+    Interpreta un mensaje de los streams 'trade' o 'kline' de Binance
+    (también envuelto como {"stream": ..., "data": ...} en streams combinados).
+    Las velas solo se devuelven cuando están cerradas.
+
+    Args:
+        linea (str): Mensaje JSON.
+
+    Returns:
+        tuple|None: ('trade', registro) o ('kline', vela), o None si el mensaje no aplica.
+    """
+    mensaje = json.loads(linea)
+    mensaje = mensaje.get('data', mensaje)
+    evento = mensaje.get('e')
+
+    if evento == 'trade':
+        return 'trade', {
+            'id': mensaje['t'],
+            'price': mensaje['p'],
+            'qty': mensaje['q'],
+            'quoteQty': None,
+            'time': mensaje['T'],
+            'isBuyerMaker': mensaje['m'],
+            'isBestMatch': mensaje.get('M', True),
+        }
+    if evento == 'kline' and mensaje['k'].get('x'):
+        k = mensaje['k']
+        return 'kline', [k['t'], k['o'], k['h'], k['l'], k['c'], k['v'], k['T'], k['q'], k['n'], k['V'], k['Q'], k.get('B', '0')]
+    return None
+
+
+class MicroBatcher:
+    """
+    Acumula registros de un stream y los escribe en una tabla Delta como un único
+    commit por micro-lote, al alcanzar `max_registros` o `max_segundos` desde el
+    primer registro pendiente, lo que ocurra primero.
+    """
+
+    def __init__(self, path:str, tipo:str='trade', max_registros:int=10000, max_segundos:float=30,
+                 partition_cols:list|str=None, layout:dict=None, perfil:str|dict=None):
+        self.path = path
+        self.tipo = tipo
+        self.max_registros = max_registros
+        self.max_segundos = max_segundos
+        self.partition_cols = partition_cols
+        self.layout = layout
+        self.perfil = perfil
+        self.pendientes = []
+        self.inicio_lote = None
+        self.lotes_escritos = 0
+        self.registros_escritos = 0
+
+    def agregar(self, registro:dict | list) -> None:
+        if not self.pendientes:
+            self.inicio_lote = time.monotonic()
+        self.pendientes.append(registro)
+        if len(self.pendientes) >= self.max_registros:
+            self.escribir()
+
+    def escribir_si_vencido(self) -> None:
+        if self.pendientes and time.monotonic() - self.inicio_lote >= self.max_segundos:
+            self.escribir()
+
+    def _a_tabla(self) -> pa.Table:
+        if self.tipo == 'kline':
+            return decodificar_klines(self.pendientes)
+        tabla = decodificar_trades(self.pendientes)
+        # El stream de trades no informa quoteQty: se calcula como precio * cantidad
+        indice = tabla.schema.get_field_index('quoteQty')
+        return tabla.set_column(indice, tabla.schema.field(indice), pc.multiply(tabla['price'], tabla['qty']))
+
+    def escribir(self) -> None:
+        """Escribe los registros pendientes en un único commit Delta."""
+        if not self.pendientes:
+            return
+        tabla = self._a_tabla()
+        save_data_as_delta(tabla, self.path, mode='append', partition_cols=self.partition_cols, layout=self.layout,
+                           perfil=self.perfil)
+        self.lotes_escritos += 1
+        self.registros_escritos += tabla.num_rows
+        print(f'Micro-lote {self.lotes_escritos}: {tabla.num_rows} registros escritos en {self.path}')
+        self.pendientes = []
+        self.inicio_lote = None
+
+
+def ingerir_stream(fuente:Iterable[str | None], path:str, tipo:str='trade', max_registros:int=10000,
+                   max_segundos:float=30, partition_cols:list|str=None, layout:dict=None,
+                   perfil:str|dict=None) -> int:
+    """
+    Consume un stream de mensajes (websocket, socket orientado a líneas o cualquier
+    iterable de líneas JSON) y lo guarda en micro-lotes en una tabla Delta.
+    Los elementos None de la fuente solo se usan para cerrar lotes por tiempo.
+    Al terminar la fuente (o al interrumpir con Ctrl+C) se escribe el lote pendiente.
+
+    Args:
+        fuente (Iterable[str|None]): Mensajes JSON, uno por elemento.
+        path (str): Ruta de la tabla Delta Lake de destino.
+        tipo (str): Tipo de mensaje a guardar ('trade' | 'kline').
+        max_registros (int): Tamaño máximo de cada micro-lote.
+        max_segundos (float): Antigüedad máxima del registro más viejo de un micro-lote.
+        partition_cols (list or str): Columna/s de partición de la tabla (opcional).
+        layout (dict): Layout de particionado derivado del tiempo; reemplaza a `partition_cols` (opcional).
+        perfil (str|dict): Perfil de escritura Parquet de cada micro-lote (opcional).
+
+    Returns:
+        int: Cantidad total de registros escritos.
+    """
+    batcher = MicroBatcher(path, tipo, max_registros, max_segundos, partition_cols, layout, perfil)
+    try:
+        for linea in fuente:
+            if linea is not None:
+                mensaje = parsear_mensaje(linea)
+                if mensaje and mensaje[0] == tipo:
+                    batcher.agregar(mensaje[1])
+            batcher.escribir_si_vencido()
+    except KeyboardInterrupt:
+        print('Stream interrumpido, escribiendo el último micro-lote')
+    finally:
+        batcher.escribir()
+    return batcher.registros_escritos
@@ -1,8 +1,38 @@
-from .delta_writer import leer_delta_lake, leer_extraccion_reciente, save_data_as_delta, save_new_data_as_delta
+from .delta_writer import leer_delta_lake, escanear_delta_lake, iterar_lotes_delta, leer_extraccion_reciente, leer_extraccion_reciente_por_version, leer_cambios_desde_version, leer_extraccion_reciente_con_marca, save_data_as_delta, save_new_data_as_delta
+from .maintenance import mantener_tabla, mantener_tablas, contar_archivos_por_particion, vaciar_archivos_no_referenciados
+from .writer_profiles import PERFILES_ESCRITURA, obtener_perfil, medir_perfiles
+from .partitioning import validar_layout, derivar_columnas_particion, filtros_particion_para_rango
+from .table_cache import obtener_tabla, invalidar_tabla
+from .watermarks import leer_marca_agua
+from .id_index import IndiceDeIds
+from .incremental_aggregates import actualizar_agregados_incrementales
+from .concurrent_writer import CoordinadorEscrituras, ejecutar_con_reintentos
 
 __all__ = [
     'leer_delta_lake',
+    'escanear_delta_lake',
+    'iterar_lotes_delta',
     'leer_extraccion_reciente',
+    'leer_extraccion_reciente_por_version',
+    'leer_cambios_desde_version',
+    'leer_extraccion_reciente_con_marca',
     'save_data_as_delta',
-    'save_new_data_as_delta'
+    'save_new_data_as_delta',
+    'mantener_tabla',
+    'mantener_tablas',
+    'contar_archivos_por_particion',
+    'vaciar_archivos_no_referenciados',
+    'PERFILES_ESCRITURA',
+    'obtener_perfil',
+    'medir_perfiles',
+    'CoordinadorEscrituras',
+    'ejecutar_con_reintentos',
+    'validar_layout',
+    'derivar_columnas_particion',
+    'filtros_particion_para_rango',
+    'obtener_tabla',
+    'invalidar_tabla',
+    'leer_marca_agua',
+    'IndiceDeIds',
+    'actualizar_agregados_incrementales'
 ]
\ No newline at end of file
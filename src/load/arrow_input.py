@@ -0,0 +1,81 @@
+import itertools
+from typing import Callable, Iterable, Iterator
+import pandas as pd
+import pyarrow as pa
+
+
+def _lotes(elementos:Iterable) -> Iterator[pa.RecordBatch]:
+    # Un iterable puede mezclar RecordBatch y Table (p. ej. un decodificador por página)
+    for elemento in elementos:
+        if isinstance(elemento, pa.Table):
+            yield from elemento.to_batches()
+        elif elemento is not None and len(elemento):
+            yield elemento
+
+
+def a_arrow(datos:pd.DataFrame|pa.Table|pa.RecordBatch|pa.RecordBatchReader|Iterable) -> pa.Table|pa.RecordBatchReader|None:
+    """
+    Normaliza los datos de entrada de los escritores a Arrow sin materializar streams.
+    Los DataFrame y RecordBatch se convierten en Table; los RecordBatchReader se
+    devuelven tal cual y los iterables de lotes (p. ej. un generador) se envuelven en
+    un RecordBatchReader que los consume de a uno.
+
+    Args:
+        datos: DataFrame, Table, RecordBatch, RecordBatchReader o iterable de RecordBatch/Table.
+
+    Returns:
+        pa.Table|pa.RecordBatchReader|None: Datos en Arrow, o None si el iterable está vacío.
+    """
+    if isinstance(datos, pd.DataFrame):
+        return pa.Table.from_pandas(datos, preserve_index=False)
+    if isinstance(datos, (pa.Table, pa.RecordBatchReader)):
+        return datos
+    if isinstance(datos, pa.RecordBatch):
+        return pa.Table.from_batches([datos])
+    lotes = _lotes(datos)
+    primero = next(lotes, None)
+    if primero is None:
+        return None
+    return pa.RecordBatchReader.from_batches(primero.schema, itertools.chain([primero], lotes))
+
+
+def transformar_lotes(datos:pa.Table|pa.RecordBatchReader, funcion:Callable[[pa.Table], pa.Table]) -> pa.Table|pa.RecordBatchReader:
+    """
+    Aplica `funcion` a una Table o, si es un stream, a cada lote a medida que se lee.
+
+    Args:
+        datos (pa.Table|pa.RecordBatchReader): Datos en Arrow.
+        funcion (Callable[[pa.Table], pa.Table]): Transformación por lote (debe mantener el esquema entre lotes).
+
+    Returns:
+        pa.Table|pa.RecordBatchReader: Datos transformados, del mismo tipo que la entrada.
+    """
+    if isinstance(datos, pa.Table):
+        return funcion(datos)
+    return a_arrow(funcion(pa.Table.from_batches([lote])) for lote in datos)
+
+
+def tramos_de_filas(datos:pa.Table|pa.RecordBatchReader, filas:int) -> Iterator[pa.Table]:
+    """
+    Agrupa un stream en tablas de al menos `filas` filas (salvo la última), para
+    operaciones que necesitan ver un tramo completo, como un MERGE.
+
+    Args:
+        datos (pa.Table|pa.RecordBatchReader): Datos en Arrow.
+        filas (int): Cantidad mínima de filas por tramo.
+
+    Yields:
+        pa.Table: Tramos consecutivos del stream.
+    """
+    if isinstance(datos, pa.Table):
+        yield datos
+        return
+    pendientes, acumuladas = [], 0
+    for lote in datos:
+        pendientes.append(lote)
+        acumuladas += lote.num_rows
+        if acumuladas >= filas:
+            yield pa.Table.from_batches(pendientes)
+            pendientes, acumuladas = [], 0
+    if pendientes:
+        yield pa.Table.from_batches(pendientes)
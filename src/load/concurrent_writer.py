@@ -0,0 +1,143 @@
+import time
+import random
+import zlib
+from typing import Callable, Iterable, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from deltalake import DeltaTable
+from deltalake.exceptions import CommitFailedError, DeltaError
+from .delta_writer import save_data_as_delta, save_new_data_as_delta
+from .arrow_input import a_arrow, tramos_de_filas
+from .partitioning import completar_columnas_particion
+from .table_cache import obtener_tabla
+
+
+T = TypeVar('T')
+
+# Fragmentos de mensajes de delta-rs que indican un conflicto de concurrencia optimista
+_MENSAJES_CONFLICTO = ('conflict', 'concurrent', 'already exists', 'transaction failed')
+
+
+def es_conflicto_commit(error:Exception) -> bool:
+    """Indica si la excepción corresponde a un commit rechazado por otro escritor concurrente."""
+    if isinstance(error, CommitFailedError):
+        return True
+    return isinstance(error, DeltaError) and any(m in str(error).lower() for m in _MENSAJES_CONFLICTO)
+
+
+def ejecutar_con_reintentos(operacion:Callable[[], T], max_reintentos:int=8, espera_base:float=0.1) -> T:
+    """
+    Ejecuta una operación de escritura Delta y la reintenta con backoff exponencial y jitter
+    cuando el commit falla por un conflicto con otro escritor. La operación debe abrir la
+    tabla en cada intento, de modo que cada reintento parte de la instantánea más reciente
+    y vuelve a evaluar su predicado contra ella.
+
+    Args:
+        operacion (Callable): Función sin argumentos que realiza la escritura.
+        max_reintentos (int): Cantidad máxima de reintentos ante conflictos.
+        espera_base (float): Espera inicial en segundos; se duplica en cada reintento.
+
+    Returns:
+        El valor devuelto por la operación.
+    """
+    for intento in range(max_reintentos + 1):
+        try:
+            return operacion()
+        except (CommitFailedError, DeltaError) as e:
+            if not es_conflicto_commit(e) or intento == max_reintentos:
+                raise
+            espera = espera_base * (2 ** intento) * (0.5 + random.random())
+            print(f'Conflicto de commit, reintento {intento + 1}/{max_reintentos} en {espera:.2f}s: {e}')
+            time.sleep(espera)
+
+
+def asignar_particiones(datos:pd.DataFrame|pa.Table, partition_cols:list[str], n_workers:int) -> list[pa.Table]:
+    """
+    Reparte las filas entre `n_workers` de modo que cada partición quede completa en un
+    único worker. Así los escritores concurrentes tocan particiones disjuntas y sus
+    commits no entran en conflicto.
+
+    Args:
+        datos (pd.DataFrame|pa.Table): Datos a escribir.
+        partition_cols (list[str]): Columnas de partición de la tabla destino.
+        n_workers (int): Cantidad de escritores.
+
+    Returns:
+        list[pa.Table]: Una tabla por worker (las vacías se omiten).
+    """
+    tabla = pa.Table.from_pandas(datos, preserve_index=False) if isinstance(datos, pd.DataFrame) else datos
+    if not partition_cols:
+        return [tabla]
+    claves = pc.binary_join_element_wise(*[tabla[c].cast(pa.string()) for c in partition_cols], '\x1f') \
+        if len(partition_cols) > 1 else tabla[partition_cols[0]].cast(pa.string())
+    worker = pa.array([zlib.crc32(str(clave).encode()) % n_workers for clave in claves.to_pylist()])
+    return [t for t in (tabla.filter(pc.equal(worker, i)) for i in range(n_workers)) if t.num_rows]
+
+
+class CoordinadorEscrituras:
+    """
+    Coordina escritores concurrentes sobre una misma tabla Delta: reintenta ante
+    conflictos de commit y, al escribir en paralelo, enruta cada partición a un
+    único escritor.
+    """
+
+    def __init__(self, path:str, partition_cols:list[str]=None, max_reintentos:int=8, espera_base:float=0.1,
+                 perfil:str|dict=None):
+        self.path = path
+        self.partition_cols = partition_cols or []
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.perfil = perfil
+
+    def escribir(self, datos:pd.DataFrame|pa.Table, mode:str='append') -> None:
+        """
+        Escribe los datos (append por defecto) reintentando ante conflictos. Un reintento
+        vuelve a escribir los mismos datos, por eso los streams no se aceptan acá: usar
+        `escribir_en_paralelo`, que los procesa por tramos.
+        """
+        ejecutar_con_reintentos(
+            lambda: save_data_as_delta(datos, self.path, mode=mode, partition_cols=self.partition_cols or None,
+                                       perfil=self.perfil),
+            self.max_reintentos, self.espera_base)
+
+    def fusionar(self, datos:pd.DataFrame|pa.Table, predicate:str, append_directo:bool=False) -> None:
+        """
+        Inserta solo los registros nuevos con MERGE, reintentando ante conflictos.
+        El append directo de lotes disjuntos es un commit ciego que el control de
+        concurrencia no valida, por eso solo se habilita cuando ningún otro escritor
+        puede insertar las mismas claves (p. ej. particiones asignadas en exclusiva).
+        Como `escribir`, recibe datos ya materializados para poder reintentar.
+        """
+        ejecutar_con_reintentos(
+            lambda: save_new_data_as_delta(datos, self.path, predicate, partition_cols=self.partition_cols or None,
+                                           perfil=self.perfil, append_directo=append_directo),
+            self.max_reintentos, self.espera_base)
+
+    def escribir_en_paralelo(self, datos:pd.DataFrame|pa.Table|pa.RecordBatchReader|Iterable, n_workers:int=4,
+                             predicate:str=None, filas_por_tramo:int=1_000_000, append_directo:bool=False) -> None:
+        """
+        Divide los datos por partición entre `n_workers` escritores y los ejecuta en paralelo.
+        Con `predicate` cada escritor hace MERGE; si no, append. Los streams de Arrow se
+        reparten por tramos de `filas_por_tramo` filas, uno a la vez.
+
+        Args:
+            datos (pd.DataFrame|pa.Table|pa.RecordBatchReader|Iterable): Datos a escribir.
+            n_workers (int): Cantidad de escritores concurrentes.
+            predicate (str): Predicado de MERGE, p. ej. "src.id = tgt.id" (opcional).
+            filas_por_tramo (int): Filas que se reparten por vez al recibir un stream.
+            append_directo (bool): Permite reemplazar el MERGE por un append ciego cuando el
+                lote es disjunto del destino. Las particiones son exclusivas solo dentro de
+                esta llamada: habilitarlo únicamente si ningún otro proceso escribe en la tabla.
+        """
+        datos = a_arrow(datos)
+        if datos is None:
+            return
+        # Las particiones derivadas del tiempo se calculan antes de repartir las filas
+        if DeltaTable.is_deltatable(str(self.path)):
+            datos = completar_columnas_particion(datos, obtener_tabla(self.path))
+        escribir = (lambda lote: self.fusionar(lote, predicate, append_directo)) if predicate else self.escribir
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            for tramo in tramos_de_filas(datos, filas_por_tramo):
+                list(executor.map(escribir, asignar_particiones(tramo, self.partition_cols, n_workers)))
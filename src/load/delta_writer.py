@@ -1,26 +1,158 @@
 import os
+import re
 import json
+import math
+import datetime
+from typing import Iterable, Iterator
+from urllib.parse import unquote
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
 from deltalake import write_deltalake, DeltaTable
 from deltalake.exceptions import TableNotFoundError
 from utils.config_utils import obtener_archivo_incremental
+from utils.file_utils import guardar_archivo_incremental_atomico
+from .writer_profiles import propiedades_escritura_delta
+from .table_cache import obtener_tabla
+from .arrow_input import a_arrow, transformar_lotes, tramos_de_filas
+from .watermarks import propiedades_commit, leer_marca_agua
+from .partitioning import (validar_layout, derivar_columnas_particion, completar_columnas_particion, layout_de_tabla,
+                           filtros_particion_desde_filtros)
 
 
-def leer_delta_lake(path:str) -> pd.DataFrame|None:
+# Operadores de los filtros DNF de deltalake/pyarrow
+_OPERADORES = {
+    '=': lambda campo, valor: campo == valor,
+    '==': lambda campo, valor: campo == valor,
+    '!=': lambda campo, valor: campo != valor,
+    '<': lambda campo, valor: campo < valor,
+    '>': lambda campo, valor: campo > valor,
+    '<=': lambda campo, valor: campo <= valor,
+    '>=': lambda campo, valor: campo >= valor,
+    'in': lambda campo, valor: campo.isin(valor),
+    'not in': lambda campo, valor: ~campo.isin(valor),
+}
+
+
+def _conjunciones(filters:list) -> list[list[tuple]]:
+    # [("a", "=", 1)] es una conjunción; [[...], [...]] es una disyunción de conjunciones
+    return filters if filters and isinstance(filters[0], list) else [filters]
+
+
+def _a_expresion(filters:list | pc.Expression | None, schema:pa.Schema) -> pc.Expression | None:
+    # Acepta filtros en formato DNF de deltalake/pyarrow, p. ej. [("id", ">", 10)], o una expresión de Arrow
+    if filters is None or isinstance(filters, pc.Expression):
+        return filters
+
+    def _condicion(columna:str, operador:str, valor) -> pc.Expression:
+        campo = pc.field(columna)
+        # Un MERGE de deltalake reescribe las columnas de texto como string_view y Arrow no
+        # compara string_view con string al podar por estadísticas de Parquet: con el cast
+        # la condición se evalúa sobre las filas ya unificadas al esquema de la tabla
+        if columna in schema.names and pa.types.is_string(schema.field(columna).type):
+            campo = campo.cast(pa.string())
+        return _OPERADORES[operador](campo, valor)
+
+    disyuncion = None
+    for conjuncion in _conjunciones(filters):
+        expresion = None
+        for columna, operador, valor in conjuncion:
+            condicion = _condicion(columna, operador.lower(), valor)
+            expresion = condicion if expresion is None else expresion & condicion
+        disyuncion = expresion if disyuncion is None else disyuncion | expresion
+    return disyuncion
+
+
+def _es_literal_podable(valor) -> bool:
+    if isinstance(valor, (list, tuple, set)):
+        return all(_es_literal_podable(v) for v in valor)
+    return isinstance(valor, (str, int)) or (isinstance(valor, float) and math.isfinite(valor))
+
+
+def _filtros_poda_archivos(filters:list | pc.Expression | None) -> list[tuple]:
+    # Las condiciones de una sola conjunción con literales simples se evalúan además
+    # contra las estadísticas del log de Delta para descartar archivos completos
+    if not isinstance(filters, list) or not filters or isinstance(filters[0], list):
+        return []
+    return [(columna, operador, valor) for columna, operador, valor in filters
+            if operador.lower() in _OPERADORES and _es_literal_podable(valor)]
+
+
+def escanear_delta_lake(path:str, filters:list|pc.Expression=None, partition_filters:list=None) -> ds.Dataset:
+    '''
+    Abre una tabla Delta Lake como un dataset de Arrow perezoso: no se lee ningún
+    dato hasta materializarlo. Los filtros por partición descartan directorios al
+    armar el dataset y los filtros por valor descartan archivos completos usando
+    las estadísticas min/max del log antes de leer el resto. Si la tabla está particionada
+    por columnas derivadas del tiempo (ver load.partitioning), los filtros sobre
+    'open_time'/'time' y 'symbol' se traducen además a filtros de partición.
+
+    Los filtros en formato DNF funcionan aunque un MERGE haya dejado archivos con
+    columnas string_view junto a otros con string; una expresión de Arrow se aplica
+    tal cual.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        filters (list|pc.Expression): Filtros por valor, p. ej. [("open_time", ">=", inicio)] (opcional).
+        partition_filters (list): Filtros sobre columnas de partición, p. ej. [("date", "=", "2025-01-01")] (opcional).
+
+    Returns:
+        ds.Dataset: Dataset de Arrow filtrado. Se materializa con .to_table(columns=...),
+        .to_batches(columns=...) o .count_rows().
+    '''
+    dt = obtener_tabla(path)
+    layout = layout_de_tabla(dt)
+    if layout is not None and isinstance(filters, list):
+        partition_filters = (partition_filters or []) + filtros_particion_desde_filtros(layout, filters)
+    poda = (partition_filters or []) + _filtros_poda_archivos(filters)
+    dataset = dt.to_pyarrow_dataset(file_pruning_predicate=poda or None)
+    expresion = _a_expresion(filters, dataset.schema)
+    return dataset.filter(expresion) if expresion is not None else dataset
+
+
+def iterar_lotes_delta(path:str, columns:list=None, filters:list|pc.Expression=None,
+                       partition_filters:list=None, batch_size:int=131072) -> Iterator[pa.RecordBatch]:
+    '''
+    Recorre una tabla Delta Lake en lotes de Arrow de tamaño acotado, leyendo solo
+    las columnas y los archivos necesarios. La memoria usada depende del tamaño
+    del lote, no del tamaño de la tabla.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        columns (list): Columnas a leer. Si no se indica, se leen todas.
+        filters (list|pc.Expression): Filtros por valor (opcional).
+        partition_filters (list): Filtros sobre columnas de partición (opcional).
+        batch_size (int): Cantidad máxima de filas por lote.
+
+    Yields:
+        pa.RecordBatch: Lotes con las filas que cumplen los filtros.
+    '''
+    dataset = escanear_delta_lake(path, filters, partition_filters)
+    yield from dataset.to_batches(columns=columns, batch_size=batch_size)
+
+
+def leer_delta_lake(path:str, columns:list=None, filters:list|pc.Expression=None,
+                    partition_filters:list=None) -> pd.DataFrame|None:
     '''
     Lee el archivo Delta Lake ubicado en la ruta del parámetro y lo
-    transforma en un DataFrame de Pandas.
+    transforma en un DataFrame de Pandas. Opcionalmente lee solo algunas
+    columnas y las filas que cumplen los filtros.
     
     Args:
         path (str): String con la ruta relativa al archivo Delta Lake.
+        columns (list): Columnas a leer (opcional).
+        filters (list|pc.Expression): Filtros por valor, p. ej. [("id", ">", 10)] (opcional).
+        partition_filters (list): Filtros sobre columnas de partición (opcional).
     
     Returns:
         pd.DataFrame|None: 
         DataFrame de Pandas si encuentra el path, sino None
     '''
     if os.path.exists(path):
-        return DeltaTable(path).to_pandas()
+        if columns is None and filters is None and partition_filters is None:
+            return obtener_tabla(path).to_pandas()
+        return escanear_delta_lake(path, filters, partition_filters).to_table(columns=columns).to_pandas()
     else:
         print('El path al archivo no fue encontrado')
         return None
@@ -31,6 +163,10 @@ def leer_extraccion_reciente(path_bronce:str, path_incremental:str) -> pd.DataFr
     Lee y devuelve únicamente los registros con id mayor al último valor 
     procesado desde el Delta Lake en la capa bronce.
 
+    El último id disponible en bronce se toma de la marca de agua del log de la
+    tabla (la extracción incremental ya no lo escribe en el archivo); el archivo
+    solo se usa si la tabla no tiene marca.
+
     Args:
         path_bronce (str): Ruta donde está almacenada la tabla en Delta Lake.
         path_incremental (str): Ruta al archivo .json con las variables incrementales.
@@ -39,20 +175,22 @@ def leer_extraccion_reciente(path_bronce:str, path_incremental:str) -> pd.DataFr
         pd.DataFrame: DataFrame con los registros nuevos (incrementales).
     '''
     try:
-        dt = DeltaTable(path_bronce)
+        dt = obtener_tabla(path_bronce)
     
-        contenido_incremental = obtener_archivo_incremental(path_incremental)
-        valor_previo = contenido_incremental['valor_previo'] # último id ya procesado en silver
-        ultimo_valor = contenido_incremental['ultimo_valor'] # último id disponible en bronce
+        contenido_incremental = obtener_archivo_incremental(path_incremental) or {}
+        valor_previo = contenido_incremental.get('valor_previo', -1) # último id ya procesado en silver
+        marca = leer_marca_agua(path_bronce) or {}
+        ultimo_valor = marca.get('ultimo_valor', contenido_incremental.get('ultimo_valor')) # último id disponible en bronce
         
         # Filtro para leer solo los registros
         df = dt.to_pandas(filters=[("id", ">", valor_previo)])
         # Actualizo valor previo con el último valor
-        valor_previo = contenido_incremental['ultimo_valor']
+        if ultimo_valor is not None:
+            valor_previo = ultimo_valor
         
-        # Actualizar el último valor
-        with open(path_incremental, "w", encoding="utf-8") as f:
-            json.dump({"valor_previo":valor_previo,"ultimo_valor": ultimo_valor}, f, indent=4, ensure_ascii=False)
+        # Actualizar el último valor, conservando el resto del archivo (p. ej. 'version_procesada')
+        contenido_incremental.update({"valor_previo": valor_previo, "ultimo_valor": ultimo_valor})
+        guardar_archivo_incremental_atomico(contenido_incremental, path_incremental)
             
         return df
     
@@ -60,46 +198,376 @@ def leer_extraccion_reciente(path_bronce:str, path_incremental:str) -> pd.DataFr
         raise Exception(f'No se pudo procesar la tabla Delta Lake: {e}')
     
     
-def save_data_as_delta(df:pd.DataFrame, path:str, mode:str="overwrite", partition_cols:list|str=None) -> None:
+def archivos_agregados_desde_version(path:str, version_desde:int, version_hasta:int) -> list[str] | None:
+    '''
+    Recorre el log de transacciones (_delta_log) de los commits posteriores a
+    `version_desde` y hasta `version_hasta` inclusive, y devuelve los archivos de
+    datos que agregaron y que siguen vigentes en `version_hasta`.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        version_desde (int): Última versión ya procesada (-1 para leer desde el inicio).
+        version_hasta (int): Versión hasta la que se lee.
+
+    Returns:
+        list[str]|None: Rutas relativas de los archivos nuevos, o None si no se pueden
+        aislar desde el log (commits ya eliminados del log o archivos nuevos reescritos
+        por una compactación).
+    '''
+    agregados = {}
+    for version in range(version_desde + 1, version_hasta + 1):
+        ruta_commit = os.path.join(str(path), '_delta_log', f'{version:020d}.json')
+        if not os.path.exists(ruta_commit):
+            return None
+        with open(ruta_commit, 'r', encoding='utf-8') as f:
+            for linea in f:
+                accion = json.loads(linea)
+                if 'add' in accion and accion['add'].get('dataChange', True):
+                    agregados[unquote(accion['add']['path'])] = version
+                elif 'remove' in accion:
+                    archivo = unquote(accion['remove']['path'])
+                    if archivo in agregados:
+                        # Un archivo nuevo fue reescrito (compactación o MERGE): sus filas
+                        # quedan mezcladas con filas viejas y no se pueden aislar desde el log
+                        if not accion['remove'].get('dataChange', True):
+                            return None
+                        del agregados[archivo]
+    return list(agregados)
+
+
+def leer_cambios_desde_version(path:str, version_desde:int, columns:list=None) -> tuple[pa.Table | None, int]:
+    '''
+    Lee solo las filas insertadas en los commits posteriores a `version_desde`,
+    sin listar ni filtrar el resto de los archivos de la tabla. Si la tabla tiene
+    habilitado el Change Data Feed se usa ese registro; si no, se leen los archivos
+    agregados según el log de transacciones (tablas de solo inserción, como bronce).
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        version_desde (int): Última versión ya procesada (-1 para leer desde el inicio).
+        columns (list): Columnas a leer (opcional).
+
+    Returns:
+        tuple[pa.Table|None, int]: Filas nuevas y versión leída. La tabla es None si las
+        filas nuevas no se pueden aislar y hace falta una lectura filtrada completa.
+    '''
+    dt = obtener_tabla(path)
+    version_actual = dt.version()
+    if version_desde >= version_actual:
+        vacia = dt.to_pyarrow_dataset().schema.empty_table()
+        return (vacia.select(columns) if columns else vacia), version_actual
+
+    if dt.metadata().configuration.get('delta.enableChangeDataFeed') == 'true':
+        cambios = pa.table(dt.load_cdf(starting_version=version_desde + 1, ending_version=version_actual))
+        # El CDF devuelve columnas string_view, que no todos los kernels de Arrow soportan
+        cambios = cambios.cast(pa.schema([
+            campo.with_type(pa.string()) if campo.type == pa.string_view() else campo for campo in cambios.schema
+        ]))
+        cambios = cambios.filter(pc.is_in(cambios['_change_type'], value_set=pa.array(['insert', 'update_postimage'])))
+        cambios = cambios.drop_columns([c for c in ('_change_type', '_commit_version', '_commit_timestamp') if c in cambios.column_names])
+        return (cambios.select(columns) if columns else cambios), version_actual
+
+    archivos = archivos_agregados_desde_version(path, version_desde, version_actual)
+    if archivos is None:
+        return None, version_actual
+    dataset = dt.to_pyarrow_dataset()
+    nuevos = set(archivos)
+    fragmentos = [fragmento for fragmento in dataset.get_fragments() if fragmento.path in nuevos]
+    dataset_nuevo = ds.FileSystemDataset(fragmentos, dataset.schema, dataset.format, dataset.filesystem)
+    return dataset_nuevo.to_table(columns=columns), version_actual
+
+
+def leer_extraccion_reciente_por_version(path_bronce:str, path_incremental:str) -> pd.DataFrame:
+    '''
+    Lee los registros agregados a la tabla bronce desde la última versión procesada.
+    El costo depende de la cantidad de datos nuevos, no del tamaño de la tabla.
+    La versión procesada se guarda en el archivo incremental bajo 'version_procesada';
+    si las filas nuevas no se pueden aislar desde el log, se recurre al filtro por id
+    de `leer_extraccion_reciente`.
+
+    Args:
+        path_bronce (str): Ruta donde está almacenada la tabla en Delta Lake.
+        path_incremental (str): Ruta al archivo .json con las variables incrementales.
+
+    Returns:
+        pd.DataFrame: DataFrame con los registros nuevos (incrementales).
+    '''
+    try:
+        contenido_incremental = obtener_archivo_incremental(path_incremental) or {}
+        version_procesada = contenido_incremental.get('version_procesada', -1)
+
+        nuevos, version_actual = leer_cambios_desde_version(path_bronce, version_procesada)
+        if nuevos is None:
+            print(f'No se pudieron aislar los commits desde la versión {version_procesada}; se filtra por id')
+            df = leer_extraccion_reciente(path_bronce, path_incremental)
+        else:
+            df = nuevos.to_pandas()
+
+        contenido_incremental = obtener_archivo_incremental(path_incremental) or {}
+        contenido_incremental['version_procesada'] = version_actual
+        if nuevos is not None and not df.empty and 'id' in df.columns:
+            # El filtro por id de respaldo parte de 'valor_previo': se mantiene al día
+            contenido_incremental['valor_previo'] = max(contenido_incremental.get('valor_previo', -1), int(df['id'].max()))
+        guardar_archivo_incremental_atomico(contenido_incremental, path_incremental)
+        print(f'Versiones procesadas: {version_procesada} -> {version_actual} ({len(df)} registros nuevos)')
+        return df
+
+    except Exception as e:
+        raise Exception(f'No se pudo procesar la tabla Delta Lake: {e}')
+
+
+def leer_extraccion_reciente_con_marca(path_bronce:str, path_destino:str, columna_id:str='id') -> tuple[pd.DataFrame, dict]:
+    '''
+    Lee los registros de bronce que todavía no se cargaron en la tabla destino
+    (p. ej. silver), tomando el progreso de la marca de agua registrada en el log
+    de la propia tabla destino. No escribe ningún archivo: la nueva marca se
+    devuelve para guardarla en el mismo commit que los datos procesados
+    (`save_data_as_delta`/`save_new_data_as_delta` con `marca_agua=`), de modo que
+    datos y progreso avanzan juntos o no avanzan.
+
+    Args:
+        path_bronce (str): Ruta de la tabla Delta Lake de origen.
+        path_destino (str): Ruta de la tabla Delta Lake que guarda la marca de agua.
+        columna_id (str): Columna incremental usada si hay que filtrar por valor.
+
+    Returns:
+        tuple[pd.DataFrame, dict]: Registros nuevos y marca de agua a registrar
+        ({'version_bronce': int, 'ultimo_id': int|None}).
+    '''
+    marca = leer_marca_agua(path_destino) or {}
+    version_procesada = marca.get('version_bronce', -1)
+    ultimo_id = marca.get('ultimo_id')
+
+    nuevos, version_actual = leer_cambios_desde_version(path_bronce, version_procesada)
+    if nuevos is None:
+        print(f'No se pudieron aislar los commits desde la versión {version_procesada}; se filtra por {columna_id}')
+        filtros = [(columna_id, '>', ultimo_id)] if ultimo_id is not None else None
+        nuevos = escanear_delta_lake(path_bronce, filters=filtros).to_table()
+    elif ultimo_id is not None and columna_id in nuevos.column_names:
+        # Filas reescritas por una reejecución pueden repetir ids ya cargados
+        nuevos = nuevos.filter(pc.greater(nuevos[columna_id], ultimo_id))
+
+    if nuevos.num_rows and columna_id in nuevos.column_names:
+        maximo = pc.max(nuevos[columna_id]).as_py()
+        ultimo_id = maximo if ultimo_id is None else max(ultimo_id, maximo)
+    print(f'Versiones de bronce: {version_procesada} -> {version_actual} ({nuevos.num_rows} registros nuevos)')
+    return nuevos.to_pandas(), {'version_bronce': version_actual, 'ultimo_id': ultimo_id}
+
+
+def save_data_as_delta(df:pd.DataFrame|pa.Table|pa.RecordBatchReader|Iterable, path:str, mode:str="overwrite",
+                       partition_cols:list|str=None, perfil:str|dict=None, layout:dict=None, marca_agua:dict=None) -> None:
     """
     Guarda un dataframe en formato Delta Lake en la ruta especificada.
     A su vez, es capaz de particionar el dataframe por una o varias columnas.
     Por defecto, el modo de guardado es "overwrite".
 
+    Además de DataFrames acepta datos de Arrow: Table, RecordBatchReader o cualquier
+    iterable de RecordBatch (p. ej. un generador que decodifica páginas de la API).
+    Los streams se escriben lote a lote en un único commit, sin materializarlos.
+
     Args:
-        df (pd.DataFrame): El dataframe a guardar.
+        df (pd.DataFrame|pa.Table|pa.RecordBatchReader|Iterable): Los datos a guardar.
         path (str): La ruta donde se guardará el dataframe en formato Delta Lake.
         mode (str): El modo de guardado. Son los modos que soporta la libreria deltalake: "overwrite", "append", "error", "ignore".
         partition_cols (list or str): La/s columna/s por las que se particionará el dataframe: Si no se especifica, no se particionará.
+        perfil (str or dict): Perfil de escritura Parquet, p. ej. "bronze-fast-ingest" (opcional).
+            Si no se especifica, se usan los valores por defecto de deltalake.
+        layout (dict): Layout de particionado derivado del tiempo, p. ej.
+            {"columna_tiempo": "open_time", "particiones": ["year", "month"]} (opcional).
+            Si se indica, reemplaza a `partition_cols`. Al agregar datos a una tabla ya
+            particionada por columnas derivadas, estas se calculan automáticamente.
+        marca_agua (dict): Progreso del pipeline a registrar en el mismo commit que los
+            datos, p. ej. {"ultimo_valor": 123}. Se recupera con `leer_marca_agua` (opcional).
         
     Returns:
         None
     """
-    write_deltalake(path, df, mode=mode, partition_by=partition_cols)
+    datos = a_arrow(df)
+    if datos is None:
+        print(f'No hay datos para guardar en {path}')
+        return
+    if layout is not None:
+        layout = validar_layout(layout)
+        datos = transformar_lotes(datos, lambda tabla: derivar_columnas_particion(tabla, layout))
+        partition_cols = layout['particiones']
+    elif mode == 'append' and partition_cols is None and DeltaTable.is_deltatable(str(path)):
+        datos = completar_columnas_particion(datos, obtener_tabla(path))
+    if datos is None:
+        print(f'No hay datos para guardar en {path}')
+        return
+    opciones = propiedades_escritura_delta(perfil, datos.schema) if perfil is not None else {}
+    write_deltalake(path, datos, mode=mode, partition_by=partition_cols, commit_properties=propiedades_commit(marca_agua),
+                    **opciones)
     
     
-def save_new_data_as_delta(new_data:pd.DataFrame, data_path:str, predicate:str, partition_cols:list|str=None) -> None:
+def _columnas_clave(predicate:str) -> list[str]:
+    # Columnas comparadas por igualdad entre origen y destino, p. ej. "src.id = tgt.id"
+    return [m.group(1) for m in re.finditer(r'src\.(\w+)\s*=\s*tgt\.\1\b', predicate)]
+
+
+def _literal_sql(valor) -> str:
+    if isinstance(valor, str):
+        return "'" + valor.replace("'", "''") + "'"
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        return f"'{valor.isoformat()}'"
+    if isinstance(valor, float) and not math.isfinite(valor):
+        raise ValueError(f'No hay literal SQL para {valor}')
+    return repr(valor)
+
+
+def _condicion_particion(columna:str, valores:set) -> str:
+    # Los valores de partición nulos no coinciden con IN: se agregan con IS NULL
+    condicion = [f'tgt.{columna} IN ({", ".join(_literal_sql(v) for v in sorted(v for v in valores if v is not None))})'] \
+        if any(v is not None for v in valores) else []
+    if None in valores:
+        condicion.append(f'tgt.{columna} IS NULL')
+    return '(' + ' OR '.join(condicion) + ')'
+
+
+def _rangos_origen(origen:pa.Table, columnas:list[str]) -> dict[str, tuple]:
+    # Mínimo y máximo de cada columna numérica del origen; las demás no se acotan por rango
+    rangos = {}
+    for columna in columnas:
+        if columna in origen.column_names and (pa.types.is_integer(origen[columna].type) or pa.types.is_floating(origen[columna].type)):
+            minmax = pc.min_max(origen[columna]).as_py()
+            # Con NaN o infinitos no hay un rango expresable en SQL: esa columna no se acota
+            if minmax['min'] is not None and all(math.isfinite(v) for v in minmax.values()):
+                rangos[columna] = (minmax['min'], minmax['max'])
+    return rangos
+
+
+def _origen_disjunto(dt:DeltaTable, rangos:dict[str, tuple], particiones:dict[str, set]) -> bool:
+    # El origen es disjunto si ningún archivo del destino puede contener una fila con las
+    # mismas claves: para coincidir, un archivo debe solaparse en todas las columnas clave.
+    if not rangos:
+        return False
+    acciones = pa.table(dt.get_add_actions(flatten=True)).to_pylist()
+    for accion in acciones:
+        if any(accion.get(f'partition.{col}') not in valores for col, valores in particiones.items()):
+            continue
+        solapa = True
+        for columna, (minimo, maximo) in rangos.items():
+            minimo_archivo, maximo_archivo = accion.get(f'min.{columna}'), accion.get(f'max.{columna}')
+            if minimo_archivo is None or maximo_archivo is None:
+                return False  # sin estadísticas no se puede descartar el archivo
+            if maximo_archivo < minimo or minimo_archivo > maximo:
+                solapa = False
+                break
+        if solapa:
+            return False
+    return True
+
+
+def _registrar_en_indice(indice_ids, datos:pa.Table) -> None:
+    # Se llama solo después de un commit exitoso, para que el índice nunca quede adelantado
+    if indice_ids is not None:
+        indice_ids.registrar(datos[indice_ids.columna_id])
+        indice_ids.guardar()
+
+
+def save_new_data_as_delta(new_data:pd.DataFrame|pa.Table|pa.RecordBatchReader|Iterable, data_path:str, predicate:str,
+                           partition_cols:list|str=None, columnas_rango:list[str]=None, perfil:str|dict=None,
+                           append_directo:bool=True, layout:dict=None, marca_agua:dict=None,
+                           filas_por_merge:int=1_000_000, indice_ids=None) -> None:
     """
     Guarda solo nuevos datos en formato Delta Lake usando la operación MERGE,
     comparando los datos ya cargados con los datos que se desean almacenar
     asegurando que no se guarden registros duplicados.
 
+    Antes del MERGE se agregan al predicado los valores de partición y el rango
+    [mín, máx] de las columnas clave presentes en el lote, para que solo se lean
+    los archivos del destino que pueden coincidir. Si las estadísticas del destino
+    demuestran que ningún archivo puede coincidir, se hace un append sin MERGE.
+
+    Los streams de Arrow (RecordBatchReader o iterables de RecordBatch) se procesan
+    en tramos de `filas_por_merge` filas, un MERGE por tramo, de modo que la memoria
+    usada depende del tramo y no del total. La marca de agua se registra con el último.
+
     Args:
-      new_data (pd.DataFrame): Los datos que se desean guardar.
+      new_data (pd.DataFrame|pa.Table|pa.RecordBatchReader|Iterable): Los datos que se desean guardar.
       data_path (str): La ruta donde se guardará el dataframe en formato Delta Lake.
       predicate (str): La condición de predicado para la operación MERGE.
       partition_cols (list): Columnas sobre las que particionar
+      columnas_rango (list): Columnas numéricas a acotar por rango. Por defecto, las
+          comparadas por igualdad en el predicado (p. ej. 'id' en "src.id = tgt.id").
+      perfil (str|dict): Perfil de escritura Parquet para los archivos nuevos (opcional).
+      append_directo (bool): Permite reemplazar el MERGE por un append cuando el lote es
+          disjunto del destino. Desactivarlo si otros escritores concurrentes pueden
+          insertar las mismas claves.
+      layout (dict): Layout de particionado con el que se crea la tabla si no existe (opcional).
+          Si la tabla ya existe, las columnas de partición derivadas se calculan según su layout.
+      marca_agua (dict): Progreso del pipeline a registrar en el mismo commit que los datos
+          (opcional). Si el MERGE no inserta filas, la marca se registra en un commit vacío.
+      filas_por_merge (int): Filas por MERGE al procesar un stream.
+      indice_ids (IndiceDeIds): Índice de ids ya cargados (opcional). Las filas con ids
+          registrados se descartan antes de acceder a la tabla y, tras el commit, los ids
+          nuevos se registran y el índice se guarda.
     """
+    datos = a_arrow(new_data)
+    if isinstance(datos, pa.RecordBatchReader):
+        anterior = None
+        for tramo in tramos_de_filas(datos, filas_por_merge):
+            if anterior is not None:
+                save_new_data_as_delta(anterior, data_path, predicate, partition_cols, columnas_rango, perfil,
+                                       append_directo, layout, indice_ids=indice_ids)
+            anterior = tramo
+        if anterior is not None:
+            save_new_data_as_delta(anterior, data_path, predicate, partition_cols, columnas_rango, perfil,
+                                   append_directo, layout, marca_agua, indice_ids=indice_ids)
+        return
+    if datos is None or datos.num_rows == 0:
+        return
+    if indice_ids is not None:
+        datos = indice_ids.filtrar_nuevos(datos)
+        if datos.num_rows == 0:
+            # Todo el lote ya estaba cargado: solo se registra la marca de agua, si la hay
+            if marca_agua is not None:
+                dt = obtener_tabla(data_path)
+                write_deltalake(dt, completar_columnas_particion(datos, dt), mode='append',
+                                commit_properties=propiedades_commit(marca_agua))
+            return
+
     try:
-      dt = DeltaTable(data_path)
-      new_data_pa = pa.Table.from_pandas(new_data)
+      dt = obtener_tabla(data_path)
+      new_data_pa = completar_columnas_particion(datos, dt)
+      opciones = propiedades_escritura_delta(perfil, new_data_pa.schema) if perfil is not None else {}
+
+      rangos = _rangos_origen(new_data_pa, columnas_rango if columnas_rango is not None else _columnas_clave(predicate))
+      # Los valores de partición se mantienen con su tipo, igual que en las acciones del log
+      particiones = {
+          col: set(pc.unique(new_data_pa[col]).to_pylist())
+          for col in dt.metadata().partition_columns if col in new_data_pa.column_names
+      }
+
+      if append_directo and _origen_disjunto(dt, rangos, particiones):
+          print('El lote no se solapa con la tabla destino: se agrega sin MERGE')
+          write_deltalake(dt, new_data_pa, mode='append', commit_properties=propiedades_commit(marca_agua), **opciones)
+          _registrar_en_indice(indice_ids, datos)
+          return
+
+      condiciones = [f'({predicate})']
+      condiciones += [_condicion_particion(col, valores) for col, valores in particiones.items()]
+      condiciones += [f'tgt.{col} >= {_literal_sql(minimo)} AND tgt.{col} <= {_literal_sql(maximo)}'
+                      for col, (minimo, maximo) in rangos.items()]
+
       # Se insertan en target, datos de source que no existen en target
-      dt.merge(
+      metricas = dt.merge(
           source=new_data_pa,
           source_alias="src",
           target_alias="tgt",
-          predicate=predicate
+          predicate=' AND '.join(condiciones),
+          writer_properties=opciones.get('writer_properties'),
+          commit_properties=propiedades_commit(marca_agua)
       ).when_not_matched_insert_all().execute()
-    # Si no existe la tabla Delta Lake, se guarda como nueva
+      # Un MERGE sin filas nuevas no genera commit: la marca se registra igual para que avance
+      if marca_agua is not None and not metricas.get('num_target_rows_inserted'):
+          write_deltalake(dt, new_data_pa.schema.empty_table(), mode='append',
+                          commit_properties=propiedades_commit(marca_agua))
+    # Si no existe la tabla Delta Lake, se guarda como nueva. Con mode="error" un escritor
+    # concurrente que la haya creado entretanto provoca un error en lugar de ser sobrescrito.
     except TableNotFoundError:
-      save_data_as_delta(new_data, data_path, partition_cols=partition_cols)
\ No newline at end of file
+      save_data_as_delta(datos, data_path, mode="error", partition_cols=partition_cols, perfil=perfil, layout=layout,
+                         marca_agua=marca_agua)
+    _registrar_en_indice(indice_ids, datos)
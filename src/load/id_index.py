@@ -0,0 +1,140 @@
+import os
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from utils.config_utils import obtener_archivo_incremental
+from utils.file_utils import guardar_archivo_incremental_atomico
+
+
+# Carpeta del índice dentro de la tabla. Delta ignora (y vacuum no borra) los
+# archivos cuyo nombre empieza con '_'
+CARPETA_INDICE = '_indice_ids'
+
+
+class IndiceDeIds:
+    """
+    Índice persistente de los ids ya cargados en una tabla, por símbolo, guardado
+    como intervalos contiguos [inicio, fin]. Como los ids de trades de Binance son
+    crecientes, millones de ids consecutivos ocupan un solo intervalo y el índice
+    pesa unos pocos KB aunque la tabla tenga miles de millones de filas.
+
+    Permite descartar las filas ya vistas antes de leer o escribir la tabla Delta:
+    `filtrar_nuevos` es O(lote · log(intervalos)) y no toca la tabla. Los ids se
+    registran con `registrar` solo después de que el commit se confirmó, así que
+    ante una caída el índice puede quedar atrasado (el MERGE por id sigue evitando
+    duplicados) pero nunca adelantado.
+
+    Ejemplo:
+        indice = IndiceDeIds(PATH_BRONZE_DELTALAKE_INCREMENTAL, 'SOLUSDT')
+        save_new_data_as_delta(tabla, PATH_BRONZE_DELTALAKE_INCREMENTAL, predicate="src.id = tgt.id",
+                               indice_ids=indice)
+    """
+
+    def __init__(self, path:str, simbolo:str, columna_id:str='id'):
+        self.ruta = os.path.join(str(path), CARPETA_INDICE, f'{simbolo.upper()}.json')
+        self.columna_id = columna_id
+        contenido = obtener_archivo_incremental(self.ruta) if os.path.exists(self.ruta) else None
+        intervalos = np.array(contenido['intervalos'] if contenido else [], dtype=np.int64).reshape(-1, 2)
+        self.inicios = intervalos[:, 0]
+        self.fines = intervalos[:, 1]
+
+    def __len__(self) -> int:
+        return len(self.inicios)
+
+    def cantidad_de_ids(self) -> int:
+        """Cantidad total de ids registrados."""
+        return int((self.fines - self.inicios + 1).sum())
+
+    def contiene(self, ids:np.ndarray) -> np.ndarray:
+        """
+        Indica qué ids ya están registrados.
+
+        Args:
+            ids (np.ndarray): Ids a consultar, en cualquier orden.
+
+        Returns:
+            np.ndarray: Máscara booleana, True para los ids ya vistos.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        # Intervalo candidato de cada id: el último que empieza en o antes del id
+        posicion = np.searchsorted(self.inicios, ids, side='right') - 1
+        vistos = posicion >= 0
+        vistos[vistos] = ids[vistos] <= self.fines[posicion[vistos]]
+        return vistos
+
+    def filtrar_nuevos(self, tabla:pa.Table) -> pa.Table:
+        """
+        Descarta las filas cuyo id ya fue registrado y las repeticiones de un mismo
+        id dentro del lote (se conserva la primera), sin acceder a la tabla Delta.
+
+        Args:
+            tabla (pa.Table): Lote a cargar. Los ids nulos se conservan (los resuelve el MERGE).
+
+        Returns:
+            pa.Table: Filas con ids no vistos.
+        """
+        columna = tabla[self.columna_id]
+        ids = pc.fill_null(columna, -1).to_numpy()
+        nuevos = ~self.contiene(ids) | pc.is_null(columna).to_numpy(zero_copy_only=False)
+        _, primeras = np.unique(ids, return_index=True)
+        unicos = np.zeros(len(ids), dtype=bool)
+        unicos[primeras] = True
+        filtrada = tabla.filter(pa.array(nuevos & (unicos | (ids == -1))))
+        if filtrada.num_rows < tabla.num_rows:
+            print(f'Índice de ids: {tabla.num_rows - filtrada.num_rows} filas repetidas o ya cargadas descartadas')
+        return filtrada
+
+    def registrar(self, ids:np.ndarray|pa.Array|pa.ChunkedArray) -> None:
+        """
+        Agrega ids al índice en memoria, fusionando los intervalos contiguos o solapados.
+        Llamar a `guardar` para persistirlo.
+
+        Args:
+            ids (np.ndarray|pa.Array|pa.ChunkedArray): Ids cargados (se ignoran los nulos).
+        """
+        if isinstance(ids, (pa.Array, pa.ChunkedArray)):
+            ids = pc.drop_null(ids).to_numpy()
+        ids = np.unique(np.asarray(ids, dtype=np.int64))
+        if not len(ids):
+            return
+        # Tramos consecutivos del lote: se cortan donde el salto entre ids es mayor a 1
+        cortes = np.flatnonzero(np.diff(ids) > 1) + 1
+        inicios = np.concatenate([self.inicios, ids[np.r_[0, cortes]]])
+        fines = np.concatenate([self.fines, ids[np.r_[cortes - 1, len(ids) - 1]]])
+
+        orden = np.argsort(inicios, kind='stable')
+        inicios, fines = inicios[orden], fines[orden]
+        # Un intervalo empieza un grupo nuevo si no toca a ninguno de los anteriores
+        fin_previo = np.maximum.accumulate(fines)
+        nuevo_grupo = np.r_[True, inicios[1:] > fin_previo[:-1] + 1]
+        self.inicios = inicios[nuevo_grupo]
+        self.fines = np.maximum.reduceat(fines, np.flatnonzero(nuevo_grupo))
+
+    def guardar(self) -> None:
+        """Persiste el índice de forma atómica junto a la tabla."""
+        guardar_archivo_incremental_atomico(
+            {'columna': self.columna_id, 'intervalos': np.column_stack([self.inicios, self.fines]).tolist()},
+            self.ruta)
+
+    @classmethod
+    def reconstruir(cls, path:str, simbolo:str, columna_id:str='id') -> 'IndiceDeIds':
+        """
+        Arma el índice recorriendo la columna de ids de la tabla Delta por lotes
+        (por ejemplo, si el archivo del índice se perdió) y lo guarda.
+
+        Args:
+            path (str): Ruta a la tabla Delta Lake.
+            simbolo (str): Símbolo de la tabla, por ejemplo 'SOLUSDT'.
+            columna_id (str): Columna de ids.
+
+        Returns:
+            IndiceDeIds: Índice con todos los ids de la tabla.
+        """
+        from .delta_writer import iterar_lotes_delta
+
+        indice = cls(path, simbolo, columna_id)
+        indice.inicios = indice.fines = np.array([], dtype=np.int64)
+        for lote in iterar_lotes_delta(path, columns=[columna_id]):
+            indice.registrar(lote.column(0))
+        indice.guardar()
+        return indice
@@ -0,0 +1,86 @@
+import pandas as pd
+import pyarrow as pa
+from deltalake import write_deltalake
+from deltalake.exceptions import TableNotFoundError
+from transform.aggregations import sumarizar_df_incremental, calcular_estados_parciales
+from .table_cache import obtener_tabla
+from .watermarks import propiedades_commit
+from .delta_writer import escanear_delta_lake, save_data_as_delta
+from .writer_profiles import propiedades_escritura_delta
+
+
+def _leer_estados_de_grupos(path_gold:str, grupos:pd.DataFrame, columnas:list[str]) -> pd.DataFrame | None:
+    # Solo se leen las filas de gold de los grupos afectados: un filtro IN por cada
+    # columna de agrupación (las estadísticas de los archivos descartan el resto)
+    filtros = [(columna, 'in', grupos[columna].drop_duplicates().tolist()) for columna in grupos.columns]
+    try:
+        return escanear_delta_lake(path_gold, filters=filtros).to_table(columns=columnas).to_pandas()
+    except TableNotFoundError:
+        return None
+
+
+def actualizar_agregados_incrementales(df_nuevo:pd.DataFrame, path_gold:str, by_col:list, agg_col:dict,
+                                       rename_cols:dict, columna_orden:str=None, marca_agua:dict=None,
+                                       perfil:str|dict=None) -> int:
+    """
+    Mantiene una tabla gold de agregaciones incorporando solo las filas nuevas de silver.
+    La tabla guarda, junto a cada agregación, sus estados parciales combinables
+    (columnas 'estado__*'); en cada ejecución se leen solo los estados de los grupos
+    que recibieron filas, se combinan con los de las filas nuevas y se actualizan
+    esos grupos con un MERGE. El costo depende del volumen nuevo, no del historial.
+
+    Ejemplo:
+        df_nuevo, marca = leer_extraccion_reciente_con_marca(PATH_SILVER_DELTALAKE_INCREMENTAL,
+                                                             PATH_GOLD_SUMARIZED_TABLE_INCREMENTAL)
+        actualizar_agregados_incrementales(df_nuevo, PATH_GOLD_SUMARIZED_TABLE_INCREMENTAL, ['date'],
+                                           {'price': 'mean', 'id': 'count'}, {'price': 'avg_price'},
+                                           columna_orden='id', marca_agua=marca)
+
+    Args:
+        df_nuevo (pd.DataFrame): Filas de silver todavía no incorporadas.
+        path_gold (str): Ruta de la tabla Delta Lake gold.
+        by_col (list): Columnas por las cuales agrupar.
+        agg_col (dict): Agregación de cada columna (sum, count, min, max, mean, first, last).
+        rename_cols (dict): Renombrado de las columnas agregadas.
+        columna_orden (str): Columna que define el orden para 'first'/'last' (opcional).
+        marca_agua (dict): Progreso a registrar en el mismo commit (opcional).
+        perfil (str|dict): Perfil de escritura Parquet de los archivos de gold (opcional).
+
+    Returns:
+        int: Cantidad de grupos insertados o actualizados.
+    """
+    by_col = [by_col] if isinstance(by_col, str) else list(by_col)
+    if df_nuevo is None or df_nuevo.empty:
+        if marca_agua is not None:
+            try:
+                dt = obtener_tabla(path_gold)
+                write_deltalake(dt, pa.schema(dt.schema().to_arrow()).empty_table(), mode='append',
+                                commit_properties=propiedades_commit(marca_agua))
+            except TableNotFoundError:
+                pass
+        return 0
+
+    # Con el esquema de los estados de un grupo cualquiera se sabe qué columnas leer de gold
+    columnas_estado = list(calcular_estados_parciales(df_nuevo.head(1), by_col, agg_col, columna_orden).columns)
+    grupos = df_nuevo[by_col].drop_duplicates()
+    estados_previos = _leer_estados_de_grupos(path_gold, grupos, columnas_estado)
+
+    resumen, estados = sumarizar_df_incremental(df_nuevo, estados_previos, by_col, agg_col, rename_cols, columna_orden)
+    gold = resumen.reset_index().merge(estados, on=by_col)
+    tabla = pa.Table.from_pandas(gold, preserve_index=False)
+
+    try:
+        dt = obtener_tabla(path_gold)
+        # Se castea al esquema de gold: p. ej. una posición Int64 sin nulos en este lote
+        dt.merge(
+            source=tabla.cast(pa.schema(dt.schema().to_arrow())),
+            source_alias='src',
+            target_alias='tgt',
+            predicate=' AND '.join(f'tgt.{columna} = src.{columna}' for columna in by_col),
+            writer_properties=propiedades_escritura_delta(perfil, tabla.schema)['writer_properties'] if perfil else None,
+            commit_properties=propiedades_commit(marca_agua)
+        ).when_matched_update_all().when_not_matched_insert_all().execute()
+    except TableNotFoundError:
+        save_data_as_delta(tabla, path_gold, mode='error', perfil=perfil, marca_agua=marca_agua)
+    print(f'Gold incremental: {len(gold)} grupos actualizados con {len(df_nuevo)} filas nuevas')
+    return len(gold)
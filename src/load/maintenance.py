@@ -0,0 +1,159 @@
+import os
+import time
+import pyarrow as pa
+from deltalake import DeltaTable
+from .writer_profiles import propiedades_escritura_delta
+from .table_cache import obtener_tabla
+
+
+# Política por defecto. Cada tabla puede sobrescribir cualquiera de las claves.
+POLITICA_MANTENIMIENTO_POR_DEFECTO = {
+    'tamano_archivo_pequeno': 32 * 1024 * 1024,  # bytes; por debajo, un archivo cuenta como pequeño
+    'min_archivos_pequenos': 8,                  # archivos pequeños por partición para compactarla
+    'tamano_objetivo': 128 * 1024 * 1024,        # bytes de cada archivo compactado
+    'columnas_zorder': None,                     # p. ej. ['open_time'] o ['id']; None = solo bin-packing
+    'retencion_horas': 168,                      # antigüedad mínima de archivos eliminados para el vacuum
+    'perfil_escritura': None,                    # perfil de writer_profiles para los archivos compactados
+}
+
+
+def contar_archivos_por_particion(path:str, tamano_archivo_pequeno:int) -> dict[tuple, dict]:
+    """
+    Cuenta archivos vigentes, archivos pequeños y bytes por partición de una tabla Delta,
+    usando solo el log de transacciones.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        tamano_archivo_pequeno (int): Tamaño en bytes por debajo del cual un archivo se considera pequeño.
+
+    Returns:
+        dict[tuple, dict]: Por cada partición (tupla de (columna, valor); vacía si la tabla no
+        está particionada), un diccionario con 'archivos', 'pequenos' y 'bytes'.
+    """
+    acciones = pa.table(obtener_tabla(path).get_add_actions(flatten=True)).to_pylist()
+    conteo = {}
+    for accion in acciones:
+        particion = tuple(sorted(
+            (clave.removeprefix('partition.'), valor) for clave, valor in accion.items() if clave.startswith('partition.')
+        ))
+        datos = conteo.setdefault(particion, {'archivos': 0, 'pequenos': 0, 'bytes': 0})
+        datos['archivos'] += 1
+        datos['bytes'] += accion['size_bytes']
+        if accion['size_bytes'] < tamano_archivo_pequeno:
+            datos['pequenos'] += 1
+    return conteo
+
+
+def vaciar_archivos_no_referenciados(path:str, retencion_horas:int) -> list[str]:
+    """
+    Ejecuta el vacuum de la tabla y devuelve solo los archivos que realmente borró.
+    `DeltaTable.vacuum` informa los candidatos según el log aunque ya no estén en
+    disco (por ejemplo, los borrados por un vacuum anterior), así que se comparan
+    los candidatos que existían antes con los que siguen existiendo después.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        retencion_horas (int): Antigüedad mínima de los archivos no referenciados a eliminar.
+
+    Returns:
+        list[str]: Rutas de los archivos eliminados.
+    """
+    dt = obtener_tabla(path)
+    # La retención la define la política, por eso no se exige el mínimo configurado en la tabla
+    candidatos = dt.vacuum(retention_hours=retencion_horas, dry_run=True, enforce_retention_duration=False)
+    existentes = [os.path.join(str(path), archivo) for archivo in candidatos]
+    existentes = [archivo for archivo in existentes if os.path.exists(archivo)]
+    if not existentes:
+        return []
+    dt.vacuum(retention_hours=retencion_horas, dry_run=False, enforce_retention_duration=False)
+    return [archivo for archivo in existentes if not os.path.exists(archivo)]
+
+
+def medir_latencia_lectura(path:str, columns:list=None) -> float:
+    """
+    Mide en segundos el tiempo de lectura completa de la tabla (o de las columnas indicadas).
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        columns (list): Columnas a leer (opcional).
+
+    Returns:
+        float: Segundos transcurridos.
+    """
+    inicio = time.perf_counter()
+    obtener_tabla(path).to_pyarrow_dataset().to_table(columns=columns)
+    return time.perf_counter() - inicio
+
+
+def mantener_tabla(path:str, politica:dict=None) -> dict:
+    """
+    Aplica la política de mantenimiento a una tabla Delta: compacta (o aplica Z-order)
+    las particiones que superan el umbral de archivos pequeños y luego elimina con
+    vacuum los archivos ya no referenciados más antiguos que la retención.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        politica (dict): Claves a sobrescribir de POLITICA_MANTENIMIENTO_POR_DEFECTO (opcional).
+
+    Returns:
+        dict: Reporte con archivos y latencia de lectura antes y después, particiones
+        optimizadas y cantidad de archivos que el vacuum borró efectivamente.
+    """
+    politica = {**POLITICA_MANTENIMIENTO_POR_DEFECTO, **(politica or {})}
+    antes = contar_archivos_por_particion(path, politica['tamano_archivo_pequeno'])
+    latencia_antes = medir_latencia_lectura(path)
+
+    dt = obtener_tabla(path)
+    writer_properties = None
+    if politica['perfil_escritura'] is not None:
+        writer_properties = propiedades_escritura_delta(politica['perfil_escritura'], pa.schema(dt.schema().to_arrow()))['writer_properties']
+    optimizadas = []
+    for particion, datos in antes.items():
+        if datos['pequenos'] < politica['min_archivos_pequenos']:
+            continue
+        filtros = [(columna, '=', str(valor)) for columna, valor in particion] or None
+        if politica['columnas_zorder']:
+            dt.optimize.z_order(politica['columnas_zorder'], partition_filters=filtros,
+                                target_size=politica['tamano_objetivo'], writer_properties=writer_properties)
+        else:
+            dt.optimize.compact(partition_filters=filtros, target_size=politica['tamano_objetivo'],
+                                writer_properties=writer_properties)
+        optimizadas.append(dict(particion))
+
+    eliminados = vaciar_archivos_no_referenciados(path, politica['retencion_horas'])
+
+    despues = contar_archivos_por_particion(path, politica['tamano_archivo_pequeno'])
+    reporte = {
+        'tabla': str(path),
+        'archivos_antes': sum(d['archivos'] for d in antes.values()),
+        'archivos_despues': sum(d['archivos'] for d in despues.values()),
+        'pequenos_antes': sum(d['pequenos'] for d in antes.values()),
+        'pequenos_despues': sum(d['pequenos'] for d in despues.values()),
+        'latencia_antes': latencia_antes,
+        'latencia_despues': medir_latencia_lectura(path),
+        'particiones_optimizadas': optimizadas,
+        'archivos_eliminados': len(eliminados),
+    }
+    print(f"{path}: {reporte['archivos_antes']} -> {reporte['archivos_despues']} archivos, "
+          f"lectura {reporte['latencia_antes']:.3f}s -> {reporte['latencia_despues']:.3f}s, "
+          f"{reporte['archivos_eliminados']} archivos eliminados")
+    return reporte
+
+
+def mantener_tablas(politicas:dict) -> list[dict]:
+    """
+    Ejecuta `mantener_tabla` sobre varias tablas. Las tablas que todavía no existen se omiten.
+
+    Args:
+        politicas (dict): {ruta_tabla: politica} con la política de cada tabla.
+
+    Returns:
+        list[dict]: Reporte de cada tabla mantenida.
+    """
+    reportes = []
+    for path, politica in politicas.items():
+        if not DeltaTable.is_deltatable(str(path)):
+            print(f'La ruta "{path}" no es una tabla Delta Lake, se omite')
+            continue
+        reportes.append(mantener_tabla(path, politica))
+    return reportes
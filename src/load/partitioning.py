@@ -0,0 +1,220 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from deltalake import DeltaTable
+from .arrow_input import transformar_lotes
+
+
+# Columnas de partición que se derivan de la columna de tiempo (epoch en milisegundos)
+# y su formato. Se guardan como texto con ceros a la izquierda para que el orden
+# lexicográfico de los directorios coincida con el cronológico.
+FORMATOS_DERIVADOS = {
+    'date': '%Y-%m-%d',
+    'year': '%Y',
+    'month': '%m',
+    'day': '%d',
+}
+
+# Columnas de tiempo reconocidas al inferir el layout de una tabla existente
+COLUMNAS_TIEMPO = ['open_time', 'time']
+
+# Orden jerárquico de las unidades de tiempo: cada una exige la anterior
+_JERARQUIA = ['year', 'month', 'day']
+
+
+def validar_layout(layout:dict) -> dict:
+    """
+    Valida la configuración de particionado de una tabla.
+
+    Un layout es un diccionario con:
+      columna_tiempo (str): columna con el epoch en milisegundos, p. ej. 'open_time' o 'time'.
+      particiones (list[str]): columnas de partición en orden de directorio. Admite
+          'symbol' y las derivadas de FORMATOS_DERIVADOS ('date' o 'year'/'month'/'day').
+      symbol (str): valor de 'symbol' cuando los datos no traen esa columna (opcional).
+
+    Args:
+        layout (dict): Configuración de particionado.
+
+    Returns:
+        dict: El mismo layout, con 'particiones' como lista.
+    """
+    if not isinstance(layout, dict) or not layout.get('columna_tiempo'):
+        raise ValueError(f"El layout de particionado debe indicar 'columna_tiempo': {layout}")
+    particiones = layout.get('particiones')
+    if isinstance(particiones, str):
+        particiones = [particiones]
+    if not particiones:
+        raise ValueError(f"El layout de particionado debe indicar al menos una columna en 'particiones': {layout}")
+    if len(set(particiones)) != len(particiones):
+        raise ValueError(f'Columnas de partición repetidas: {particiones}')
+
+    desconocidas = [c for c in particiones if c != 'symbol' and c not in FORMATOS_DERIVADOS]
+    if desconocidas:
+        raise ValueError(f"Columnas de partición no soportadas: {desconocidas}. "
+                         f"Disponibles: ['symbol'] + {list(FORMATOS_DERIVADOS)}")
+    if 'date' in particiones and any(c in particiones for c in _JERARQUIA):
+        raise ValueError(f"'date' no se puede combinar con 'year', 'month' o 'day': {particiones}")
+
+    unidades = [c for c in particiones if c in _JERARQUIA]
+    if unidades != _JERARQUIA[:len(unidades)]:
+        raise ValueError(f"Las particiones de tiempo deben seguir el orden year/month/day sin saltos: {particiones}")
+    return {**layout, 'particiones': list(particiones)}
+
+
+def _a_timestamp(columna:pa.ChunkedArray) -> pa.ChunkedArray:
+    # Bronce guarda epoch en ms (int64); silver puede tenerlo ya como timestamp.
+    # Las particiones se derivan siempre en UTC: un timestamp con zona horaria se
+    # pasa a uno sin zona (Arrow lo almacena en UTC) para que strftime no use la hora local
+    if pa.types.is_timestamp(columna.type):
+        return columna.cast(pa.timestamp(columna.type.unit)) if columna.type.tz else columna
+    return columna.cast(pa.int64()).cast(pa.timestamp('ms'))
+
+
+def derivar_columnas_particion(datos:pd.DataFrame|pa.Table, layout:dict) -> pd.DataFrame|pa.Table:
+    """
+    Agrega (o reemplaza) las columnas de partición del layout calculadas a partir de
+    la columna de tiempo, en una sola pasada vectorizada con pyarrow.compute.
+
+    Args:
+        datos (pd.DataFrame|pa.Table): Datos a escribir.
+        layout (dict): Layout de particionado (ver `validar_layout`).
+
+    Returns:
+        pd.DataFrame|pa.Table: Los datos con las columnas de partición, del mismo tipo que la entrada.
+    """
+    layout = validar_layout(layout)
+    es_pandas = isinstance(datos, pd.DataFrame)
+    tabla = pa.Table.from_pandas(datos, preserve_index=False) if es_pandas else datos
+
+    columna_tiempo = layout['columna_tiempo']
+    if columna_tiempo not in tabla.column_names:
+        raise ValueError(f'Los datos no tienen la columna de tiempo "{columna_tiempo}" del layout')
+    tiempos = _a_timestamp(tabla[columna_tiempo])
+
+    for columna in layout['particiones']:
+        if columna == 'symbol':
+            if 'symbol' in tabla.column_names:
+                continue
+            if not layout.get('symbol'):
+                raise ValueError("Los datos no tienen la columna 'symbol' y el layout no indica su valor")
+            valores = pa.array([layout['symbol']] * tabla.num_rows, pa.string())
+        else:
+            valores = pc.strftime(tiempos, format=FORMATOS_DERIVADOS[columna])
+        if columna in tabla.column_names:
+            tabla = tabla.set_column(tabla.column_names.index(columna), columna, valores)
+        else:
+            tabla = tabla.append_column(columna, valores)
+
+    return tabla.to_pandas() if es_pandas else tabla
+
+
+def layout_de_tabla(dt:DeltaTable) -> dict|None:
+    """
+    Infiere el layout de una tabla Delta existente a partir de sus columnas de
+    partición: solo se reconoce si todas son derivables y el esquema tiene una
+    columna de tiempo conocida.
+
+    Args:
+        dt (DeltaTable): Tabla Delta Lake.
+
+    Returns:
+        dict|None: Layout de la tabla, o None si no está particionada por tiempo.
+    """
+    particiones = dt.metadata().partition_columns
+    if not particiones or not any(c in FORMATOS_DERIVADOS for c in particiones):
+        return None
+    nombres = [campo.name for campo in dt.schema().fields]
+    columna_tiempo = next((c for c in COLUMNAS_TIEMPO if c in nombres), None)
+    if columna_tiempo is None:
+        return None
+    try:
+        return validar_layout({'columna_tiempo': columna_tiempo, 'particiones': particiones})
+    except ValueError:
+        return None
+
+
+def completar_columnas_particion(datos:pa.Table|pa.RecordBatchReader, dt:DeltaTable) -> pa.Table|pa.RecordBatchReader:
+    """
+    Agrega a los datos las columnas de partición derivadas que la tabla destino
+    espera y que el lote no trae. En un stream se calculan lote a lote.
+
+    Args:
+        datos (pa.Table|pa.RecordBatchReader): Datos a escribir.
+        dt (DeltaTable): Tabla Delta de destino.
+
+    Returns:
+        pa.Table|pa.RecordBatchReader: Los datos, con las columnas agregadas si hacía falta.
+    """
+    layout = layout_de_tabla(dt)
+    if layout is None or all(c in datos.schema.names for c in layout['particiones']):
+        return datos
+    return transformar_lotes(datos, lambda tabla: derivar_columnas_particion(tabla, layout))
+
+
+def _valores_entre(desde_ms:int, hasta_ms:int, formato:str) -> list[str]:
+    # Recorre el rango día por día: alcanza para cualquier unidad derivada
+    dias = pd.date_range(pd.to_datetime(desde_ms, unit='ms').normalize(), pd.to_datetime(hasta_ms, unit='ms'), freq='D')
+    return sorted(set(dias.strftime(formato)))
+
+
+def filtros_particion_para_rango(layout:dict, desde_ms:int=None, hasta_ms:int=None, symbol:str=None) -> list[tuple]:
+    """
+    Traduce un rango de tiempo (y opcionalmente un símbolo) a filtros sobre las
+    columnas de partición del layout, para que solo se listen los directorios que
+    pueden contener filas del rango.
+
+    Args:
+        layout (dict): Layout de particionado.
+        desde_ms (int): Inicio del rango en milisegundos (opcional).
+        hasta_ms (int): Fin del rango en milisegundos (opcional).
+        symbol (str): Símbolo a leer (opcional).
+
+    Returns:
+        list[tuple]: Filtros de partición, p. ej. [("year", "in", ["2025"]), ("month", "in", ["01", "02"])].
+    """
+    layout = validar_layout(layout)
+    filtros = []
+    if symbol is not None and 'symbol' in layout['particiones']:
+        filtros.append(('symbol', '=', symbol))
+    if desde_ms is None or hasta_ms is None or desde_ms > hasta_ms:
+        return filtros
+    for columna in layout['particiones']:
+        if columna in FORMATOS_DERIVADOS:
+            filtros.append((columna, 'in', _valores_entre(desde_ms, hasta_ms, FORMATOS_DERIVADOS[columna])))
+    return filtros
+
+
+def filtros_particion_desde_filtros(layout:dict, filters:list) -> list[tuple]:
+    """
+    Deriva filtros de partición a partir de filtros por valor sobre la columna de
+    tiempo y 'symbol'. Solo se consideran filtros en forma de conjunción
+    ([(col, op, valor), ...]); las disyunciones no se traducen.
+
+    Args:
+        layout (dict): Layout de particionado.
+        filters (list): Filtros por valor, p. ej. [("open_time", ">=", inicio), ("open_time", "<", fin)].
+
+    Returns:
+        list[tuple]: Filtros de partición equivalentes (vacía si no aplican).
+    """
+    if not filters or not all(isinstance(f, tuple) and len(f) == 3 for f in filters):
+        return []
+    columna_tiempo = layout['columna_tiempo']
+    desde, hasta, symbol = None, None, None
+    for columna, operador, valor in filters:
+        if columna == 'symbol' and operador in ('=', '=='):
+            symbol = valor
+        elif columna == columna_tiempo and isinstance(valor, int):
+            if operador in ('>', '>='):
+                desde = valor if desde is None else max(desde, valor)
+            elif operador in ('<', '<='):
+                hasta = valor if hasta is None else min(hasta, valor)
+            elif operador in ('=', '=='):
+                desde, hasta = valor, valor
+    if desde is None:
+        # Sin extremo inferior habría que listar todas las particiones desde el inicio
+        return filtros_particion_para_rango(layout, symbol=symbol)
+    if hasta is None:
+        # Las filas no pueden ser posteriores al momento actual (se deja un día de margen)
+        hasta = int(pd.Timestamp.now(tz='UTC').timestamp() * 1000) + 86_400_000
+    return filtros_particion_para_rango(layout, desde, hasta, symbol)
@@ -0,0 +1,95 @@
+import os
+import threading
+from deltalake import DeltaTable
+
+
+# Handles abiertos por hilo: un DeltaTable no debe usarse desde dos hilos a la vez
+# (p. ej. dos MERGE en paralelo), así que cada hilo mantiene su propia instantánea.
+_cache = threading.local()
+
+
+def _clave(path:str) -> str:
+    ruta = str(path)
+    return ruta if '://' in ruta else os.path.abspath(ruta)
+
+
+def _firma_commit(clave:str, version:int) -> tuple | None:
+    # Identidad del archivo del commit en disco: si la tabla se borró y se volvió a
+    # crear, el commit de la misma versión es otro archivo (otro inodo o mtime)
+    if '://' in clave:
+        return None
+    try:
+        estado = os.stat(os.path.join(clave, '_delta_log', f'{version:020d}.json'))
+    except FileNotFoundError:
+        return None
+    return estado.st_ino, estado.st_mtime_ns
+
+
+def _hay_commits_nuevos(clave:str, dt:DeltaTable) -> bool:
+    # En disco local alcanza con mirar si existe el commit siguiente; en almacenamiento
+    # remoto se delega en update_incremental, que solo lista el log posterior a la versión
+    if '://' in clave:
+        return True
+    return os.path.exists(os.path.join(clave, '_delta_log', f'{dt.version() + 1:020d}.json'))
+
+
+def _es_la_misma_tabla(clave:str, dt:DeltaTable, firma:tuple | None) -> bool:
+    # En disco local el handle sigue siendo válido solo si el commit de su versión es el
+    # mismo archivo que cuando se cargó; si no, la tabla se eliminó o se recreó
+    if '://' in clave:
+        return True
+    if firma is None:
+        # Commit ya depurado del log al cargar (queda el checkpoint): solo se verifica que exista
+        return os.path.isdir(os.path.join(clave, '_delta_log'))
+    return _firma_commit(clave, dt.version()) == firma
+
+
+def obtener_tabla(path:str) -> DeltaTable:
+    """
+    Devuelve un DeltaTable de la tabla reutilizando la instantánea ya cargada en el
+    proceso. En lugar de reproducir el log completo en cada apertura, solo se aplican
+    los commits posteriores a la versión en memoria (update_incremental), y solo si
+    los hay. Si la tabla se eliminó o se recreó desde que se cargó (el commit de la
+    versión en memoria ya no es el mismo archivo), se vuelve a abrir.
+
+    El handle es compartido: no se debe cambiar su versión con load_as_version.
+    Para leer una versión anterior, abrir un DeltaTable propio.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+
+    Returns:
+        DeltaTable: Tabla en su última versión.
+
+    Raises:
+        TableNotFoundError: Si la ruta no contiene una tabla Delta Lake.
+    """
+    tablas = _cache.__dict__.setdefault('tablas', {})
+    clave = _clave(path)
+    dt, firma = tablas.get(clave, (None, None))
+    if dt is not None:
+        if _es_la_misma_tabla(clave, dt, firma):
+            if _hay_commits_nuevos(clave, dt):
+                dt.update_incremental()
+                tablas[clave] = (dt, _firma_commit(clave, dt.version()))
+            return dt
+        # La tabla fue eliminada o recreada: se descarta el handle y se abre de nuevo
+        del tablas[clave]
+    dt = DeltaTable(str(path))
+    tablas[clave] = (dt, _firma_commit(clave, dt.version()))
+    return dt
+
+
+def invalidar_tabla(path:str=None) -> None:
+    """
+    Descarta el handle en cache de una tabla (o de todas si no se indica la ruta),
+    p. ej. después de borrar y recrear la tabla con otro esquema.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake (opcional).
+    """
+    tablas = _cache.__dict__.setdefault('tablas', {})
+    if path is None:
+        tablas.clear()
+    else:
+        tablas.pop(_clave(path), None)
@@ -0,0 +1,54 @@
+import json
+from deltalake import CommitProperties
+from deltalake.exceptions import TableNotFoundError
+from .table_cache import obtener_tabla
+
+
+# Clave del commitInfo de Delta donde se guarda la marca de agua del pipeline
+CLAVE_MARCA_AGUA = 'marca_agua'
+
+
+def propiedades_commit(marca_agua:dict=None) -> CommitProperties|None:
+    """
+    Arma las propiedades de commit que guardan la marca de agua como metadato
+    del mismo commit que escribe los datos.
+
+    Args:
+        marca_agua (dict): Progreso a registrar, p. ej. {"ultimo_valor": 123} (opcional).
+
+    Returns:
+        CommitProperties|None: Propiedades para write_deltalake/merge, o None sin marca.
+    """
+    if marca_agua is None:
+        return None
+    return CommitProperties(custom_metadata={CLAVE_MARCA_AGUA: json.dumps(marca_agua)})
+
+
+def _buscar_marca(historial:list[dict]) -> dict|None:
+    # El historial viene ordenado del commit más reciente al más antiguo
+    return next((json.loads(commit[CLAVE_MARCA_AGUA]) for commit in historial if CLAVE_MARCA_AGUA in commit), None)
+
+
+def leer_marca_agua(path:str, lote_historial:int=100) -> dict|None:
+    """
+    Recupera la última marca de agua registrada en el log de una tabla Delta.
+    Los commits sin marca (compactaciones, vacuum, escrituras manuales) se saltean.
+    Primero se revisan los últimos `lote_historial` commits y solo si no aparece
+    la marca se recorre el historial completo.
+
+    Args:
+        path (str): Ruta a la tabla Delta Lake.
+        lote_historial (int): Cantidad de commits recientes a revisar en la primera pasada.
+
+    Returns:
+        dict|None: La marca de agua del commit más reciente que la tenga, o None si la
+        tabla no existe o ningún commit conservado en el log la registró.
+    """
+    try:
+        dt = obtener_tabla(path)
+    except TableNotFoundError:
+        return None
+    marca = _buscar_marca(dt.history(lote_historial))
+    if marca is None and dt.version() + 1 > lote_historial:
+        marca = _buscar_marca(dt.history())
+    return marca
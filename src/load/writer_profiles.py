@@ -0,0 +1,161 @@
+import os
+import time
+import shutil
+import tempfile
+import pandas as pd
+import pyarrow as pa
+from deltalake import write_deltalake, DeltaTable, WriterProperties, ColumnProperties
+
+
+# Perfiles de escritura Parquet con nombre. Claves:
+#   compression / compression_level: códec y nivel de compresión
+#   max_row_group_size: filas por row group
+#   target_file_size: bytes por archivo de datos en las tablas Delta
+#   dictionary_enabled: codificación por diccionario para las columnas no float
+#   byte_stream_split: usar BYTE_STREAM_SPLIT en las columnas float (precios y volúmenes)
+PERFILES_ESCRITURA = {
+    'bronze-fast-ingest': {
+        'compression': 'SNAPPY',
+        'compression_level': None,
+        'max_row_group_size': 128 * 1024,
+        'target_file_size': 64 * 1024 * 1024,
+        'dictionary_enabled': False,
+        'byte_stream_split': False,
+    },
+    'silver-balanced': {
+        'compression': 'ZSTD',
+        'compression_level': 3,
+        'max_row_group_size': 512 * 1024,
+        'target_file_size': 128 * 1024 * 1024,
+        'dictionary_enabled': True,
+        'byte_stream_split': True,
+    },
+    'gold-read-optimized': {
+        'compression': 'ZSTD',
+        'compression_level': 9,
+        'max_row_group_size': 1024 * 1024,
+        'target_file_size': 256 * 1024 * 1024,
+        'dictionary_enabled': True,
+        'byte_stream_split': True,
+    },
+}
+
+
+def obtener_perfil(perfil:str|dict) -> dict:
+    """
+    Devuelve la configuración de un perfil de escritura.
+
+    Args:
+        perfil (str|dict): Nombre de un perfil de PERFILES_ESCRITURA o un diccionario propio.
+
+    Returns:
+        dict: Configuración del perfil.
+    """
+    if isinstance(perfil, dict):
+        return perfil
+    if perfil not in PERFILES_ESCRITURA:
+        raise ValueError(f'Perfil de escritura desconocido: {perfil}. Disponibles: {list(PERFILES_ESCRITURA)}')
+    return PERFILES_ESCRITURA[perfil]
+
+
+def _esquema(datos) -> pa.Schema:
+    if isinstance(datos, pd.DataFrame):
+        return pa.Schema.from_pandas(datos, preserve_index=False)
+    return pa.schema(datos.schema)
+
+
+def _columnas_float(schema:pa.Schema) -> list[str]:
+    return [campo.name for campo in schema if pa.types.is_floating(campo.type)]
+
+
+def propiedades_escritura_delta(perfil:str|dict, schema:pa.Schema) -> dict:
+    """
+    Traduce un perfil a los argumentos de escritura de deltalake.
+
+    Args:
+        perfil (str|dict): Nombre o configuración del perfil.
+        schema (pa.Schema): Esquema de los datos a escribir.
+
+    Returns:
+        dict: {'writer_properties': WriterProperties, 'target_file_size': int}
+    """
+    config = obtener_perfil(perfil)
+    columnas_bss = _columnas_float(schema) if config.get('byte_stream_split') else []
+    writer_properties = WriterProperties(
+        compression=config.get('compression'),
+        compression_level=config.get('compression_level'),
+        max_row_group_size=config.get('max_row_group_size'),
+        default_column_properties=ColumnProperties(dictionary_enabled=config.get('dictionary_enabled')),
+        column_properties={
+            columna: ColumnProperties(dictionary_enabled=False, encoding='BYTE_STREAM_SPLIT')
+            for columna in columnas_bss
+        } or None,
+    )
+    return {'writer_properties': writer_properties, 'target_file_size': config.get('target_file_size')}
+
+
+def opciones_parquet(perfil:str|dict, schema:pa.Schema) -> dict:
+    """
+    Traduce un perfil a los argumentos de pyarrow.parquet.write_table (y de DataFrame.to_parquet).
+
+    Args:
+        perfil (str|dict): Nombre o configuración del perfil.
+        schema (pa.Schema): Esquema de los datos a escribir.
+
+    Returns:
+        dict: Argumentos de escritura Parquet.
+    """
+    config = obtener_perfil(perfil)
+    columnas_bss = _columnas_float(schema) if config.get('byte_stream_split') else []
+    opciones = {
+        'compression': (config.get('compression') or 'snappy').lower(),
+        'row_group_size': config.get('max_row_group_size'),
+        'use_dictionary': [c for c in schema.names if c not in columnas_bss] if config.get('dictionary_enabled') else False,
+        'use_byte_stream_split': columnas_bss or False,
+    }
+    if config.get('compression_level') is not None:
+        opciones['compression_level'] = config['compression_level']
+    return opciones
+
+
+def medir_perfiles(datos:pd.DataFrame|pa.Table, perfiles:list=None, directorio:str=None) -> pd.DataFrame:
+    """
+    Escribe los mismos datos con cada perfil en tablas Delta temporales y compara
+    tamaño en disco, tiempo de escritura y tiempo de lectura completa.
+
+    Args:
+        datos (pd.DataFrame|pa.Table): Muestra representativa, p. ej. velas o trades reales.
+        perfiles (list): Nombres de perfiles a comparar. Por defecto, todos.
+        directorio (str): Carpeta de trabajo. Por defecto, una carpeta temporal que se elimina al terminar.
+
+    Returns:
+        pd.DataFrame: Una fila por perfil con 'bytes', 'segundos_escritura' y 'segundos_lectura'.
+    """
+    perfiles = perfiles or list(PERFILES_ESCRITURA)
+    schema = _esquema(datos)
+    base = directorio or tempfile.mkdtemp(prefix='perfiles_')
+    resultados = []
+    try:
+        for nombre in perfiles:
+            path = os.path.join(base, nombre)
+            shutil.rmtree(path, ignore_errors=True)
+
+            inicio = time.perf_counter()
+            write_deltalake(path, datos, mode='overwrite', **propiedades_escritura_delta(nombre, schema))
+            segundos_escritura = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            DeltaTable(path).to_pyarrow_table()
+            segundos_lectura = time.perf_counter() - inicio
+
+            tamano = sum(
+                os.path.getsize(os.path.join(raiz, archivo))
+                for raiz, _, archivos in os.walk(path) if '_delta_log' not in raiz
+                for archivo in archivos
+            )
+            resultados.append({'perfil': nombre, 'bytes': tamano, 'segundos_escritura': segundos_escritura,
+                               'segundos_lectura': segundos_lectura})
+    finally:
+        if directorio is None:
+            shutil.rmtree(base, ignore_errors=True)
+    return pd.DataFrame(resultados).set_index('perfil')
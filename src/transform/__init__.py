@@ -1,12 +1,19 @@
-from .aggregations import sumarizar_df
+from .aggregations import sumarizar_df, sumarizar_df_incremental
 from .data_cleaning import eliminar_duplicados, eliminar_registros_nulos, imputar_registros_nulos, contar_registros_nulos
-from .data_transformation import ordenar_dataframe, renombrar_columnas, castear_tipos_de_dato, convertir_milisegundos_a_datetime, cambiar_posicion_de_columna
+from .data_transformation import ordenar_dataframe, renombrar_columnas, castear_tipos_de_dato, castear_segun_esquema, convertir_milisegundos_a_datetime, cambiar_posicion_de_columna
+from .plan import PlanDeTransformacion
+from .backends import obtener_backend, verificar_backends, a_pandas
 
 __all__ = [
     'sumarizar_df',
+    'sumarizar_df_incremental',
     'eliminar_duplicados', 
     'eliminar_registros_nulos', 
     'imputar_registros_nulos', 
     'contar_registros_nulos',
-    'ordenar_dataframe', 'renombrar_columnas', 'castear_tipos_de_dato', 'convertir_milisegundos_a_datetime', 'cambiar_posicion_de_columna'
+    'ordenar_dataframe', 'renombrar_columnas', 'castear_tipos_de_dato', 'castear_segun_esquema', 'convertir_milisegundos_a_datetime', 'cambiar_posicion_de_columna',
+    'PlanDeTransformacion',
+    'obtener_backend',
+    'verificar_backends',
+    'a_pandas'
 ]
\ No newline at end of file
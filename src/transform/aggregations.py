@@ -16,4 +16,160 @@ def sumarizar_df(df: pd.DataFrame, by_col: list, agg_col: dict, rename_cols:dict
         pd.DataFrame: 
         DataFrame agrupado con las agregaciones realizadas y columnas renombradas.
     """
-    return df.groupby(by_col).agg(agg_col).rename(columns=rename_cols)
\ No newline at end of file
+    return df.groupby(by_col).agg(agg_col).rename(columns=rename_cols)
+
+# Estados parciales combinables de cada agregación: nombre del estado, cómo se
+# calcula sobre filas nuevas y cómo se combinan dos estados del mismo grupo.
+# 'first'/'last' guardan además la posición (columna de orden) del valor elegido.
+ESTADOS_PARCIALES = {
+    'sum': [('sum', 'sum', 'sum')],
+    'count': [('count', 'count', 'sum')],
+    'min': [('min', 'min', 'min')],
+    'max': [('max', 'max', 'max')],
+    'mean': [('sum', 'sum', 'sum'), ('count', 'count', 'sum')],
+    'first': [('first', 'first', 'first')],
+    'last': [('last', 'last', 'last')],
+}
+
+
+def _columna_estado(columna:str, estado:str) -> str:
+    return f'estado__{columna}__{estado}'
+
+
+def _validar_agregaciones(agg_col:dict, columna_orden:str|None) -> None:
+    for columna, agregacion in agg_col.items():
+        if agregacion not in ESTADOS_PARCIALES:
+            raise ValueError(f'La agregación "{agregacion}" de "{columna}" no se puede mantener de forma incremental. '
+                             f'Disponibles: {list(ESTADOS_PARCIALES)}')
+        if agregacion in ('first', 'last') and columna_orden is None:
+            raise ValueError(f'La agregación "{agregacion}" de "{columna}" necesita una columna de orden')
+
+
+def calcular_estados_parciales(df:pd.DataFrame, by_col:list, agg_col:dict, columna_orden:str=None) -> pd.DataFrame:
+    """
+    Calcula por grupo los estados parciales de las agregaciones (sumas, conteos,
+    mínimos, máximos, primeros/últimos valores), que luego pueden combinarse con
+    los de otros lotes sin volver a leer las filas originales.
+
+    Args:
+        df (pd.DataFrame): Filas a resumir (por ejemplo, solo las nuevas de silver).
+        by_col (list): Columnas por las cuales agrupar.
+        agg_col (dict): Agregación de cada columna, por ejemplo {'price': 'mean', 'id': 'count'}.
+        columna_orden (str): Columna que define el orden para 'first'/'last' (por ejemplo 'id').
+
+    Returns:
+        pd.DataFrame: Una fila por grupo con las columnas de agrupación y las de estado.
+    """
+    by_col = [by_col] if isinstance(by_col, str) else list(by_col)
+    _validar_agregaciones(agg_col, columna_orden)
+    agrupado = df.groupby(by_col)
+    estados = {}
+    for columna, agregacion in agg_col.items():
+        for estado, calculo, _ in ESTADOS_PARCIALES[agregacion]:
+            if calculo in ('first', 'last'):
+                # Valor no nulo con la menor/mayor posición de cada grupo, junto con esa posición
+                validos = df.loc[df[columna].notna(), list(dict.fromkeys(by_col + [columna, columna_orden]))]
+                elegidos = validos.sort_values(columna_orden, kind='stable').groupby(by_col).agg(calculo)
+                estados[_columna_estado(columna, estado)] = elegidos[columna]
+                estados[_columna_estado(columna, f'{estado}_orden')] = elegidos[columna_orden]
+            else:
+                estados[_columna_estado(columna, estado)] = agrupado[columna].agg(calculo)
+    resultado = pd.DataFrame(estados, index=agrupado.size().index)
+    return _orden_entero(resultado, df, columna_orden).reset_index()
+
+
+def _orden_entero(estados:pd.DataFrame, df:pd.DataFrame, columna_orden:str|None) -> pd.DataFrame:
+    # Un grupo sin valores válidos deja la posición vacía: se usa Int64 para no pasar a float
+    if columna_orden is not None and pd.api.types.is_integer_dtype(df[columna_orden].dtype):
+        for columna in estados.columns:
+            if columna.endswith('_orden'):
+                estados[columna] = estados[columna].astype('Int64')
+    return estados
+
+
+def combinar_estados_parciales(estados:pd.DataFrame, by_col:list, agg_col:dict) -> pd.DataFrame:
+    """
+    Combina los estados parciales de un mismo grupo (por ejemplo, los guardados en
+    gold y los de las filas nuevas) en un único estado por grupo.
+
+    Args:
+        estados (pd.DataFrame): Estados concatenados, con posibles grupos repetidos.
+        by_col (list): Columnas de agrupación.
+        agg_col (dict): Agregación de cada columna, igual que en `calcular_estados_parciales`.
+
+    Returns:
+        pd.DataFrame: Un estado por grupo.
+    """
+    by_col = [by_col] if isinstance(by_col, str) else list(by_col)
+    agrupado = estados.groupby(by_col)
+    combinados = {}
+    for columna, agregacion in agg_col.items():
+        for estado, _, combinacion in ESTADOS_PARCIALES[agregacion]:
+            nombre = _columna_estado(columna, estado)
+            if combinacion in ('first', 'last'):
+                orden = _columna_estado(columna, f'{estado}_orden')
+                elegidos = (estados.loc[estados[orden].notna(), by_col + [nombre, orden]]
+                            .sort_values(orden, kind='stable').groupby(by_col).agg(combinacion))
+                combinados[nombre] = elegidos[nombre]
+                combinados[orden] = elegidos[orden]
+            else:
+                combinados[nombre] = agrupado[nombre].agg(combinacion)
+    return pd.DataFrame(combinados, index=agrupado.size().index).reset_index()
+
+
+def finalizar_estados_parciales(estados:pd.DataFrame, by_col:list, agg_col:dict, rename_cols:dict) -> pd.DataFrame:
+    """
+    Calcula las agregaciones finales a partir de los estados parciales (la media
+    como suma / conteo), con el mismo formato que `sumarizar_df`.
+
+    Args:
+        estados (pd.DataFrame): Un estado por grupo.
+        by_col (list): Columnas de agrupación.
+        agg_col (dict): Agregación de cada columna.
+        rename_cols (dict): Renombrado de las columnas agregadas.
+
+    Returns:
+        pd.DataFrame: Agregaciones por grupo, indexadas por las columnas de agrupación.
+    """
+    by_col = [by_col] if isinstance(by_col, str) else list(by_col)
+    estados = estados.set_index(by_col)
+    resultado = pd.DataFrame(index=estados.index)
+    for columna, agregacion in agg_col.items():
+        if agregacion == 'mean':
+            conteo = estados[_columna_estado(columna, 'count')]
+            resultado[columna] = estados[_columna_estado(columna, 'sum')] / conteo.where(conteo > 0)
+        else:
+            resultado[columna] = estados[_columna_estado(columna, agregacion)]
+    return resultado.rename(columns=rename_cols)
+
+
+def sumarizar_df_incremental(df_nuevo:pd.DataFrame, estados_previos:pd.DataFrame|None, by_col:list, agg_col:dict,
+                             rename_cols:dict, columna_orden:str=None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Versión incremental de `sumarizar_df`: combina los estados parciales guardados
+    con los de las filas nuevas y recalcula solo los grupos que aparecen en ellas.
+    El costo depende del tamaño de las filas nuevas, no del historial.
+
+    Soporta las agregaciones combinables de ESTADOS_PARCIALES: sum, count, min,
+    max, mean, first y last (estas dos necesitan `columna_orden`).
+
+    Args:
+        df_nuevo (pd.DataFrame): Filas nuevas a incorporar.
+        estados_previos (pd.DataFrame|None): Estados guardados de (al menos) los grupos afectados.
+        by_col (list): Columnas por las cuales agrupar.
+        agg_col (dict): Agregación de cada columna.
+        rename_cols (dict): Renombrado de las columnas agregadas.
+        columna_orden (str): Columna que define el orden para 'first'/'last' (opcional).
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: Agregaciones de los grupos afectados (como
+        `sumarizar_df`) y sus estados actualizados, para guardarlos.
+    """
+    by_col = [by_col] if isinstance(by_col, str) else list(by_col)
+    nuevos = calcular_estados_parciales(df_nuevo, by_col, agg_col, columna_orden)
+    if estados_previos is not None and len(estados_previos):
+        # Solo interesan los estados de los grupos que recibieron filas nuevas
+        previos = estados_previos.merge(nuevos[by_col], on=by_col, how='inner')[nuevos.columns]
+        nuevos = combinar_estados_parciales(pd.concat([previos, nuevos], ignore_index=True), by_col, agg_col)
+        nuevos = _orden_entero(nuevos, df_nuevo, columna_orden)
+    return finalizar_estados_parciales(nuevos, by_col, agg_col, rename_cols), nuevos
@@ -0,0 +1,254 @@
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from utils.schemas import aplicar_esquema
+
+
+# Equivalencia de las agregaciones de pandas con las de Arrow
+_AGREGACIONES = {
+    'mean': 'mean',
+    'sum': 'sum',
+    'count': 'count',
+    'min': 'min',
+    'max': 'max',
+    'first': 'first',
+    'last': 'last',
+    'nunique': 'count_distinct',
+    'std': 'stddev',
+    'var': 'variance',
+}
+
+# Tipos de pandas sin equivalente directo en numpy
+_TIPOS = {
+    'str': pa.string(),
+    'string': pa.string(),
+    'object': pa.string(),
+    'category': pa.dictionary(pa.int32(), pa.string()),
+}
+
+
+def _sin_nulos(columna:pa.ChunkedArray) -> pa.ChunkedArray:
+    # pandas considera NaN como nulo; Arrow no, así que en columnas float se descartan ambos
+    valido = pc.is_valid(columna)
+    if pa.types.is_floating(columna.type):
+        valido = pc.and_(valido, pc.invert(pc.fill_null(pc.is_nan(columna), True)))
+    return valido
+
+
+def _tipo_arrow(tipo) -> pa.DataType:
+    if isinstance(tipo, pa.DataType):
+        return tipo
+    if isinstance(tipo, str) and tipo in _TIPOS:
+        return _TIPOS[tipo]
+    return pa.from_numpy_dtype(np.dtype(tipo))
+
+
+def sumarizar_df(tabla:pa.Table, by_col:list, agg_col:dict, rename_cols:dict) -> pa.Table:
+    """
+    Agrupa una tabla de Arrow y realiza las agregaciones indicadas (equivalente a `sumarizar_df` de pandas).
+
+    Args:
+        tabla (pa.Table): Tabla a resumir.
+        by_col (list): Columnas por las cuales agrupar.
+        agg_col (dict): Agregación de cada columna, p. ej. {'price': 'mean', 'id': 'count'}.
+        rename_cols (dict): Renombrado de las columnas agregadas.
+
+    Returns:
+        pa.Table: Una fila por grupo, ordenada por las columnas de agrupación, con las
+        columnas de agrupación primero (como el índice de pandas).
+    """
+    by_col = [by_col] if isinstance(by_col, str) else list(by_col)
+    for columna, agregacion in agg_col.items():
+        if agregacion not in _AGREGACIONES:
+            raise ValueError(f'Agregación no soportada en el backend Arrow para "{columna}": {agregacion}. '
+                             f'Disponibles: {list(_AGREGACIONES)}')
+    resultado = tabla.group_by(by_col, use_threads=False).aggregate(
+        [(columna, _AGREGACIONES[agregacion]) for columna, agregacion in agg_col.items()])
+    nombres = {f'{columna}_{_AGREGACIONES[agregacion]}': columna for columna, agregacion in agg_col.items()}
+    resultado = resultado.rename_columns([rename_cols.get(nombres.get(c, c), nombres.get(c, c)) for c in resultado.column_names])
+    resultado = resultado.select(by_col + [c for c in resultado.column_names if c not in by_col])
+    return resultado.sort_by([(c, 'ascending') for c in by_col])
+
+
+def eliminar_duplicados(tabla:pa.Table, subset:str|list=None, keep='first') -> pa.Table:
+    """
+    Elimina filas duplicadas según una o varias columnas, conservando el orden original.
+
+    Args:
+        tabla (pa.Table): Tabla a limpiar.
+        subset (str|list): Columna/s en las que se evalúan duplicados. Por defecto, todas.
+        keep: 'first', 'last' o False (descarta todas las repeticiones).
+
+    Returns:
+        pa.Table: Tabla sin duplicados.
+    """
+    subset = tabla.column_names if subset is None else ([subset] if isinstance(subset, str) else list(subset))
+    claves = tabla.select(subset).append_column('__fila', pa.array(np.arange(tabla.num_rows)))
+    if keep is False:
+        grupos = claves.group_by(subset, use_threads=False).aggregate([('__fila', 'min'), ('__fila', 'count')])
+        filas = grupos.filter(pc.equal(grupos['__fila_count'], 1))['__fila_min']
+    else:
+        agregacion = 'min' if keep == 'first' else 'max'
+        filas = claves.group_by(subset, use_threads=False).aggregate([('__fila', agregacion)])[f'__fila_{agregacion}']
+    return tabla.take(pc.take(filas, pc.sort_indices(filas)))
+
+
+def eliminar_registros_nulos(tabla:pa.Table, subset:list) -> pa.Table:
+    """
+    Elimina las filas con valores nulos (o NaN) en alguna de las columnas indicadas.
+
+    Args:
+        tabla (pa.Table): Tabla a procesar.
+        subset (list): Columnas en las que se buscan nulos.
+
+    Returns:
+        pa.Table: Tabla sin registros nulos en esas columnas.
+    """
+    mascara = None
+    for columna in subset:
+        valido = _sin_nulos(tabla[columna])
+        mascara = valido if mascara is None else pc.and_(mascara, valido)
+    return tabla if mascara is None else tabla.filter(mascara)
+
+
+def imputar_registros_nulos(tabla:pa.Table, imputation_mapping:dict) -> pa.Table:
+    """
+    Reemplaza los nulos (y NaN) de cada columna por el valor indicado en el mapeo.
+
+    Args:
+        tabla (pa.Table): Tabla con valores nulos.
+        imputation_mapping (dict): {columna: valor}, p. ej. {'qty': 0}.
+
+    Returns:
+        pa.Table: Tabla con los nulos imputados.
+    """
+    for columna, valor in imputation_mapping.items():
+        indice = tabla.column_names.index(columna)
+        datos = tabla[columna]
+        imputada = pc.if_else(_sin_nulos(datos), datos, pa.scalar(valor, datos.type))
+        tabla = tabla.set_column(indice, columna, imputada)
+    return tabla
+
+
+def contar_registros_nulos(tabla:pa.Table, subset:list) -> None:
+    """
+    Imprime la cantidad de valores nulos (o NaN) de cada columna indicada.
+
+    Args:
+        tabla (pa.Table): Tabla a procesar.
+        subset (list): Columnas a revisar.
+    """
+    for col in subset:
+        nulos = tabla.num_rows - pc.sum(_sin_nulos(tabla[col]).cast(pa.int64())).as_py()
+        print(f"Valores nulos en columna {col}: {nulos}")
+
+
+def ordenar_dataframe(tabla:pa.Table, sort_by:str|list, ascending:bool|list=True) -> pa.Table:
+    """
+    Ordena una tabla según una o varias columnas (orden estable).
+
+    Args:
+        tabla (pa.Table): Tabla a ordenar.
+        sort_by (str|list): Columna/s por las cuales ordenar.
+        ascending (bool|list): Orden ascendente si es True (default).
+
+    Returns:
+        pa.Table: Tabla ordenada.
+    """
+    print(f'Ordenando tabla por {sort_by}...')
+    sort_by = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+    ascending = ascending if isinstance(ascending, list) else [ascending] * len(sort_by)
+    return tabla.sort_by([(c, 'ascending' if a else 'descending') for c, a in zip(sort_by, ascending)])
+
+
+def renombrar_columnas(tabla:pa.Table, columnas:dict) -> pa.Table | None:
+    """
+    Renombra columnas según el diccionario {viejo_nombre: nuevo_nombre} (sin copiar datos).
+
+    Args:
+        tabla (pa.Table): Tabla con las columnas a renombrar.
+        columnas (dict): Diccionario de renombrado.
+
+    Returns:
+        pa.Table|None: Tabla con columnas renombradas, o None si `columnas` no es un diccionario.
+    """
+    if not isinstance(columnas, dict):
+        print('Las columnas deben ser pasadas en un diccionario')
+        return None
+    return tabla.rename_columns([columnas.get(c, c) for c in tabla.column_names])
+
+
+def castear_tipos_de_dato(tabla:pa.Table, conversion_mapping:dict) -> pa.Table:
+    """
+    Cambia los tipos de dato de las columnas según el mapeo {columna: tipo}. Los tipos
+    pueden ser de pandas/numpy ("int64", "float", "str") o de Arrow (pa.float64()).
+
+    Args:
+        tabla (pa.Table): Tabla de Arrow.
+        conversion_mapping (dict): Tipo de destino de cada columna.
+
+    Returns:
+        pa.Table: Tabla con las columnas convertidas, o la original si la conversión falla.
+    """
+    try:
+        resultado = tabla
+        for columna, tipo in conversion_mapping.items():
+            indice = resultado.column_names.index(columna)
+            resultado = resultado.set_column(indice, columna, resultado[columna].cast(_tipo_arrow(tipo)))
+        return resultado
+    except ValueError as e:
+        # Columna inexistente (list.index) o valor no representable (ArrowInvalid)
+        print(f"Error de conversión de tipos -> {e}")
+        return tabla
+
+
+def castear_segun_esquema(tabla:pa.Table, endpoint:str, modo:str='estricto') -> pa.Table:
+    """
+    Convierte la tabla al esquema registrado del endpoint (columnas, tipos y
+    nulabilidad) en una sola pasada vectorizada (ver utils.schemas.aplicar_esquema).
+
+    Args:
+        tabla (pa.Table): Tabla con las columnas ya renombradas.
+        endpoint (str): Endpoint del registro de esquemas, por ejemplo 'klines'.
+        modo (str): 'estricto' o 'tolerante'.
+
+    Returns:
+        pa.Table: Tabla con el esquema exacto del endpoint.
+    """
+    tabla, errores = aplicar_esquema(tabla, endpoint, modo)
+    for columna, cantidad in errores.items():
+        print(f"Valores inválidos en columna {columna}: {cantidad}")
+    return tabla
+
+
+def convertir_milisegundos_a_datetime(tabla:pa.Table, cols:list[str]) -> pa.Table:
+    """
+    Devuelve las columnas indicadas convertidas de milisegundos desde época Unix a timestamp[ms].
+    La conversión reinterpreta el entero sin recorrer los valores.
+
+    Args:
+        tabla (pa.Table): Tabla que contiene las columnas a convertir.
+        cols (list[str]): Columnas a transformar.
+
+    Returns:
+        pa.Table: Tabla con solo esas columnas, como timestamp[ms].
+    """
+    return pa.table({c: tabla[c].cast(pa.int64()).cast(pa.timestamp('ms')) for c in cols})
+
+
+def cambiar_posicion_de_columna(tabla:pa.Table, col_deseada:str, col_desplazada:str) -> pa.Table:
+    """
+    Mueve la columna `col_deseada` a la posición donde está `col_desplazada`.
+
+    Args:
+        tabla (pa.Table): Tabla original.
+        col_deseada (str): Columna que se mueve.
+        col_desplazada (str): Columna que marca la posición destino.
+
+    Returns:
+        pa.Table: Tabla con las columnas reordenadas.
+    """
+    cols = list(tabla.column_names)
+    indice_col_desplazada = cols.index(col_desplazada)
+    cols.insert(indice_col_desplazada, cols.pop(cols.index(col_deseada)))
+    return tabla.select(cols)
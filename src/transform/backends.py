@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+import pandas as pd
+import pyarrow as pa
+from . import aggregations, data_cleaning, data_transformation, arrow_backend
+
+
+# Funciones de transformación que implementa cada backend
+FUNCIONES = {
+    'sumarizar_df': aggregations,
+    'eliminar_duplicados': data_cleaning,
+    'eliminar_registros_nulos': data_cleaning,
+    'imputar_registros_nulos': data_cleaning,
+    'contar_registros_nulos': data_cleaning,
+    'ordenar_dataframe': data_transformation,
+    'renombrar_columnas': data_transformation,
+    'castear_tipos_de_dato': data_transformation,
+    'castear_segun_esquema': data_transformation,
+    'convertir_milisegundos_a_datetime': data_transformation,
+    'cambiar_posicion_de_columna': data_transformation,
+}
+
+BACKENDS = {
+    'pandas': SimpleNamespace(nombre='pandas', **{f: getattr(modulo, f) for f, modulo in FUNCIONES.items()}),
+    'arrow': SimpleNamespace(nombre='arrow', **{f: getattr(arrow_backend, f) for f in FUNCIONES}),
+}
+
+
+def obtener_backend(nombre:str='pandas') -> SimpleNamespace:
+    """
+    Devuelve las funciones de transformación del backend indicado. Todas tienen la
+    misma firma: el backend 'pandas' recibe y devuelve DataFrames y el backend
+    'arrow' recibe y devuelve pyarrow Tables (sin convertir a pandas).
+
+    Ejemplo:
+        backend = obtener_backend(BACKEND_TRANSFORMACION)
+        datos = backend.eliminar_duplicados(datos, ['id'])
+
+    Args:
+        nombre (str): 'pandas' o 'arrow'.
+
+    Returns:
+        SimpleNamespace: Funciones del backend, accesibles como atributos.
+    """
+    if nombre not in BACKENDS:
+        raise ValueError(f'Backend de transformación desconocido: {nombre}. Disponibles: {list(BACKENDS)}')
+    return BACKENDS[nombre]
+
+
+def a_pandas(datos:pd.DataFrame|pa.Table) -> pd.DataFrame:
+    """Convierte el resultado de cualquier backend a DataFrame (p. ej. para el reporte de calidad)."""
+    return datos.to_pandas() if isinstance(datos, pa.Table) else datos
+
+
+def _normalizar(datos:pd.DataFrame|pa.Table, agrupado:bool) -> pd.DataFrame:
+    # El backend pandas deja las columnas de agrupación en el índice y conserva las
+    # etiquetas de fila originales; el backend Arrow no tiene índice
+    df = a_pandas(datos)
+    return df.reset_index(drop=not agrupado) if not isinstance(datos, pa.Table) else df.reset_index(drop=True)
+
+
+def verificar_backends(datos:pd.DataFrame|pa.Table, pasos:list[tuple[str, dict]]) -> bool:
+    """
+    Ejecuta la misma cadena de pasos con los backends pandas y Arrow y compara los
+    resultados valor a valor, incluidos los tipos de dato (p. ej. la resolución de
+    los timestamps: datetime64[ns] y datetime64[ms] se consideran distintos).
+
+    Args:
+        datos (pd.DataFrame|pa.Table): Datos de entrada (se convierten a cada backend).
+        pasos (list[tuple[str, dict]]): Pasos en orden, p. ej.
+            [('eliminar_duplicados', {'subset': ['id']}), ('ordenar_dataframe', {'sort_by': 'id'})].
+
+    Returns:
+        bool: True si ambos backends producen el mismo resultado; si no, imprime la diferencia.
+    """
+    tabla = datos if isinstance(datos, pa.Table) else pa.Table.from_pandas(datos, preserve_index=False)
+    resultados = {'pandas': tabla.to_pandas(), 'arrow': tabla}
+    for nombre, backend in BACKENDS.items():
+        for funcion, argumentos in pasos:
+            resultados[nombre] = getattr(backend, funcion)(resultados[nombre], **argumentos)
+
+    agrupado = any(funcion == 'sumarizar_df' for funcion, _ in pasos)
+    esperado = _normalizar(resultados['pandas'], agrupado)
+    obtenido = _normalizar(resultados['arrow'], agrupado)
+    try:
+        pd.testing.assert_frame_equal(esperado, obtenido, check_exact=False)
+        return True
+    except AssertionError as e:
+        print(f'Los backends pandas y arrow difieren:\n{e}')
+        return False
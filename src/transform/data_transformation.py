@@ -1,4 +1,5 @@
 import pandas as pd
+from utils.schemas import aplicar_esquema
 
 
 def ordenar_dataframe(df: pd.DataFrame, sort_by: str, ascending: bool = True) -> pd.DataFrame:
@@ -58,6 +59,26 @@ def castear_tipos_de_dato(df: pd.DataFrame, conversion_mapping: dict) -> pd.Data
         return df
     
     
+def castear_segun_esquema(df:pd.DataFrame, endpoint:str, modo:str='estricto') -> pd.DataFrame:
+    """
+    Convierte el DataFrame al esquema registrado del endpoint (columnas, tipos y
+    nulabilidad) en una sola pasada vectorizada (ver utils.schemas.aplicar_esquema).
+
+    Args:
+        df (pd.DataFrame): DataFrame con las columnas ya renombradas.
+        endpoint (str): Endpoint del registro de esquemas, por ejemplo 'klines'.
+        modo (str): 'estricto' (lanza ValueError ante cualquier error) o 'tolerante'
+            (deja nulos los valores inválidos y descarta filas sin clave).
+
+    Returns:
+        pd.DataFrame: DataFrame con los tipos del esquema.
+    """
+    tabla, errores = aplicar_esquema(df, endpoint, modo)
+    for columna, cantidad in errores.items():
+        print(f"Valores inválidos en columna {columna}: {cantidad}")
+    return tabla.to_pandas()
+
+
 def convertir_milisegundos_a_datetime(df:pd.DataFrame, cols:list[str]) -> pd.DataFrame:
     '''
     Convierte una o varias columnas de un DataFrame que contienen valores en milisegundos 
@@ -0,0 +1,168 @@
+from typing import Callable
+import numpy as np
+import pandas as pd
+
+
+class PlanDeTransformacion:
+    """
+    Registra una cadena de transformaciones sin ejecutarlas y las aplica todas
+    juntas con `ejecutar`, copiando los datos una sola vez:
+
+    - Los filtros (nulos, duplicados) y los ordenamientos solo mueven posiciones de
+      filas: se evalúan sobre las columnas que usan, sin copiar el resto.
+    - Las filas resultantes se materializan con una única selección.
+    - Los casts y las conversiones de milisegundos se aplican en una pasada, solo
+      sobre las columnas afectadas.
+    - Los renombres y cambios de posición de columnas son solo metadatos.
+
+    El resultado es el mismo que aplicar las funciones de data_cleaning y
+    data_transformation en el mismo orden, con dos precisiones:
+
+    - `convertir_milisegundos_a_datetime` reemplaza las columnas dentro del
+      DataFrame, como `df[cols] = convertir_milisegundos_a_datetime(df, cols)`
+      (la función eager devuelve solo las columnas convertidas).
+    - Los empates de un ordenamiento conservan el orden previo (orden estable).
+
+    Ejemplo:
+        plan = (PlanDeTransformacion()
+                .renombrar_columnas(COLS)
+                .eliminar_duplicados(['open_time'])
+                .eliminar_registros_nulos(['open_time', 'close_time'])
+                .castear_tipos_de_dato({'open': 'float64'})
+                .ordenar_dataframe('open_time'))
+        print(plan.explicar())
+        df_silver = plan.ejecutar(df_bronce)
+    """
+
+    def __init__(self):
+        self.pasos = []
+
+    def _agregar(self, nombre:str, **argumentos) -> 'PlanDeTransformacion':
+        self.pasos.append((nombre, argumentos))
+        return self
+
+    def renombrar_columnas(self, columnas:dict) -> 'PlanDeTransformacion':
+        if not isinstance(columnas, dict):
+            raise ValueError('Las columnas deben ser pasadas en un diccionario')
+        return self._agregar('renombrar_columnas', columnas=dict(columnas))
+
+    def castear_tipos_de_dato(self, conversion_mapping:dict) -> 'PlanDeTransformacion':
+        return self._agregar('castear_tipos_de_dato', conversion_mapping=dict(conversion_mapping))
+
+    def convertir_milisegundos_a_datetime(self, cols:list[str]) -> 'PlanDeTransformacion':
+        return self._agregar('convertir_milisegundos_a_datetime', cols=list(cols))
+
+    def eliminar_duplicados(self, subset:str|list=None, keep='first') -> 'PlanDeTransformacion':
+        return self._agregar('eliminar_duplicados', subset=subset, keep=keep)
+
+    def eliminar_registros_nulos(self, subset:list) -> 'PlanDeTransformacion':
+        return self._agregar('eliminar_registros_nulos', subset=list(subset))
+
+    def ordenar_dataframe(self, sort_by:str|list, ascending:bool|list=True) -> 'PlanDeTransformacion':
+        return self._agregar('ordenar_dataframe', sort_by=sort_by, ascending=ascending)
+
+    def cambiar_posicion_de_columna(self, col_deseada:str, col_desplazada:str) -> 'PlanDeTransformacion':
+        return self._agregar('cambiar_posicion_de_columna', col_deseada=col_deseada, col_desplazada=col_desplazada)
+
+    def explicar(self) -> str:
+        """
+        Describe el plan registrado y cómo se ejecuta una vez fusionado.
+
+        Returns:
+            str: Plan lógico (pasos en orden) y plan físico (fases de ejecución).
+        """
+        lineas = ['Plan lógico:']
+        lineas += [f'  {i}. {nombre}({", ".join(f"{k}={v!r}" for k, v in argumentos.items())})'
+                   for i, (nombre, argumentos) in enumerate(self.pasos, 1)]
+
+        filas = [nombre for nombre, _ in self.pasos
+                 if nombre in ('eliminar_registros_nulos', 'eliminar_duplicados', 'ordenar_dataframe')]
+        conversiones = [nombre for nombre, _ in self.pasos
+                        if nombre in ('castear_tipos_de_dato', 'convertir_milisegundos_a_datetime')]
+        metadatos = [nombre for nombre, _ in self.pasos
+                     if nombre in ('renombrar_columnas', 'cambiar_posicion_de_columna')]
+        lineas.append('Plan físico:')
+        lineas.append(f'  1. Selección de filas sobre las columnas clave: {" -> ".join(filas) or "ninguna"}')
+        lineas.append('  2. Materialización única de las filas seleccionadas')
+        lineas.append(f'  3. Conversión de tipos en una pasada: {len(conversiones)} paso(s) fusionado(s)')
+        lineas.append(f'  4. Renombres y orden de columnas (solo metadatos): {len(metadatos)} paso(s) fusionado(s)')
+        return '\n'.join(lineas)
+
+    def ejecutar(self, df:pd.DataFrame) -> pd.DataFrame:
+        """
+        Ejecuta el plan fusionado sobre un DataFrame.
+
+        Args:
+            df (pd.DataFrame): DataFrame de entrada. No se modifica.
+
+        Returns:
+            pd.DataFrame: DataFrame transformado.
+        """
+        # Nombre actual de cada columna -> nombre en el DataFrame de entrada
+        origen = {columna: columna for columna in df.columns}
+        columnas = list(df.columns)
+        # Conversiones pendientes por columna de entrada, en orden
+        conversiones: dict[str, list[tuple[str, Callable[[pd.Series], pd.Series]]]] = {}
+        filas = np.arange(len(df))
+
+        def valores(nombres:list[str]) -> pd.DataFrame:
+            # Columnas pedidas en las filas vivas, con las conversiones registradas hasta este paso
+            claves = df[[origen[n] for n in nombres]].take(filas)
+            claves.columns = nombres
+            for nombre in nombres:
+                for _, convertir in conversiones.get(origen[nombre], []):
+                    claves[nombre] = convertir(claves[nombre])
+            return claves
+
+        for nombre, argumentos in self.pasos:
+            if nombre == 'renombrar_columnas':
+                mapeo = argumentos['columnas']
+                origen = {mapeo.get(c, c): origen[c] for c in columnas}
+                columnas = [mapeo.get(c, c) for c in columnas]
+
+            elif nombre == 'cambiar_posicion_de_columna':
+                desplazada = columnas.index(argumentos['col_desplazada'])
+                columnas.insert(desplazada, columnas.pop(columnas.index(argumentos['col_deseada'])))
+
+            elif nombre == 'castear_tipos_de_dato':
+                faltantes = [c for c in argumentos['conversion_mapping'] if c not in origen]
+                if faltantes:
+                    print(f"Error: alguna columna no existe en el DataFrame -> {faltantes}")
+                    continue
+                for columna, tipo in argumentos['conversion_mapping'].items():
+                    conversiones.setdefault(origen[columna], []).append((f'astype({tipo})', lambda s, t=tipo: s.astype(t)))
+
+            elif nombre == 'convertir_milisegundos_a_datetime':
+                for columna in argumentos['cols']:
+                    conversiones.setdefault(origen[columna], []).append(
+                        ('ms->datetime', lambda s: pd.to_datetime(s, unit='ms', errors='coerce', exact=True)))
+
+            elif nombre == 'eliminar_registros_nulos':
+                filas = filas[~valores(argumentos['subset']).isna().any(axis=1).to_numpy()]
+
+            elif nombre == 'eliminar_duplicados':
+                subset = argumentos['subset']
+                subset = columnas if subset is None else ([subset] if isinstance(subset, str) else list(subset))
+                filas = filas[~valores(subset).duplicated(keep=argumentos['keep']).to_numpy()]
+
+            elif nombre == 'ordenar_dataframe':
+                sort_by = argumentos['sort_by']
+                sort_by = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+                claves = valores(sort_by).reset_index(drop=True)
+                orden = claves.sort_values(by=sort_by, ascending=argumentos['ascending'], kind='stable').index.to_numpy()
+                filas = filas[orden]
+
+        # Única copia de los datos: filas seleccionadas y solo las columnas del resultado
+        resultado = df[[origen[c] for c in columnas]].take(filas)
+        for columna_origen, pasos in conversiones.items():
+            if columna_origen not in resultado.columns:
+                continue
+            try:
+                serie = resultado[columna_origen]
+                for _, convertir in pasos:
+                    serie = convertir(serie)
+                resultado[columna_origen] = serie
+            except ValueError as e:
+                print(f"Error de conversión de tipos en {columna_origen} -> {e}")
+        resultado.columns = columnas
+        return resultado
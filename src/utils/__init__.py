@@ -1,7 +1,8 @@
 from .config_utils import leer_archivo_conf, crear_archivo_incremental, obtener_archivo_incremental
-from .file_utils import crear_archivo_incremental, obtener_archivo_incremental, guardar_formato_parquet
+from .file_utils import crear_archivo_incremental, obtener_archivo_incremental, guardar_formato_parquet, guardar_archivo_incremental_atomico
 from  .memory_utils import mostrar_espacio_en_memoria_df
-from .helpers import setup_paths, set_fecha_inicial, set_fecha_final
+from .helpers import setup_paths, set_fecha_inicial, set_fecha_final, intervalo_a_milisegundos
+from .schemas import KLINES_SCHEMA, TRADES_SCHEMA, AGG_TRADES_SCHEMA, DEPTH_SCHEMA, REGISTRO_ESQUEMAS, obtener_esquema, aplicar_esquema
 
 
 __all__ = [
@@ -12,8 +13,17 @@ __all__ = [
     'crear_archivo_incremental', 
     'obtener_archivo_incremental', 
     'guardar_formato_parquet', 
+    'guardar_archivo_incremental_atomico',
     'mostrar_espacio_en_memoria_df',
     'setup_paths', 
     'set_fecha_inicial', 
-    'set_fecha_final'
+    'set_fecha_final',
+    'intervalo_a_milisegundos',
+    'KLINES_SCHEMA',
+    'TRADES_SCHEMA',
+    'AGG_TRADES_SCHEMA',
+    'DEPTH_SCHEMA',
+    'REGISTRO_ESQUEMAS',
+    'obtener_esquema',
+    'aplicar_esquema'
 ]
\ No newline at end of file
@@ -1,6 +1,8 @@
 import os
 import json
+import tempfile
 import pandas as pd
+import pyarrow as pa
 
 
 def crear_archivo_incremental(contenido_incremental:list|dict, archivo_json:str, carpeta:str=None) -> None:
@@ -51,7 +53,38 @@ def obtener_archivo_incremental(ruta_archivo_incremental:str) -> dict | list:
         return None
     
     
-def guardar_formato_parquet(df:pd.DataFrame, path:str, engine:str='pyarrow', compression:str='snappy', index:bool=False):
+def guardar_archivo_incremental_atomico(contenido_incremental:list|dict, ruta_archivo_incremental:str) -> None:
+    """
+    Guarda el json incremental de forma atómica: escribe un archivo temporal en la
+    misma carpeta, lo sincroniza a disco y lo renombra sobre el destino. Ante una
+    caída, el archivo queda con el contenido anterior o con el nuevo, nunca a medias.
+
+    Args:
+        contenido_incremental (list | dict): contenido que se va a guardar como json
+        ruta_archivo_incremental (str): ruta del archivo json de destino
+
+    Returns:
+        None
+    """
+    if not isinstance(contenido_incremental, (list, dict)):
+        raise ValueError('El parámetro no tiene un formato json')
+
+    carpeta = os.path.dirname(os.path.abspath(ruta_archivo_incremental))
+    os.makedirs(carpeta, exist_ok=True)
+    fd, ruta_temporal = tempfile.mkstemp(dir=carpeta, prefix='.tmp_', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(contenido_incremental, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(ruta_temporal, ruta_archivo_incremental)
+    except BaseException:
+        os.remove(ruta_temporal)
+        raise
+    
+    
+def guardar_formato_parquet(df:pd.DataFrame, path:str, engine:str='pyarrow', compression:str='snappy', index:bool=False,
+                            perfil:str|dict=None):
     '''
     Guarda un DF en formato parquet
     
@@ -61,6 +94,8 @@ def guardar_formato_parquet(df:pd.DataFrame, path:str, engine:str='pyarrow', com
         engine (str): Motor de guardado ('pyarrow' | 'fastparquet'), por defecto 'pyarrow'
         compression (str): Método de compresión
         index (bool): Agregar o no una columna indexada
+        perfil (str|dict): Perfil de escritura de load.writer_profiles (opcional, solo con engine 'pyarrow').
+            Si se indica, reemplaza a `compression`.
         
     Returns:
         None
@@ -70,9 +105,15 @@ def guardar_formato_parquet(df:pd.DataFrame, path:str, engine:str='pyarrow', com
     if not os.path.exists(dir_path):
         os.makedirs(dir_path)
     
+    opciones = {'compression': compression}
+    if perfil is not None:
+        # Import diferido: utils no depende de la capa load salvo cuando se usa un perfil
+        from load.writer_profiles import opciones_parquet
+        opciones = opciones_parquet(perfil, pa.Schema.from_pandas(df, preserve_index=index))
+    
     # Guardo en formato parquet
     df.to_parquet(
     path,
     engine=engine,
-    compression=compression,
-    index=index)
\ No newline at end of file
+    index=index,
+    **opciones)
\ No newline at end of file
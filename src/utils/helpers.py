@@ -15,4 +15,24 @@ def set_fecha_inicial(fecha_inicial:str) -> int:
 
 def set_fecha_final(fecha_final:str) -> int:
     """Convierte a milisegundos la fecha de finalización ingresada"""
-    return int(pd.Timestamp(fecha_final).timestamp() * 1000)
\ No newline at end of file
+    return int(pd.Timestamp(fecha_final).timestamp() * 1000)
+
+# Duración en milisegundos de cada unidad de intervalo de Binance
+_UNIDADES_INTERVALO_MS = {
+    's': 1000,
+    'm': 60 * 1000,
+    'h': 60 * 60 * 1000,
+    'd': 24 * 60 * 60 * 1000,
+    'w': 7 * 24 * 60 * 60 * 1000,
+}
+
+
+def intervalo_a_milisegundos(intervalo:str) -> int:
+    """
+    Convierte un intervalo de velas de Binance ('1m', '4h', '1d', '1w', ...) a milisegundos.
+    El intervalo mensual ('1M') no tiene duración fija y no está soportado.
+    """
+    cantidad, unidad = intervalo[:-1], intervalo[-1]
+    if unidad not in _UNIDADES_INTERVALO_MS or not cantidad.isdigit():
+        raise ValueError(f'Intervalo no soportado: {intervalo}')
+    return int(cantidad) * _UNIDADES_INTERVALO_MS[unidad]
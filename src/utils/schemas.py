@@ -0,0 +1,218 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# Esquema de binance/klines. Los nombres coinciden con config.constants.COLS;
+# los tiempos se mantienen como enteros en milisegundos (época Unix).
+KLINES_SCHEMA = pa.schema([
+    pa.field('open_time', pa.int64(), nullable=False),
+    pa.field('open', pa.float64()),
+    pa.field('high', pa.float64()),
+    pa.field('low', pa.float64()),
+    pa.field('close', pa.float64()),
+    pa.field('volume', pa.float64()),
+    pa.field('close_time', pa.int64()),
+    pa.field('quote_asset_volume', pa.float64()),
+    pa.field('num_trades', pa.int64()),
+    pa.field('tb_base_asset_volume', pa.float64()),
+    pa.field('tb_quote_asset_volume', pa.float64()),
+    pa.field('ignore', pa.string()),
+])
+
+# Esquema de binance/historicalTrades
+TRADES_SCHEMA = pa.schema([
+    pa.field('id', pa.int64(), nullable=False),
+    pa.field('price', pa.float64()),
+    pa.field('qty', pa.float64()),
+    pa.field('quoteQty', pa.float64()),
+    pa.field('time', pa.int64()),
+    pa.field('isBuyerMaker', pa.bool_()),
+    pa.field('isBestMatch', pa.bool_()),
+])
+
+# Precisión usada cuando se piden precios como decimales exactos
+DECIMAL_TYPE = pa.decimal128(20, 8)
+
+
+def con_precios_decimales(schema:pa.Schema) -> pa.Schema:
+    """Devuelve una copia del esquema con las columnas float64 convertidas a decimal128(20, 8)."""
+    return pa.schema([
+        field.with_type(DECIMAL_TYPE) if pa.types.is_float64(field.type) else field
+        for field in schema
+    ])
+
+
+# Esquema de binance/aggTrades (trades agregados por precio y taker)
+AGG_TRADES_SCHEMA = pa.schema([
+    pa.field('agg_trade_id', pa.int64(), nullable=False),
+    pa.field('price', pa.float64()),
+    pa.field('qty', pa.float64()),
+    pa.field('first_trade_id', pa.int64()),
+    pa.field('last_trade_id', pa.int64()),
+    pa.field('time', pa.int64()),
+    pa.field('isBuyerMaker', pa.bool_()),
+    pa.field('isBestMatch', pa.bool_()),
+])
+
+# Esquema de binance/depth, con una fila por nivel de precio del libro de órdenes
+DEPTH_SCHEMA = pa.schema([
+    pa.field('last_update_id', pa.int64(), nullable=False),
+    pa.field('side', pa.string(), nullable=False),  # 'bid' | 'ask'
+    pa.field('price', pa.float64(), nullable=False),
+    pa.field('qty', pa.float64()),
+])
+
+# Registro de esquemas por endpoint. Cada entrada define:
+#   schema: nombres, tipos de Arrow y nulabilidad de las columnas
+#   claves_json: clave del JSON de la API de cada columna, si difiere del nombre (opcional)
+#   columnas_clave: columnas que identifican un registro (para MERGE y deduplicación)
+#   layout: particionado derivado del tiempo (ver load.partitioning)
+REGISTRO_ESQUEMAS = {
+    'klines': {
+        'schema': KLINES_SCHEMA,
+        'columnas_clave': ['open_time'],
+        'layout': {'columna_tiempo': 'open_time', 'particiones': ['year', 'month']},
+    },
+    'historicalTrades': {
+        'schema': TRADES_SCHEMA,
+        'columnas_clave': ['id'],
+        'layout': {'columna_tiempo': 'time', 'particiones': ['date']},
+    },
+    'aggTrades': {
+        'schema': AGG_TRADES_SCHEMA,
+        'claves_json': {'agg_trade_id': 'a', 'price': 'p', 'qty': 'q', 'first_trade_id': 'f',
+                        'last_trade_id': 'l', 'time': 'T', 'isBuyerMaker': 'm', 'isBestMatch': 'M'},
+        'columnas_clave': ['agg_trade_id'],
+        'layout': {'columna_tiempo': 'time', 'particiones': ['date']},
+    },
+    'depth': {
+        'schema': DEPTH_SCHEMA,
+        'columnas_clave': ['last_update_id', 'side', 'price'],
+        'layout': None,
+    },
+}
+# Los archivos de data.binance.vision llaman 'trades' a los trades históricos
+REGISTRO_ESQUEMAS['trades'] = REGISTRO_ESQUEMAS['historicalTrades']
+
+
+def obtener_esquema(endpoint:str) -> dict:
+    """
+    Devuelve la entrada del registro de esquemas de un endpoint.
+
+    Args:
+        endpoint (str): Endpoint, con o sin prefijo de la API (p. ej. 'klines' o 'api/v3/klines').
+
+    Returns:
+        dict: Entrada de REGISTRO_ESQUEMAS.
+    """
+    nombre = endpoint.rstrip('/').rsplit('/', 1)[-1]
+    if nombre not in REGISTRO_ESQUEMAS:
+        raise ValueError(f'Endpoint sin esquema registrado: {endpoint}. Disponibles: {list(REGISTRO_ESQUEMAS)}')
+    return REGISTRO_ESQUEMAS[nombre]
+
+
+# Formatos de texto aceptados al convertir strings en modo tolerante
+_PATRON_ENTERO = r'^\s*[+-]?\d+\s*$'
+_PATRON_REAL = r'^\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*$|^\s*[+-]?(nan|inf|infinity)\s*$'
+_PATRON_BOOLEANO = r'^\s*(true|false|1|0)\s*$'
+
+
+def _convertibles(columna:pa.ChunkedArray, tipo:pa.DataType) -> pa.ChunkedArray | None:
+    # Máscara de los valores que pueden convertirse sin error, calculada de forma
+    # vectorizada; None si no hay una regla para ese par de tipos
+    if pa.types.is_string(columna.type) or pa.types.is_large_string(columna.type):
+        if pa.types.is_integer(tipo):
+            patron = _PATRON_ENTERO
+        elif pa.types.is_floating(tipo) or pa.types.is_decimal(tipo):
+            patron = _PATRON_REAL
+        elif pa.types.is_boolean(tipo):
+            patron = _PATRON_BOOLEANO
+        else:
+            return None
+        return pc.match_substring_regex(columna, patron, ignore_case=True)
+    if pa.types.is_floating(columna.type) and pa.types.is_integer(tipo):
+        return pc.and_(pc.is_finite(columna), pc.equal(pc.floor(columna), columna))
+    return None
+
+
+def _castear_tolerante(columna:pa.ChunkedArray, tipo:pa.DataType) -> pa.ChunkedArray:
+    mascara = _convertibles(columna, tipo)
+    if mascara is not None:
+        try:
+            return pc.if_else(mascara, columna, pa.scalar(None, columna.type)).cast(tipo)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            pass  # p. ej. enteros fuera de rango: se resuelve valor a valor
+    valores = []
+    for valor in columna.to_pylist():
+        try:
+            valores.append(pa.scalar(valor).cast(tipo).as_py() if valor is not None else None)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+            valores.append(None)
+    return pa.chunked_array([pa.array(valores, type=tipo)])
+
+
+def aplicar_esquema(datos, esquema:str|pa.Schema, modo:str='estricto') -> tuple[pa.Table, dict[str, int]]:
+    """
+    Convierte los datos al esquema registrado de un endpoint en una sola pasada
+    vectorizada por columna: selecciona y ordena las columnas, castea cada una al
+    tipo de Arrow del esquema y valida la nulabilidad.
+
+    En modo 'estricto' cualquier valor no convertible, columna faltante o nulo en una
+    columna no nula lanza ValueError. En modo 'tolerante' los valores no convertibles
+    quedan nulos, las columnas faltantes se completan con nulos y se descartan las
+    filas con nulos en columnas no nulas; cada caso se cuenta por columna.
+
+    Args:
+        datos (pd.DataFrame|pa.Table): Datos a convertir.
+        esquema (str|pa.Schema): Endpoint del registro (p. ej. 'klines') o esquema de Arrow.
+        modo (str): 'estricto' o 'tolerante'.
+
+    Returns:
+        tuple[pa.Table, dict[str, int]]: Tabla con el esquema exacto y cantidad de
+        errores por columna (solo las columnas con errores).
+    """
+    if modo not in ('estricto', 'tolerante'):
+        raise ValueError(f"Modo de conversión desconocido: {modo}. Disponibles: ['estricto', 'tolerante']")
+    schema = obtener_esquema(esquema)['schema'] if isinstance(esquema, str) else esquema
+    tabla = datos if isinstance(datos, pa.Table) else pa.Table.from_pandas(datos, preserve_index=False)
+
+    faltantes = [campo.name for campo in schema if campo.name not in tabla.column_names]
+    if faltantes and modo == 'estricto':
+        raise ValueError(f'Faltan columnas del esquema: {faltantes}')
+
+    errores = {}
+    columnas = []
+    for campo in schema:
+        if campo.name not in tabla.column_names:
+            columnas.append(pa.nulls(tabla.num_rows, campo.type))
+            errores[campo.name] = tabla.num_rows
+            continue
+        columna = tabla[campo.name]
+        if columna.type == campo.type:
+            columnas.append(columna)
+            continue
+        try:
+            columnas.append(columna.cast(campo.type))
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as e:
+            if modo == 'estricto':
+                raise ValueError(f'La columna "{campo.name}" no se puede convertir a {campo.type}: {e}') from e
+            convertida = _castear_tolerante(columna, campo.type)
+            nuevos_nulos = convertida.null_count - columna.null_count
+            if nuevos_nulos:
+                errores[campo.name] = nuevos_nulos
+            columnas.append(convertida)
+
+    # La nulabilidad se valida después, así que se arma primero con todos los campos nulables
+    resultado = pa.Table.from_arrays(columnas, schema=pa.schema([campo.with_nullable(True) for campo in schema]))
+    no_nulas = [campo.name for campo in schema if not campo.nullable and resultado[campo.name].null_count]
+    if no_nulas:
+        if modo == 'estricto':
+            raise ValueError(f'Hay valores nulos en columnas no nulas: {no_nulas}')
+        mascara = None
+        for nombre in no_nulas:
+            # Los nulos incluyen los valores no convertibles ya contados
+            errores[nombre] = resultado[nombre].null_count
+            valido = pc.is_valid(resultado[nombre])
+            mascara = valido if mascara is None else pc.and_(mascara, valido)
+        resultado = resultado.filter(mascara)
+    return resultado.cast(schema), errores
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los módulos de src se importan como paquetes de primer nivel (utils, extract, load, transform)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
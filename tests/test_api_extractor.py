@@ -0,0 +1,43 @@
+import json
+import pytest
+from extract import api_extractor
+from extract.api_extractor import reensamblar_velas, get_data_incremental_hasta_el_final
+
+
+VENTANAS = [(0, 59_999), (60_000, 119_999)]
+
+
+def test_reensamblar_velas_falla_si_falta_una_ventana():
+    with pytest.raises(RuntimeError, match='1 ventanas'):
+        reensamblar_velas(VENTANAS, [[[0, '1.0']], None])
+
+
+def test_reensamblar_velas_parcial_permitida():
+    assert reensamblar_velas(VENTANAS, [[[0, '1.0']], None], permitir_parciales=True) == [[0, '1.0']]
+
+
+def test_reensamblar_velas_ordena_y_deduplica():
+    paginas = [[[30_000, 'b'], [0, 'a']], [[60_000, 'c'], [30_000, 'x']]]
+    assert reensamblar_velas(VENTANAS, paginas) == [[0, 'a'], [30_000, 'b'], [60_000, 'c']]
+
+
+def test_incremental_parte_de_la_marca_que_provee_quien_llama(tmp_path, monkeypatch):
+    archivo = tmp_path / 'incremental.json'
+    archivo.write_text(json.dumps({'valor_previo': 0, 'ultimo_valor': 5}))
+    pedidos = []
+
+    def get_data_falso(base_url, endpoint, params=None, **kwargs):
+        pedidos.append(params['fromId'])
+        return [{'id': i} for i in range(params['fromId'], min(params['fromId'] + 2, 15))]
+
+    monkeypatch.setattr(api_extractor, 'get_data', get_data_falso)
+    guardados = []
+    total = get_data_incremental_hasta_el_final(archivo, 'http://stub', 'historicalTrades',
+                                                lambda datos, marca: guardados.append(marca),
+                                                params={'limit': 2}, leer_marca_agua=lambda: {'ultimo_valor': 10})
+
+    assert pedidos == [11, 13, 15]
+    assert total == 4
+    assert guardados == [{'ultimo_valor': 12}, {'ultimo_valor': 14}]
+    # Con lector de marca el archivo incremental no se modifica
+    assert json.loads(archivo.read_text())['ultimo_valor'] == 5
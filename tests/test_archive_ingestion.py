@@ -0,0 +1,78 @@
+import zipfile
+from deltalake import DeltaTable
+from extract.archive_ingestion import leer_archivo_zip_csv, ingerir_archivos_historicos
+from utils.schemas import KLINES_SCHEMA, TRADES_SCHEMA
+
+ENCABEZADO_KLINES = ('open_time,open,high,low,close,volume,close_time,quote_volume,count,'
+                     'taker_buy_volume,taker_buy_quote_volume,ignore')
+INICIO = 1_704_067_200_000  # 2024-01-01 en milisegundos
+
+
+def _fila_kline(open_time:int, factor:int=1) -> str:
+    return (f'{open_time * factor},100.5,101.0,99.5,100.0,12.5,{(open_time + 59_999) * factor},'
+            f'1250.0,42,6.0,600.0,0')
+
+
+def _crear_zip(ruta, nombre_csv:str, lineas:list[str]) -> str:
+    with zipfile.ZipFile(ruta, 'w') as zf:
+        zf.writestr(nombre_csv, '\n'.join(lineas) + '\n')
+    return str(ruta)
+
+
+def test_lee_klines_sin_encabezado_con_el_esquema_tipado(tmp_path):
+    ruta = _crear_zip(tmp_path / 'SOLUSDT-1m-2024-01.zip', 'SOLUSDT-1m-2024-01.csv',
+                      [_fila_kline(INICIO + i * 60_000) for i in range(3)])
+
+    tabla = leer_archivo_zip_csv(ruta, 'klines')
+
+    assert tabla.schema == KLINES_SCHEMA
+    assert tabla['open_time'].to_pylist() == [INICIO, INICIO + 60_000, INICIO + 120_000]
+    assert tabla['close'].to_pylist() == [100.0] * 3
+
+
+def test_saltea_encabezado_y_normaliza_microsegundos(tmp_path):
+    ruta = _crear_zip(tmp_path / 'SOLUSDT-1m-2025-01.zip', 'SOLUSDT-1m-2025-01.csv',
+                      [ENCABEZADO_KLINES] + [_fila_kline(INICIO + i * 60_000, factor=1000) for i in range(2)])
+
+    tabla = leer_archivo_zip_csv(ruta, 'klines')
+
+    assert tabla.num_rows == 2
+    assert tabla['open_time'].to_pylist() == [INICIO, INICIO + 60_000]
+    assert tabla['close_time'].to_pylist() == [INICIO + 59_999, INICIO + 119_999]
+
+
+def test_lee_trades(tmp_path):
+    ruta = _crear_zip(tmp_path / 'SOLUSDT-trades-2024-01.zip', 'SOLUSDT-trades-2024-01.csv',
+                      [f'{i},100.0,0.5,50.0,{INICIO + i},true,true' for i in range(1, 4)])
+
+    tabla = leer_archivo_zip_csv(ruta, 'trades')
+
+    assert tabla.schema == TRADES_SCHEMA
+    assert tabla['id'].to_pylist() == [1, 2, 3]
+    assert tabla['isBuyerMaker'].to_pylist() == [True] * 3
+
+
+def test_zip_sin_csv_devuelve_tabla_vacia(tmp_path):
+    ruta = _crear_zip(tmp_path / 'vacio.zip', 'LEEME.txt', ['sin datos'])
+    assert leer_archivo_zip_csv(ruta, 'klines') == KLINES_SCHEMA.empty_table()
+
+
+def test_ingiere_todos_los_archivos_en_orden(tmp_path):
+    origen, destino = tmp_path / 'zips', tmp_path / 'bronce'
+    origen.mkdir()
+    for mes, inicio in ((1, INICIO), (2, INICIO + 31 * 86_400_000)):
+        _crear_zip(origen / f'SOLUSDT-1m-2024-0{mes}.zip', f'SOLUSDT-1m-2024-0{mes}.csv',
+                   [_fila_kline(inicio + i * 60_000) for i in range(5)])
+
+    total = ingerir_archivos_historicos(origen, destino, 'klines',
+                                        layout={'columna_tiempo': 'open_time', 'particiones': ['year', 'month']})
+
+    dt = DeltaTable(str(destino))
+    assert total == 10
+    assert dt.version() == 1  # un commit por archivo
+    assert dt.metadata().partition_columns == ['year', 'month']
+    assert dt.to_pyarrow_table().num_rows == 10
+
+
+def test_directorio_sin_archivos(tmp_path):
+    assert ingerir_archivos_historicos(tmp_path, tmp_path / 'bronce') == 0
@@ -0,0 +1,63 @@
+import pyarrow as pa
+from extract import async_extractor
+from extract.async_extractor import extraer_simbolos_a_tablas
+from load.delta_writer import leer_delta_lake, save_new_data_as_delta
+
+LAYOUT = {'columna_tiempo': 'open_time', 'particiones': ['symbol', 'year', 'month']}
+PARAMS = {'startTime': 0, 'endTime': 119_999, 'limit': 1}
+
+
+def _vela(open_time:int, precio:str) -> list:
+    return [open_time, precio, precio, precio, precio, '10.5', open_time + 59_999, '100.0', 3, '5.0', '50.0', '0']
+
+
+def _ventana_falsa(base_url, endpoint, params, **kwargs):
+    precio = '1.5' if params['symbol'] == 'SOLUSDT' else '2.5'
+    return [_vela(params['startTime'], precio)]
+
+
+def test_tablas_tipadas_por_simbolo_e_intervalo(monkeypatch):
+    monkeypatch.setattr(async_extractor, 'get_data_ventana', _ventana_falsa)
+    tablas = extraer_simbolos_a_tablas('http://stub', 'api/v3/klines', ['SOLUSDT', 'BTCUSDT'], ['1m'], PARAMS,
+                                       client=object())
+
+    tabla = tablas[('SOLUSDT', '1m')]
+    assert tabla.num_rows == 2
+    assert tabla.schema.field('open').type == pa.float64()
+    assert tabla.schema.field('open_time').type == pa.int64()
+    assert tabla['symbol'].to_pylist() == ['SOLUSDT', 'SOLUSDT']
+    assert tabla['open'].to_pylist() == [1.5, 1.5]
+
+
+def test_simbolos_comparten_tabla_por_intervalo_sin_duplicar(monkeypatch, tmp_path):
+    monkeypatch.setattr(async_extractor, 'get_data_ventana', _ventana_falsa)
+    ruta = tmp_path / '1m'
+
+    def guardar(symbol, interval, tabla):
+        save_new_data_as_delta(tabla, ruta, predicate='src.symbol = tgt.symbol AND src.open_time = tgt.open_time',
+                               layout=LAYOUT)
+
+    for _ in range(2):
+        extraer_simbolos_a_tablas('http://stub', 'api/v3/klines', ['SOLUSDT', 'BTCUSDT'], ['1m'], PARAMS,
+                                  client=object(), al_completar=guardar)
+
+    df = leer_delta_lake(str(ruta))
+    assert len(df) == 4
+    assert df.groupby('symbol')['open'].first().to_dict() == {'BTCUSDT': 2.5, 'SOLUSDT': 1.5}
+
+
+def test_un_simbolo_fallido_no_descarta_al_resto(monkeypatch, capsys):
+    def _ventana_con_falla(base_url, endpoint, params, **kwargs):
+        if params['symbol'] == 'BTCUSDT' and params['startTime'] > 0:
+            return None
+        return _ventana_falsa(base_url, endpoint, params)
+
+    monkeypatch.setattr(async_extractor, 'get_data_ventana', _ventana_con_falla)
+    guardadas = []
+    tablas = extraer_simbolos_a_tablas('http://stub', 'api/v3/klines', ['SOLUSDT', 'BTCUSDT', 'ETHUSDT'], ['1m'],
+                                       PARAMS, client=object(),
+                                       al_completar=lambda symbol, interval, tabla: guardadas.append(symbol))
+
+    assert sorted(tablas) == [('ETHUSDT', '1m'), ('SOLUSDT', '1m')]
+    assert sorted(guardadas) == ['ETHUSDT', 'SOLUSDT']
+    assert 'No se pudieron completar 1 combinaciones: BTCUSDT 1m' in capsys.readouterr().out
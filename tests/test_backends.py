@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from transform import backends
+from transform.backends import verificar_backends, obtener_backend
+
+
+@pytest.fixture
+def datos() -> pd.DataFrame:
+    rng = np.random.default_rng(1)
+    n = 200
+    df = pd.DataFrame({
+        'id': rng.integers(0, 120, n),
+        'open_time': 1_700_000_000_000 + rng.integers(0, 10**9, n),
+        'price': rng.random(n) * 100,
+        'qty': rng.random(n),
+        'symbol': rng.choice(['SOLUSDT', 'BTCUSDT'], n),
+    })
+    df.loc[[3, 17, 40], 'price'] = np.nan
+    return df
+
+
+PASOS = {
+    'duplicados_y_orden': [('eliminar_duplicados', {'subset': ['id']}), ('ordenar_dataframe', {'sort_by': 'id'})],
+    'duplicados_keep_false': [('eliminar_duplicados', {'subset': 'id', 'keep': False})],
+    'nulos': [('eliminar_registros_nulos', {'subset': ['price']})],
+    'imputacion': [('imputar_registros_nulos', {'imputation_mapping': {'price': 0.0}})],
+    'cast': [('castear_tipos_de_dato', {'conversion_mapping': {'id': 'float64'}})],
+    'milisegundos': [('convertir_milisegundos_a_datetime', {'cols': ['open_time']})],
+    'renombres': [('renombrar_columnas', {'columnas': {'id': 'trade_id'}}),
+                  ('cambiar_posicion_de_columna', {'col_deseada': 'qty', 'col_desplazada': 'trade_id'})],
+    'agregacion': [('sumarizar_df', {'by_col': ['symbol'], 'agg_col': {'price': 'mean', 'qty': 'sum', 'id': 'count'},
+                                     'rename_cols': {'price': 'avg_price'}})],
+    'agregacion_extremos': [('sumarizar_df', {'by_col': 'symbol', 'agg_col': {'price': 'first', 'qty': 'max', 'id': 'nunique'},
+                                              'rename_cols': {}})],
+}
+
+
+@pytest.mark.parametrize('pasos', PASOS.values(), ids=PASOS.keys())
+def test_arrow_y_pandas_dan_el_mismo_resultado(datos, pasos):
+    assert verificar_backends(datos, pasos)
+
+
+def test_el_backend_arrow_no_convierte_a_pandas(datos):
+    tabla = pa.Table.from_pandas(datos, preserve_index=False)
+    resultado = obtener_backend('arrow').eliminar_registros_nulos(tabla, ['price'])
+    assert isinstance(resultado, pa.Table)
+
+
+def test_detecta_diferencias_de_resolucion_temporal(datos, monkeypatch):
+    arrow = backends.BACKENDS['arrow']
+    original = arrow.convertir_milisegundos_a_datetime
+    # Mismos instantes con otra resolución (como datetime64[ns] frente a timestamp[ms])
+    monkeypatch.setattr(arrow, 'convertir_milisegundos_a_datetime',
+                        lambda tabla, cols: original(tabla, cols).cast(pa.schema([(c, pa.timestamp('ns')) for c in cols])))
+
+    assert not verificar_backends(datos, PASOS['milisegundos'])
+
+
+def test_backend_desconocido():
+    with pytest.raises(ValueError, match='Backend de transformación desconocido'):
+        obtener_backend('polars')
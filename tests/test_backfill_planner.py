@@ -0,0 +1,62 @@
+import pyarrow as pa
+from deltalake import write_deltalake
+from extract import backfill_planner as planner
+from extract.backfill_planner import calcular_rangos_faltantes, leer_cobertura_open_time, planificar_ventanas
+
+MINUTO = 60_000
+
+
+def _velas(*open_times) -> pa.Table:
+    return pa.table({'open_time': pa.array([t * MINUTO for t in open_times], pa.int64())})
+
+
+def test_rangos_faltantes_entre_y_alrededor_de_los_tramos():
+    cubiertos = [(2 * MINUTO, 4 * MINUTO), (7 * MINUTO, 8 * MINUTO)]
+    assert calcular_rangos_faltantes(0, 10 * MINUTO, cubiertos, '1m') == [
+        (0, 2 * MINUTO - 1), (5 * MINUTO, 7 * MINUTO - 1), (9 * MINUTO, 10 * MINUTO)]
+
+
+def test_rangos_faltantes_sin_huecos_y_sin_cobertura():
+    assert calcular_rangos_faltantes(2 * MINUTO, 4 * MINUTO, [(0, 9 * MINUTO)], '1m') == []
+    assert calcular_rangos_faltantes(0, 3 * MINUTO, [], '1m') == [(0, 3 * MINUTO)]
+    # Tramos fuera del rango pedido no lo afectan
+    assert calcular_rangos_faltantes(5 * MINUTO, 6 * MINUTO, [(0, MINUTO), (9 * MINUTO, 10 * MINUTO)], '1m') == [
+        (5 * MINUTO, 6 * MINUTO)]
+
+
+def test_planifica_solo_los_huecos(tmp_path):
+    ruta = str(tmp_path / 'velas')
+    write_deltalake(ruta, _velas(0, 1, 2))
+    write_deltalake(ruta, _velas(6, 7), mode='append')
+
+    ventanas = planificar_ventanas(ruta, 0, 9 * MINUTO, '1m', limit=2)
+    assert ventanas == [(3 * MINUTO, 5 * MINUTO - 1), (5 * MINUTO, 6 * MINUTO - 1), (8 * MINUTO, 9 * MINUTO)]
+
+
+def test_tabla_inexistente_planifica_todo_el_rango(tmp_path):
+    assert planificar_ventanas(str(tmp_path / 'nada'), 0, 3 * MINUTO, '1m', limit=10) == [(0, 3 * MINUTO)]
+
+
+def test_archivo_con_repetidas_e_igual_cantidad_de_huecos(tmp_path):
+    # 0..4 con el 1 y el 3 faltantes y el 0 y el 2 repetidos: 5 filas, como un archivo completo
+    ruta = str(tmp_path / 'velas')
+    write_deltalake(ruta, _velas(0, 0, 2, 2, 4))
+
+    assert leer_cobertura_open_time(ruta, '1m') == [(0, 0), (2 * MINUTO, 2 * MINUTO), (4 * MINUTO, 4 * MINUTO)]
+    assert calcular_rangos_faltantes(0, 4 * MINUTO, leer_cobertura_open_time(ruta, '1m'), '1m') == [
+        (MINUTO, 2 * MINUTO - 1), (3 * MINUTO, 4 * MINUTO - 1)]
+
+
+def test_claves_unicas_usa_las_estadisticas(tmp_path, monkeypatch):
+    ruta = str(tmp_path / 'velas')
+    write_deltalake(ruta, _velas(0, 1, 2, 3))
+    write_deltalake(ruta, _velas(6, 8), mode='append')
+
+    leidos = []
+    lector = planner.pq.read_table
+    monkeypatch.setattr(planner.pq, 'read_table', lambda ruta, **kw: leidos.append(ruta) or lector(ruta, **kw))
+
+    assert leer_cobertura_open_time(ruta, '1m', claves_unicas=True) == [
+        (0, 3 * MINUTO), (6 * MINUTO, 6 * MINUTO), (8 * MINUTO, 8 * MINUTO)]
+    # Solo se lee el archivo incompleto
+    assert len(leidos) == 1
@@ -0,0 +1,137 @@
+import json
+import math
+import pyarrow as pa
+import pyarrow.compute as pc
+from deltalake import DeltaTable, write_deltalake
+from load.delta_writer import (save_data_as_delta, save_new_data_as_delta, leer_extraccion_reciente, leer_delta_lake,
+                               iterar_lotes_delta, leer_cambios_desde_version, leer_extraccion_reciente_por_version,
+                               leer_extraccion_reciente_con_marca, _rangos_origen)
+
+
+def _ids(path) -> list:
+    return sorted(DeltaTable(str(path)).to_pyarrow_table()['id'].to_pylist())
+
+
+def _filas(path, filtros) -> list:
+    df = leer_delta_lake(path, filters=filtros)
+    return sorted(zip(df['simbolo'], df['precio']))
+
+
+def test_upsert_en_particion_entera_no_duplica(tmp_path):
+    write_deltalake(str(tmp_path), pa.table({'id': list(range(10)), 'p': [1] * 10}), partition_by=['p'])
+
+    save_new_data_as_delta(pa.table({'id': list(range(5, 15)), 'p': [1] * 10}), tmp_path, 'src.id = tgt.id')
+
+    assert _ids(tmp_path) == list(range(15))
+
+
+def test_lote_disjunto_en_particion_entera_se_agrega(tmp_path):
+    write_deltalake(str(tmp_path), pa.table({'id': list(range(10)), 'p': [1] * 10}), partition_by=['p'])
+
+    save_new_data_as_delta(pa.table({'id': list(range(10, 20)), 'p': [2] * 10}), tmp_path, 'src.id = tgt.id')
+
+    assert _ids(tmp_path) == list(range(20))
+
+
+def test_claves_no_finitas_no_se_acotan_por_rango(tmp_path):
+    origen = pa.table({'k': [1.0, math.inf, 3.0]})
+    assert _rangos_origen(origen, ['k']) == {}
+
+    write_deltalake(str(tmp_path), pa.table({'k': [1.0, 2.0]}))
+    save_new_data_as_delta(origen, tmp_path, 'src.k = tgt.k')
+
+    valores = DeltaTable(str(tmp_path)).to_pyarrow_table()['k']
+    assert sorted(valores.to_pylist()) == [1.0, 2.0, 3.0, math.inf]
+    assert pc.count(valores).as_py() == 4
+
+
+def test_leer_extraccion_reciente_usa_la_marca_de_agua_de_bronce(tmp_path):
+    bronce, archivo = tmp_path / 'bronce', tmp_path / 'incremental.json'
+    # El archivo quedó atrasado: la extracción registra el progreso solo en el log de bronce
+    archivo.write_text(json.dumps({'valor_previo': 4, 'ultimo_valor': 9}))
+    save_data_as_delta(pa.table({'id': list(range(20))}), bronce, marca_agua={'ultimo_valor': 19})
+
+    assert leer_extraccion_reciente(bronce, archivo)['id'].tolist() == list(range(5, 20))
+    assert json.loads(archivo.read_text())['valor_previo'] == 19
+    assert leer_extraccion_reciente(bronce, archivo).empty
+
+
+def test_filtros_sobre_texto_tras_un_merge(tmp_path):
+    # Los archivos escritos por el MERGE guardan 'simbolo' como string_view y los originales como string
+    ruta = str(tmp_path / 'tabla')
+    save_data_as_delta(pa.table({'simbolo': ['BTC', 'ETH'], 'precio': [1.0, 2.0]}), ruta)
+    save_new_data_as_delta(pa.table({'simbolo': ['ETH', 'SOL'], 'precio': [9.0, 3.0]}), ruta,
+                           predicate='src.simbolo = tgt.simbolo')
+    DeltaTable(ruta).merge(pa.table({'simbolo': ['BTC'], 'precio': [5.0]}), predicate='s.simbolo = t.simbolo',
+                           source_alias='s', target_alias='t').when_matched_update_all().execute()
+
+    assert _filas(ruta, [('simbolo', 'in', ['BTC', 'SOL'])]) == [('BTC', 5.0), ('SOL', 3.0)]
+    assert _filas(ruta, [('simbolo', '>=', 'ETH'), ('precio', '<', 5.0)]) == [('ETH', 2.0), ('SOL', 3.0)]
+    assert _filas(ruta, [[('simbolo', '=', 'ETH')], [('precio', '>', 4.0)]]) == [('BTC', 5.0), ('ETH', 2.0)]
+    assert [lote.num_rows for lote in iterar_lotes_delta(ruta, filters=[('simbolo', '=', 'SOL')])] == [1]
+
+
+def test_cambios_desde_version_por_log_con_append_y_merge(tmp_path):
+    ruta = str(tmp_path / 'bronce')
+    save_data_as_delta(pa.table({'id': [0, 1, 2]}), ruta)                                   # v0
+    save_data_as_delta(pa.table({'id': [3, 4]}), ruta, mode='append')                       # v1
+    save_new_data_as_delta(pa.table({'id': [4, 5, 6]}), ruta, predicate='src.id = tgt.id')  # v2
+
+    nuevos, version = leer_cambios_desde_version(ruta, 0)
+    assert version == 2
+    assert sorted(nuevos['id'].to_pylist()) == [3, 4, 5, 6]
+    assert sorted(leer_cambios_desde_version(ruta, -1)[0]['id'].to_pylist()) == list(range(7))
+    vacia, version = leer_cambios_desde_version(ruta, 2, columns=['id'])
+    assert (vacia.num_rows, vacia.column_names, version) == (0, ['id'], 2)
+
+
+def test_cambios_desde_version_por_change_data_feed(tmp_path):
+    ruta = str(tmp_path / 'silver')
+    write_deltalake(ruta, pa.table({'id': [1, 2], 'simbolo': ['a', 'b']}),
+                    configuration={'delta.enableChangeDataFeed': 'true'})
+    DeltaTable(ruta).merge(pa.table({'id': [2, 3], 'simbolo': ['B', 'c']}), predicate='s.id = t.id',
+                           source_alias='s', target_alias='t').when_matched_update_all().when_not_matched_insert_all().execute()
+
+    nuevos, version = leer_cambios_desde_version(ruta, 0)
+    assert version == 1
+    assert sorted(zip(nuevos['id'].to_pylist(), nuevos['simbolo'].to_pylist())) == [(2, 'B'), (3, 'c')]
+    assert nuevos.column_names == ['id', 'simbolo']
+    assert nuevos.schema.field('simbolo').type == pa.string()
+
+
+def test_por_version_recurre_al_filtro_por_id_tras_una_compactacion(tmp_path):
+    ruta, archivo = str(tmp_path / 'bronce'), tmp_path / 'incremental.json'
+    save_data_as_delta(pa.table({'id': [0, 1]}), ruta, marca_agua={'ultimo_valor': 1})
+    assert leer_extraccion_reciente_por_version(ruta, archivo)['id'].tolist() == [0, 1]
+    assert json.loads(archivo.read_text())['valor_previo'] == 1
+
+    for i in (2, 3):
+        save_data_as_delta(pa.table({'id': [i]}), ruta, mode='append', marca_agua={'ultimo_valor': i})
+    # La compactación reescribe los archivos nuevos: ya no se pueden aislar desde el log
+    DeltaTable(ruta).optimize.compact()
+    assert leer_cambios_desde_version(ruta, 0)[0] is None
+
+    assert sorted(leer_extraccion_reciente_por_version(ruta, archivo)['id'].tolist()) == [2, 3]
+    contenido = json.loads(archivo.read_text())
+    assert contenido['version_procesada'] == DeltaTable(ruta).version()
+    assert leer_extraccion_reciente_por_version(ruta, archivo).empty
+
+
+def test_extraccion_con_marca_avanza_con_el_commit_destino(tmp_path):
+    bronce, silver = str(tmp_path / 'bronce'), str(tmp_path / 'silver')
+    save_data_as_delta(pa.table({'id': [0, 1, 2]}), bronce)
+
+    df, marca = leer_extraccion_reciente_con_marca(bronce, silver)
+    assert df['id'].tolist() == [0, 1, 2] and marca == {'version_bronce': 0, 'ultimo_id': 2}
+    save_data_as_delta(df, silver, marca_agua=marca)
+
+    # Sin commit en silver la marca no avanza: la misma lectura devuelve lo mismo
+    save_new_data_as_delta(pa.table({'id': [2, 3]}), bronce, predicate='src.id = tgt.id')
+    save_data_as_delta(pa.table({'id': [4]}), bronce, mode='append')
+    df, marca = leer_extraccion_reciente_con_marca(bronce, silver)
+    assert sorted(df['id'].tolist()) == [3, 4] and marca == {'version_bronce': 2, 'ultimo_id': 4}
+    assert sorted(leer_extraccion_reciente_con_marca(bronce, silver)[0]['id'].tolist()) == [3, 4]
+
+    save_data_as_delta(df, silver, mode='append', marca_agua=marca)
+    df, marca = leer_extraccion_reciente_con_marca(bronce, silver)
+    assert df.empty and marca == {'version_bronce': 2, 'ultimo_id': 4}
@@ -0,0 +1,93 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from extract.http_client import BinanceClient, RateLimiter, obtener_cliente
+
+
+class _ServidorStub(BaseHTTPRequestHandler):
+    # Respuestas encoladas por ruta: (código, encabezados, cuerpo)
+    respuestas = {}
+    solicitudes = []
+
+    def do_GET(self):
+        ruta = self.path.split('?')[0]
+        self.solicitudes.append(self.path)
+        cola = self.respuestas.get(ruta, [])
+        codigo, encabezados, cuerpo = cola.pop(0) if len(cola) > 1 else cola[0]
+        self.send_response(codigo)
+        for clave, valor in encabezados.items():
+            self.send_header(clave, valor)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(cuerpo).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    _ServidorStub.respuestas = {}
+    _ServidorStub.solicitudes = []
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _ServidorStub)
+    hilo = threading.Thread(target=httpd.serve_forever, daemon=True)
+    hilo.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}', _ServidorStub
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_get_devuelve_la_respuesta(servidor):
+    url, stub = servidor
+    stub.respuestas['/api/v3/klines'] = [(200, {}, [[0, '1.0']])]
+
+    cliente = BinanceClient(url)
+    assert cliente.get('api/v3/klines', params={'symbol': 'SOLUSDT'}).json() == [[0, '1.0']]
+    assert stub.solicitudes == ['/api/v3/klines?symbol=SOLUSDT']
+
+
+def test_reintenta_ante_429_respetando_retry_after(servidor):
+    url, stub = servidor
+    stub.respuestas['/api/v3/klines'] = [(429, {'Retry-After': '0'}, {}), (503, {}, {}), (200, {}, [])]
+
+    cliente = BinanceClient(url, max_retries=3, retry_delay=0)
+    assert cliente.get('api/v3/klines').json() == []
+    assert len(stub.solicitudes) == 3
+
+
+def test_agota_los_reintentos_y_lanza(servidor):
+    url, stub = servidor
+    stub.respuestas['/api/v3/klines'] = [(500, {}, {})]
+
+    cliente = BinanceClient(url, max_retries=2, retry_delay=0)
+    with pytest.raises(requests.exceptions.HTTPError):
+        cliente.get('api/v3/klines')
+    assert len(stub.solicitudes) == 3
+
+
+def test_el_peso_usado_informado_por_la_api_descuenta_tokens(servidor):
+    url, stub = servidor
+    stub.respuestas['/api/v3/klines'] = [(200, {'X-MBX-USED-WEIGHT-1M': '5990'}, [])]
+
+    cliente = BinanceClient(url, peso_por_minuto=6000)
+    cliente.get('api/v3/klines')
+    assert cliente.rate_limiter._tokens <= 11
+
+
+def test_obtener_cliente_avisa_si_cambia_la_configuracion():
+    base_url = 'http://cliente-compartido.invalid'
+    cliente = obtener_cliente(base_url, max_retries=1)
+
+    assert obtener_cliente(base_url) is cliente
+    with pytest.warns(UserWarning, match='max_retries'):
+        assert obtener_cliente(base_url, max_retries=5) is cliente
+
+
+def test_peso_mayor_a_la_capacidad_falla_sin_esperar():
+    limitador = RateLimiter(peso_por_minuto=10)
+    with pytest.raises(ValueError, match='supera la capacidad'):
+        limitador.adquirir(11)
+    # El peso igual a la capacidad sí se puede adquirir con el bucket lleno
+    limitador.adquirir(10)
@@ -0,0 +1,60 @@
+import numpy as np
+import pyarrow as pa
+from deltalake import write_deltalake
+from load.id_index import IndiceDeIds
+
+
+def _intervalos(indice:IndiceDeIds) -> list:
+    return list(zip(indice.inicios.tolist(), indice.fines.tolist()))
+
+
+def test_registrar_fusiona_intervalos_contiguos_y_solapados(tmp_path):
+    indice = IndiceDeIds(tmp_path, 'solusdt')
+    indice.registrar(np.array([5, 3, 4, 10, 11]))
+    assert _intervalos(indice) == [(3, 5), (10, 11)]
+
+    indice.registrar(np.array([6, 7]))        # contiguo al primero
+    indice.registrar(np.array([9, 10, 20]))   # solapa el segundo y agrega uno nuevo
+    assert _intervalos(indice) == [(3, 7), (9, 11), (20, 20)]
+
+    indice.registrar(np.array([8]))           # une los dos primeros
+    assert _intervalos(indice) == [(3, 11), (20, 20)]
+    assert indice.cantidad_de_ids() == 10
+
+
+def test_contiene_en_los_bordes_de_los_intervalos(tmp_path):
+    indice = IndiceDeIds(tmp_path, 'SOLUSDT')
+    indice.registrar(np.array([10, 11, 12, 20]))
+    consultas = np.array([9, 10, 12, 13, 19, 20, 21, -1])
+    assert indice.contiene(consultas).tolist() == [False, True, True, False, False, True, False, False]
+    assert IndiceDeIds(tmp_path, 'BTCUSDT').contiene(consultas).tolist() == [False] * len(consultas)
+
+
+def test_filtrar_nuevos_descarta_vistos_y_repetidos_pero_conserva_nulos(tmp_path):
+    indice = IndiceDeIds(tmp_path, 'SOLUSDT')
+    indice.registrar(np.array([1, 2, 3]))
+    lote = pa.table({'id': pa.array([3, 4, 4, None, 5, None], pa.int64()), 'precio': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]})
+
+    filtrada = indice.filtrar_nuevos(lote)
+    assert filtrada['id'].to_pylist() == [4, None, 5, None]
+    assert filtrada['precio'].to_pylist() == [2.0, 4.0, 5.0, 6.0]
+
+
+def test_guardar_y_volver_a_cargar(tmp_path):
+    indice = IndiceDeIds(tmp_path, 'SOLUSDT')
+    indice.registrar(pa.chunked_array([[1, 2, None], [7]]))
+    indice.guardar()
+
+    cargado = IndiceDeIds(tmp_path, 'solusdt')
+    assert _intervalos(cargado) == [(1, 2), (7, 7)]
+    assert (tmp_path / '_indice_ids' / 'SOLUSDT.json').exists()
+
+
+def test_reconstruir_desde_la_tabla(tmp_path):
+    ruta = str(tmp_path / 'trades')
+    write_deltalake(ruta, pa.table({'id': pa.array(list(range(100, 200)) + [250], pa.int64())}))
+    write_deltalake(ruta, pa.table({'id': pa.array([200, 201, 300], pa.int64())}), mode='append')
+
+    indice = IndiceDeIds.reconstruir(ruta, 'SOLUSDT')
+    assert _intervalos(indice) == [(100, 201), (250, 250), (300, 300)]
+    assert _intervalos(IndiceDeIds(ruta, 'SOLUSDT')) == _intervalos(indice)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+from load.delta_writer import leer_delta_lake
+from load.incremental_aggregates import actualizar_agregados_incrementales
+from transform.aggregations import sumarizar_df
+
+AGG_COL = {'price': 'mean', 'qty': 'sum', 'id': 'count'}
+RENAME_COLS = {'price': 'avg_price', 'qty': 'sum_qty', 'id': 'count_id'}
+
+
+def _lote(inicio:int, filas:int, fechas:list[str]) -> pd.DataFrame:
+    rng = np.random.default_rng(inicio)
+    return pd.DataFrame({
+        'id': np.arange(inicio, inicio + filas),
+        'date': rng.choice(fechas, filas),
+        'price': rng.uniform(100, 200, filas),
+        'qty': rng.uniform(0, 5, filas),
+    })
+
+
+def test_varias_ejecuciones_con_claves_de_texto_igualan_al_resumen_completo(tmp_path):
+    # Desde la segunda ejecución el MERGE reescribe gold con 'date' como string_view;
+    # la tercera lee esos archivos con un filtro IN sobre 'date'
+    ruta = str(tmp_path / 'gold')
+    lotes = [
+        _lote(0, 50, ['2025-01-01', '2025-01-02']),
+        _lote(50, 50, ['2025-01-02', '2025-01-03']),
+        _lote(100, 50, ['2025-01-01', '2025-01-03', '2025-01-04']),
+        _lote(150, 50, ['2025-01-04']),
+    ]
+    for lote in lotes:
+        actualizar_agregados_incrementales(lote, ruta, ['date'], AGG_COL, RENAME_COLS, columna_orden='id')
+
+    esperado = sumarizar_df(pd.concat(lotes), ['date'], AGG_COL, RENAME_COLS)
+    gold = leer_delta_lake(ruta).set_index('date').sort_index()[esperado.columns]
+    pd.testing.assert_frame_equal(gold, esperado, check_dtype=False)
+
+
+def test_lote_vacio_no_modifica_gold(tmp_path):
+    ruta = str(tmp_path / 'gold')
+    actualizar_agregados_incrementales(_lote(0, 10, ['2025-01-01']), ruta, ['date'], AGG_COL, RENAME_COLS)
+    assert actualizar_agregados_incrementales(pd.DataFrame(), ruta, ['date'], AGG_COL, RENAME_COLS) == 0
+    assert leer_delta_lake(ruta)['count_id'].tolist() == [10]
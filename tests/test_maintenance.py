@@ -0,0 +1,27 @@
+import pyarrow as pa
+from deltalake import write_deltalake
+from load.maintenance import mantener_tabla, vaciar_archivos_no_referenciados
+
+
+def test_vacuum_informa_solo_los_archivos_borrados(tmp_path):
+    ruta = str(tmp_path / 'tabla')
+    tabla = pa.table({'id': [1, 2, 3]})
+    write_deltalake(ruta, tabla)
+    write_deltalake(ruta, tabla, mode='overwrite')
+
+    assert len(vaciar_archivos_no_referenciados(ruta, retencion_horas=0)) == 1
+    # Un segundo vacuum no vuelve a informar el archivo que ya no está en disco
+    assert vaciar_archivos_no_referenciados(ruta, retencion_horas=0) == []
+
+
+def test_mantener_tabla_reporta_archivos_eliminados(tmp_path):
+    ruta = str(tmp_path / 'tabla')
+    for i in range(3):
+        write_deltalake(ruta, pa.table({'id': [i]}), mode='append')
+    politica = {'min_archivos_pequenos': 2, 'retencion_horas': 0}
+
+    reporte = mantener_tabla(ruta, politica)
+    assert reporte['archivos_antes'] == 3
+    assert reporte['archivos_despues'] == 1
+    assert reporte['archivos_eliminados'] == 3
+    assert mantener_tabla(ruta, politica)['archivos_eliminados'] == 0
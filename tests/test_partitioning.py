@@ -0,0 +1,62 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from load.partitioning import derivar_columnas_particion, filtros_particion_para_rango, validar_layout
+
+# 2024-12-31T23:59:59.999Z y 2025-01-01T00:00:00.000Z
+ULTIMO_MS_2024 = 1_735_689_599_999
+PRIMER_MS_2025 = 1_735_689_600_000
+
+LAYOUT_MENSUAL = {'columna_tiempo': 'open_time', 'particiones': ['year', 'month']}
+LAYOUT_DIARIO = {'columna_tiempo': 'time', 'particiones': ['date']}
+
+
+def _particiones(datos, layout:dict) -> list[tuple]:
+    tabla = derivar_columnas_particion(datos, layout)
+    tabla = pa.Table.from_pandas(tabla, preserve_index=False) if isinstance(tabla, pd.DataFrame) else tabla
+    return list(zip(*[tabla[c].to_pylist() for c in layout['particiones']]))
+
+
+def test_bordes_de_anio_en_utc():
+    tabla = pa.table({'open_time': pa.array([ULTIMO_MS_2024, PRIMER_MS_2025], pa.int64())})
+    assert _particiones(tabla, LAYOUT_MENSUAL) == [('2024', '12'), ('2025', '01')]
+    tabla = pa.table({'time': pa.array([ULTIMO_MS_2024, PRIMER_MS_2025], pa.int64())})
+    assert _particiones(tabla, LAYOUT_DIARIO) == [('2024-12-31',), ('2025-01-01',)]
+
+
+@pytest.mark.parametrize('tipo', [
+    pa.timestamp('ms'), pa.timestamp('us'), pa.timestamp('ns'),
+    pa.timestamp('ms', tz='UTC'), pa.timestamp('ms', tz='America/Argentina/Buenos_Aires'),
+])
+def test_timestamp_y_epoch_en_ms_dan_las_mismas_particiones(tipo):
+    epoch = pa.array([ULTIMO_MS_2024, PRIMER_MS_2025], pa.int64())
+    tiempos = epoch.cast(pa.timestamp('ms')).cast(pa.timestamp(tipo.unit)).cast(tipo)
+    esperado = _particiones(pa.table({'time': epoch}), LAYOUT_DIARIO)
+    assert _particiones(pa.table({'time': tiempos}), LAYOUT_DIARIO) == esperado
+
+
+def test_dataframe_de_pandas_con_zona_horaria():
+    df = pd.DataFrame({'open_time': pd.to_datetime([ULTIMO_MS_2024, PRIMER_MS_2025], unit='ms', utc=True)
+                       .tz_convert('Asia/Tokyo'), 'precio': [1.0, 2.0]})
+    resultado = derivar_columnas_particion(df, LAYOUT_MENSUAL)
+    assert isinstance(resultado, pd.DataFrame)
+    assert list(zip(resultado['year'], resultado['month'])) == [('2024', '12'), ('2025', '01')]
+
+
+def test_reemplaza_particiones_existentes_y_agrega_symbol():
+    tabla = pa.table({'open_time': pa.array([PRIMER_MS_2025], pa.int64()), 'year': ['1999']})
+    layout = {'columna_tiempo': 'open_time', 'particiones': ['symbol', 'year'], 'symbol': 'SOLUSDT'}
+    assert _particiones(tabla, layout) == [('SOLUSDT', '2025')]
+
+
+def test_filtros_para_un_rango_que_cruza_el_anio():
+    assert filtros_particion_para_rango(LAYOUT_MENSUAL, ULTIMO_MS_2024, PRIMER_MS_2025) == [
+        ('year', 'in', ['2024', '2025']), ('month', 'in', ['01', '12'])]
+    assert filtros_particion_para_rango(LAYOUT_DIARIO, PRIMER_MS_2025, PRIMER_MS_2025 + 1) == [
+        ('date', 'in', ['2025-01-01'])]
+
+
+@pytest.mark.parametrize('particiones', [['month'], ['date', 'year'], ['year', 'day'], ['hora']])
+def test_layouts_invalidos(particiones):
+    with pytest.raises(ValueError):
+        validar_layout({'columna_tiempo': 'time', 'particiones': particiones})
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from transform.data_cleaning import eliminar_duplicados, eliminar_registros_nulos
+from transform.data_transformation import (renombrar_columnas, castear_tipos_de_dato, ordenar_dataframe,
+                                           convertir_milisegundos_a_datetime, cambiar_posicion_de_columna)
+from transform.plan import PlanDeTransformacion
+
+COLS = {'t': 'open_time', 'c': 'close_time', 'p': 'price'}
+
+
+def _bronce(filas:int=200) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    open_time = rng.permutation(filas).astype('int64') * 60_000
+    df = pd.DataFrame({
+        't': open_time,
+        'c': open_time + 59_999,
+        'p': rng.uniform(1, 2, filas).round(4).astype(str),
+        'qty': rng.uniform(0, 5, filas),
+    })
+    df.loc[rng.choice(filas, 10, replace=False), 'qty'] = np.nan
+    # Filas repetidas con el mismo open_time al final
+    return pd.concat([df, df.iloc[:15].assign(qty=-1.0)])
+
+
+def test_plan_equivale_a_la_cadena_eager():
+    df = _bronce()
+    plan = (PlanDeTransformacion()
+            .renombrar_columnas(COLS)
+            .eliminar_registros_nulos(['qty'])
+            .eliminar_duplicados(['open_time'], keep='last')
+            .castear_tipos_de_dato({'price': 'float64'})
+            .convertir_milisegundos_a_datetime(['open_time', 'close_time'])
+            .ordenar_dataframe('open_time')
+            .cambiar_posicion_de_columna('qty', 'open_time'))
+
+    esperado = renombrar_columnas(df, COLS)
+    esperado = eliminar_registros_nulos(esperado, ['qty'])
+    esperado = eliminar_duplicados(esperado, ['open_time'], keep='last')
+    esperado = castear_tipos_de_dato(esperado, {'price': 'float64'})
+    # La función eager devuelve solo las columnas convertidas: se reasignan en el DataFrame
+    esperado = esperado.assign(**convertir_milisegundos_a_datetime(esperado, ['open_time', 'close_time']))
+    esperado = ordenar_dataframe(esperado, 'open_time')
+    esperado = cambiar_posicion_de_columna(esperado, 'qty', 'open_time')
+
+    obtenido = plan.ejecutar(df)
+    pd.testing.assert_frame_equal(obtenido, esperado)
+    assert obtenido['open_time'].dtype.kind == 'M'
+
+
+def test_filtros_despues_de_convertir_usan_los_valores_convertidos():
+    df = pd.DataFrame({'t': [0, 60_000, 120_000], 'p': ['1', 'x', '3']})
+    obtenido = (PlanDeTransformacion()
+                .convertir_milisegundos_a_datetime(['t'])
+                .ordenar_dataframe('t', ascending=False)
+                .ejecutar(df))
+
+    esperado = df.assign(**convertir_milisegundos_a_datetime(df, ['t'])).sort_values('t', ascending=False)
+    pd.testing.assert_frame_equal(obtenido, esperado)
+
+
+def test_empates_del_ordenamiento_conservan_el_orden_previo():
+    df = pd.DataFrame({'k': [2, 1, 2, 1, 2], 'v': list('abcde')})
+    obtenido = PlanDeTransformacion().ordenar_dataframe('k').ejecutar(df)
+    pd.testing.assert_frame_equal(obtenido, df.sort_values('k', kind='stable'))
+
+
+def test_no_modifica_la_entrada():
+    df = _bronce(20)
+    copia = df.copy()
+    PlanDeTransformacion().renombrar_columnas(COLS).castear_tipos_de_dato({'price': 'float64'}).ejecutar(df)
+    pd.testing.assert_frame_equal(df, copia)
@@ -0,0 +1,73 @@
+import pyarrow as pa
+import pytest
+from utils.schemas import TRADES_SCHEMA, aplicar_esquema, obtener_esquema
+
+
+def _trades(**columnas) -> pa.Table:
+    base = {
+        'id': pa.array([1, 2, 3], pa.int64()),
+        'price': ['10.5', '11', '12.25'],
+        'qty': ['1', '2', '3'],
+        'quoteQty': ['10.5', '22', '36.75'],
+        'time': pa.array([0, 1, 2], pa.int64()),
+        'isBuyerMaker': ['true', 'false', 'true'],
+        'isBestMatch': [True, True, False],
+    }
+    base.update(columnas)
+    return pa.table(base)
+
+
+def test_convierte_al_esquema_exacto_en_ambos_modos():
+    for modo in ('estricto', 'tolerante'):
+        tabla, errores = aplicar_esquema(_trades(), 'api/v3/historicalTrades', modo=modo)
+        assert tabla.schema == TRADES_SCHEMA
+        assert tabla['price'].to_pylist() == [10.5, 11.0, 12.25]
+        assert tabla['isBuyerMaker'].to_pylist() == [True, False, True]
+        assert errores == {}
+
+
+def test_campos_extra_se_descartan_y_se_respeta_el_orden():
+    datos = _trades(extra=['x', 'y', 'z'])
+    datos = datos.select(list(reversed(datos.column_names)))
+    tabla, errores = aplicar_esquema(datos, 'historicalTrades')
+    assert tabla.column_names == TRADES_SCHEMA.names
+    assert errores == {}
+
+
+def test_estricto_rechaza_faltantes_no_convertibles_y_nulos():
+    with pytest.raises(ValueError, match='Faltan columnas'):
+        aplicar_esquema(_trades().drop_columns(['qty']), 'historicalTrades')
+    with pytest.raises(ValueError, match='"price"'):
+        aplicar_esquema(_trades(price=['10.5', 'abc', '12']), 'historicalTrades')
+    with pytest.raises(ValueError, match='no nulas'):
+        aplicar_esquema(_trades(id=pa.array([1, None, 3], pa.int64())), 'historicalTrades')
+
+
+def test_tolerante_anula_y_cuenta_por_columna():
+    datos = _trades(price=['10.5', 'abc', None], isBuyerMaker=['true', 'quizás', 'false']).drop_columns(['qty'])
+    tabla, errores = aplicar_esquema(datos, 'historicalTrades', modo='tolerante')
+
+    assert tabla.schema == TRADES_SCHEMA
+    assert tabla['price'].to_pylist() == [10.5, None, None]
+    assert tabla['isBuyerMaker'].to_pylist() == [True, None, False]
+    assert tabla['qty'].null_count == 3
+    # Solo los valores que no se pudieron convertir cuentan como error, no los nulos de origen
+    assert errores == {'price': 1, 'isBuyerMaker': 1, 'qty': 3}
+
+
+def test_tolerante_descarta_filas_con_nulos_en_columnas_no_nulas():
+    datos = _trades(id=['1', 'dos', None])
+    tabla, errores = aplicar_esquema(datos, 'historicalTrades', modo='tolerante')
+    assert tabla['id'].to_pylist() == [1]
+    assert tabla['price'].to_pylist() == [10.5]
+    assert errores == {'id': 2}
+
+
+def test_acepta_dataframes_y_valida_el_modo():
+    df = _trades().to_pandas()
+    tabla, _ = aplicar_esquema(df, 'historicalTrades')
+    assert tabla.num_rows == 3
+    with pytest.raises(ValueError, match='Modo'):
+        aplicar_esquema(df, 'historicalTrades', modo='laxo')
+    with pytest.raises(ValueError, match='sin esquema'):
+        obtener_esquema('api/v3/ticker')
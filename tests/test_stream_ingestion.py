@@ -0,0 +1,76 @@
+import json
+import socket
+import threading
+import time
+import pytest
+from deltalake import DeltaTable
+from extract.stream_ingestion import leer_lineas_socket, parsear_mensaje, ingerir_stream
+
+
+def _trade(i:int) -> str:
+    return json.dumps({'e': 'trade', 't': i, 'p': '100.5', 'q': '2', 'T': 1_704_067_200_000 + i, 'm': False})
+
+
+@pytest.fixture
+def servidor_de_lineas():
+    """Servidor local que reemplaza al stream: envía los bloques indicados, con pausas (float) entre ellos."""
+    sock = socket.create_server(('127.0.0.1', 0))
+    envios = []
+
+    def atender():
+        conexion, _ = sock.accept()
+        with conexion:
+            for envio in envios:
+                if isinstance(envio, float):
+                    time.sleep(envio)
+                else:
+                    conexion.sendall(envio.encode())
+
+    def iniciar(*bloques):
+        envios.extend(bloques)
+        threading.Thread(target=atender, daemon=True).start()
+        return sock.getsockname()
+
+    yield iniciar
+    sock.close()
+
+
+def test_parsear_mensaje_trade_y_kline():
+    assert parsear_mensaje(_trade(7))[1]['id'] == 7
+    vela = {'e': 'kline', 'k': {'t': 0, 'T': 59_999, 'o': '1', 'h': '2', 'l': '0.5', 'c': '1.5', 'v': '10',
+                                'q': '15', 'n': 3, 'V': '5', 'Q': '7', 'x': True}}
+    assert parsear_mensaje(json.dumps({'stream': 'solusdt@kline_1m', 'data': vela}))[0] == 'kline'
+    vela['k']['x'] = False
+    assert parsear_mensaje(json.dumps(vela)) is None
+
+
+def test_leer_lineas_reune_lineas_partidas_y_marca_inactividad(servidor_de_lineas):
+    host, port = servidor_de_lineas('{"a"', ': 1}\n{"b": 2}\n', 0.5, '{"c": 3}')
+
+    lineas = list(leer_lineas_socket(host, port, timeout=0.1))
+
+    assert [l for l in lineas if l is not None] == ['{"a": 1}', '{"b": 2}', '{"c": 3}']
+    assert None in lineas
+
+
+def test_ingerir_stream_cierra_lotes_por_tamano(servidor_de_lineas, tmp_path):
+    host, port = servidor_de_lineas(''.join(_trade(i) + '\n' for i in range(1, 8)))
+
+    total = ingerir_stream(leer_lineas_socket(host, port, timeout=0.1), tmp_path, max_registros=3)
+
+    dt = DeltaTable(str(tmp_path))
+    assert total == 7
+    assert dt.version() == 2  # lotes de 3, 3 y el pendiente de 1
+    tabla = dt.to_pyarrow_table().sort_by('id')
+    assert tabla['id'].to_pylist() == list(range(1, 8))
+    assert tabla['quoteQty'].to_pylist() == [201.0] * 7
+
+
+def test_ingerir_stream_cierra_lotes_por_tiempo(servidor_de_lineas, tmp_path):
+    host, port = servidor_de_lineas(_trade(1) + '\n', 0.6, _trade(2) + '\n')
+
+    total = ingerir_stream(leer_lineas_socket(host, port, timeout=0.1), tmp_path,
+                           max_registros=100, max_segundos=0.3)
+
+    assert total == 2
+    assert DeltaTable(str(tmp_path)).version() == 1  # el primer trade se escribió solo al vencer
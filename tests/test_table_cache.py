@@ -0,0 +1,65 @@
+import shutil
+import pyarrow as pa
+import pytest
+from deltalake import DeltaTable, write_deltalake
+from deltalake.exceptions import TableNotFoundError
+from load import table_cache
+from load.table_cache import obtener_tabla, invalidar_tabla
+
+
+@pytest.fixture(autouse=True)
+def cache_vacia():
+    invalidar_tabla()
+    yield
+    invalidar_tabla()
+
+
+def test_reutiliza_el_handle_y_aplica_commits_nuevos(tmp_path, monkeypatch):
+    ruta = str(tmp_path / 'tabla')
+    write_deltalake(ruta, pa.table({'id': [1]}))
+    dt = obtener_tabla(ruta)
+
+    aperturas = []
+    monkeypatch.setattr(table_cache, 'DeltaTable', lambda path: aperturas.append(path) or DeltaTable(path))
+    assert obtener_tabla(ruta) is dt
+
+    write_deltalake(ruta, pa.table({'id': [2]}), mode='append')
+    assert obtener_tabla(ruta) is dt
+    assert dt.version() == 1
+    assert aperturas == []
+
+
+def test_tabla_recreada_con_la_misma_version_se_vuelve_a_abrir(tmp_path):
+    ruta = str(tmp_path / 'tabla')
+    write_deltalake(ruta, pa.table({'id': [1]}))
+    write_deltalake(ruta, pa.table({'id': [2]}), mode='append')
+    viejo = obtener_tabla(ruta)
+
+    shutil.rmtree(ruta)
+    write_deltalake(ruta, pa.table({'id': [10]}))
+    write_deltalake(ruta, pa.table({'id': [20]}), mode='append')
+
+    dt = obtener_tabla(ruta)
+    assert dt is not viejo
+    assert sorted(dt.to_pyarrow_table()['id'].to_pylist()) == [10, 20]
+
+
+def test_tabla_recreada_con_menos_versiones_se_vuelve_a_abrir(tmp_path):
+    ruta = str(tmp_path / 'tabla')
+    for i in range(3):
+        write_deltalake(ruta, pa.table({'id': [i]}), mode='append')
+    obtener_tabla(ruta)
+
+    shutil.rmtree(ruta)
+    write_deltalake(ruta, pa.table({'id': [7]}))
+    assert obtener_tabla(ruta).to_pyarrow_table()['id'].to_pylist() == [7]
+
+
+def test_tabla_eliminada_se_informa_como_inexistente(tmp_path):
+    ruta = str(tmp_path / 'tabla')
+    write_deltalake(ruta, pa.table({'id': [1]}))
+    obtener_tabla(ruta)
+
+    shutil.rmtree(ruta)
+    with pytest.raises(TableNotFoundError):
+        obtener_tabla(ruta)